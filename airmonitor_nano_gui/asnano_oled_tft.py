@@ -5,6 +5,9 @@ asnano.py: demo program for use of nanogui with uasyncio
 #TODO: add standby/micropwer (Peter Hinch) instead of display OFF
 #TODO: correct colors (RED->RED etc.) Requires GRB instead of RGB, but how?
 
+2026-1018 PP: sensors, OLED and LED36 share one I2C bus from sharedbus, with usage report
+2026-1018 PP: sensor reads and LED36 patterns hold the bus lock of their client
+2026-1018 PP: widgets are refreshed with arefresh(): TFT transfer yields to other tasks
 2024-0415 PP: add class DateCal for date string, renamed uos -> os (micropython v1.20+)
 2024_0414 PP: modified display_awake for *all* displays, remove display_oled_awake
 2024-0413 PP: add Clock on M5Stack OLED-display (SH1107), add 'display' to widgets
@@ -19,13 +22,13 @@ Released under the MIT License (MIT) - see LICENSE file
 # Initialise hardware and framebuf before importing modules.
 from color_setup import ssd_sh1107  # Create an OLED display instance
 from color_setup import ssd_st7735  # Create a TFT display instance
-from gui.core.nanogui import refresh
+from gui.core.nanogui import refresh, arefresh
 
 import time
 import uasyncio as asyncio
 import pyb
 import os
-from machine import I2C
+import sharedbus
 
 # Sensors and actuator drivers (nano-gui compabtible)
 from adafruit_sgp30 import Adafruit_SGP30
@@ -120,7 +123,7 @@ async def aclock(display):
         cal = DateCal(t)
         dial.text(f"{cal.day_str} {cal.mday} {cal.month_str} {cal.year}")
         
-        refresh(display)
+        await arefresh(display)
         await asyncio.sleep(1)
 
 
@@ -147,9 +150,9 @@ async def blink_off(led, freq=0.5):
 
 # Task: setup a Meter, optional values from a sensor
 # TODO: separate meter-tasks in task 'airquality' and task 'temperature/humidiy'
-async def meter(display, n, x, text, t, sensor=None):
+async def meter(display, n, x, text, t, sensor=None, client=None):
     """
-    meter(display, n, x, text, t, sensor=None) - a template for a Meter to
+    meter(display, n, x, text, t, sensor=None, client=None) - a template for a Meter to
     show sensor, or random values (if sensor is None)
     Parameters:
         @display: specifies display for a Meter
@@ -158,6 +161,8 @@ async def meter(display, n, x, text, t, sensor=None):
         @text  : [String] specifies text of a Meter
         @t     : [number] specifies the cycle in seconds for updating values of a Meter
         @sensor: None | sensor-class: specifies an air quality sensor, can be None
+        @client: None | sharedbus client of the sensor: if given, its bus lock
+                 is held while the sensor is read
     """
     global mode
     print(f"{display}: Meter {n} '{text}', refresh every {t//1000} secs.")
@@ -198,20 +203,27 @@ async def meter(display, n, x, text, t, sensor=None):
     oldRange = (oldMax - oldMin)
     newRange = (newMax - newMin)
     
+    def read():  # value of the sensor for meter n
+        if n == 1:  # eCO2
+            val, _ = sensor.iaq_measure()
+            #if display.is_awake is False:
+            #    print(f"eCO2: {val} ppm")
+        elif n == 2:  # TVOC
+            _, val = sensor.iaq_measure()
+            #if display.is_awake is False:
+            #    print(f"TVOC: {val} ppb")
+        elif n == 3: # temperature
+            val = sensor.temperature
+            #if display.is_awake is False:
+            #    print(f"Temperature: {val} Celsius")
+        return val
+
     while True:
         if sensor is not None:
-            if n == 1:  # eCO2
-                val, _ = sensor.iaq_measure()
-                #if display.is_awake is False:
-                #    print(f"eCO2: {val} ppm")
-            elif n == 2:  # TVOC
-                _, val = sensor.iaq_measure()
-                #if display.is_awake is False:
-                #    print(f"TVOC: {val} ppb")
-            elif n == 3: # temperature
-                val = sensor.temperature
-                #if display.is_awake is False:
-                #    print(f"Temperature: {val} Celsius")
+            if client is None:
+                val = read()
+            else:
+                val = await client.run(read)  # queue for, then hold, the shared bus
             # map sensor value to level-range
             v = (((val - oldMin) * newRange) / oldRange) + newMin
 
@@ -222,7 +234,7 @@ async def meter(display, n, x, text, t, sensor=None):
         m.value(v, color(v))
         #l.color(color(v))
         l.text(txt(v), fgcolor=color(v))        
-        refresh(display)
+        await arefresh(display)
         await asyncio.sleep_ms(t)
 
 
@@ -251,6 +263,9 @@ async def killer(tasks, displays):
         display.show()
     # PP added: clear LED36 tile
     fill_rgb(i2c, addr=61, r=0, g=0, b=0)
+    # 2026-1018 PP added: which client used the buses
+    for bus in sharedbus.buses():
+        bus.report()
     print("Done!")  # PP added
 
 
@@ -325,7 +340,7 @@ def fill_rgb(i2c, addr, r, g, b):
 async def random_dots(addr, i2c, b= 100, dt=10):
     """ Set random colors at random positions
         addr: tile i2c-address
-        i2c : i2c bus
+        i2c : sharedbus client of the tile, holds the bus lock for a pattern
         b   : brigthness 0..100(?)
         dt  : delay in ms
     """
@@ -351,22 +366,24 @@ async def random_dots(addr, i2c, b= 100, dt=10):
         buf[4] = b
         i2c.writeto(addr, buf)
 
-    brightness(addr, b)  # set brightness to b
+    async with i2c:
+        brightness(addr, b)  # set brightness to b
     
     while True:
-        # when display is OFF: clear LEDs
-        if ssd.is_awake is False:
-            fill_rgb(i2c, addr, 0, 0, 0)
-        else:
-            # display is ON - show pattern
-            rn = pyb.rng()
-            r = rn & 0xff
-            g = (rn >> 8) & 0xff
-            b = (rn >> 16) & 0xff
-            x = (rn >> 24) % 36
-            y = x // 6
-            x %= 6
-            set_dot(addr, x, y, r, g, b)
+        async with i2c:  # queue for, then hold, the shared bus
+            # when display is OFF: clear LEDs
+            if ssd.is_awake is False:
+                fill_rgb(i2c, addr, 0, 0, 0)
+            else:
+                # display is ON - show pattern
+                rn = pyb.rng()
+                r = rn & 0xff
+                g = (rn >> 8) & 0xff
+                b = (rn >> 16) & 0xff
+                x = (rn >> 24) % 36
+                y = x // 6
+                x %= 6
+                set_dot(addr, x, y, r, g, b)
         #time.sleep_ms(dt)
         await asyncio.sleep_ms(dt)
 
@@ -378,9 +395,13 @@ async def main():
     #2024-0221 PP: moved to helper: [pyb.LED(i).off() for i in range(1, 4)]  # all LEDs off
     leds_off()
     #i2c = I2C('X', freq=400000)     # create hardware I2c object
-    i2c = I2C('X')     # create hardware I2c object
-    aht10 = ahtx0.AHT10(i2c, 0x38)  # Temperature sensor
-    sgp30 = Adafruit_SGP30(i2c)     # eCO2 - sensor
+    #2026-1018 PP: one shared bus, each device has its own client for accounting
+    bus = sharedbus.i2c('X')
+    i2c = bus.client('led36')
+    aht10_bus = bus.client('aht10')
+    sgp30_bus = bus.client('sgp30')
+    aht10 = ahtx0.AHT10(aht10_bus, 0x38)  # Temperature sensor
+    sgp30 = Adafruit_SGP30(sgp30_bus)     # eCO2 - sensor
     print("SGP30 serial #", [hex(i) for i in sgp30.serial])
     # Initialize SGP-30 internal drift compensation algorithm.
     sgp30.iaq_init()
@@ -420,10 +441,10 @@ async def main():
     tasks.append(asyncio.create_task(aclock(ssd_sh1107)))
     
     # task: display sensor values...
-    tasks.append(asyncio.create_task(meter(ssd, 1, 2, 'eco2', 1000, sgp30)))
-    tasks.append(asyncio.create_task(meter(ssd, 2, 50, 'voc', 1000, sgp30)))
+    tasks.append(asyncio.create_task(meter(ssd, 1, 2, 'eco2', 1000, sgp30, sgp30_bus)))
+    tasks.append(asyncio.create_task(meter(ssd, 2, 50, 'voc', 1000, sgp30, sgp30_bus)))
     #tasks.append(asyncio.create_task(meter(ssd, 0, 98, 'bass', 1500, None)))
-    tasks.append(asyncio.create_task(meter(ssd, 3, 98, 'temp', 2000, aht10)))
+    tasks.append(asyncio.create_task(meter(ssd, 3, 98, 'temp', 2000, aht10, aht10_bus)))
     
     # RGB leds tasks
     # 2024-0221 PP: blink(red) when display is OFF
@@ -0,0 +1,49 @@
+# large_text.py Host-side benchmark of framebuf2 large_text() on the SH1107
+# driver (virtual I2C bus, lib/drivers/virtual/virtual.py).
+# Compares drawing clock digits pixel by pixel with fill_rect() (as
+# large_text() did before the glyph cache) with blitting cached glyphs.
+# Run from the airmonitor_nano_gui directory with the unix port:
+# micropython benchmarks/large_text.py
+
+import sys
+sys.path.insert(0, 'lib')
+from time import ticks_us, ticks_diff
+import framebuf
+import framebuf2
+from drivers.virtual.virtual import sh1107
+
+REPEATS = 20
+TEXT = '12:34'
+
+def by_pixels(ssd, s, x, y, m, c=1):  # The former large_text() at rotation 0
+    letter = framebuf.FrameBuffer(bytearray(8), 8, 8, framebuf.MONO_HMSB)
+    for ch in s:
+        letter.fill(0)
+        letter.text(ch, 0, 0, 1)
+        for i in range(8):
+            for j in range(8):
+                if letter.pixel(i, j) == 1:
+                    if m == 1:
+                        ssd.pixel(x + i, y + j, c)
+                    else:
+                        ssd.fill_rect(x + i * m, y + j * m, m, m, c)
+        x += 8 * m
+
+def ms(draw):
+    t = ticks_us()
+    for _ in range(REPEATS):
+        draw()
+    return ticks_diff(ticks_us(), t) / REPEATS / 1000
+
+ssd = sh1107(128, 64)
+print("'{}' on SH1107 128x64, ms per string".format(TEXT))
+print('   m   pixels  cold cache  cached')
+for m in (1, 2, 3):
+    x = 0
+    p = ms(lambda : by_pixels(ssd, TEXT, x, 0, m))
+    framebuf2.GLYPH_CACHE = 0  # Glyphs built for every character
+    cold = ms(lambda : ssd.large_text(TEXT, x, 0, m, 1))
+    framebuf2.GLYPH_CACHE = 24
+    ssd.large_text(TEXT, x, 0, m, 1)
+    warm = ms(lambda : ssd.large_text(TEXT, x, 0, m, 1))
+    print('{:4d} {:8.2f} {:11.2f} {:7.2f}'.format(m, p, cold, warm))
@@ -0,0 +1,62 @@
+# plot_batch.py Host-side benchmark of fplot Curve.points() against point()
+# on the ST7735R driver (virtual SPI bus, lib/drivers/virtual/virtual.py).
+# Plots an hour of samples, one per second, on a 150 pixel wide graph: with
+# point() per sample, and with points() from two array('f').
+# Run from the airmonitor_nano_gui directory with the unix port:
+# micropython benchmarks/plot_batch.py [samples]
+
+import sys
+sys.path.insert(0, 'lib')
+sys.path.insert(0, '.')
+import color_setup_virtual
+sys.modules['color_setup'] = color_setup_virtual  # as USE_VIRTUAL in color_setup.py
+from color_setup_virtual import ssd_st7735 as ssd
+
+import gc
+from time import ticks_us, ticks_diff
+from math import sin
+from array import array
+from gui.core.nanogui import refresh
+from gui.core.writer import CWriter
+from gui.core.fplot import CartesianGraph, Curve
+import gui.fonts.arial10 as arial10
+from gui.core.colors import *
+
+SAMPLES = int(sys.argv[1]) if len(sys.argv) > 1 else 3600
+
+calls = {}
+def count(name):  # Count calls of a drawing method of ssd
+    f = getattr(ssd, name)
+    def wrapped(*args):
+        calls[name] = calls.get(name, 0) + 1
+        return f(*args)
+    setattr(ssd, name, wrapped)
+
+for name in ('line', 'pixel'):
+    count(name)
+
+xs = array('f', (t / SAMPLES for t in range(SAMPLES)))  # 0..1: an hour ago to now
+ys = array('f', (sin(t / 300) * 1.2 + sin(t / 7) * 0.1 for t in range(SAMPLES)))  # Clipped at +-1
+
+def run(batch):
+    refresh(ssd, True)
+    wri = CWriter(ssd, arial10, GREEN, BLACK, verbose=False)
+    g = CartesianGraph(wri, 4, 4, height=100, width=150, xorigin=0, fgcolor=GREEN,
+                       gridcolor=LIGHTGREEN, bdcolor=False)
+    c = Curve(g, YELLOW)
+    calls.clear()
+    gc.collect()
+    t = ticks_us()
+    if batch:
+        c.points(xs, ys)
+    else:
+        for i in range(SAMPLES):
+            c.point(xs[i], ys[i])
+    dt = ticks_diff(ticks_us(), t)
+    print('{:6}: {:8.1f} ms, calls: {}'.format('points' if batch else 'point', dt / 1000,
+          ', '.join('{} {}'.format(k, calls[k]) for k in sorted(calls))))
+    refresh(ssd)
+
+print('{} samples plotted on a 150 x 100 CartesianGraph on ST7735R'.format(SAMPLES))
+run(False)
+run(True)
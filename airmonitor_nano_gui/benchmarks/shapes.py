@@ -0,0 +1,113 @@
+# shapes.py Host-side benchmark of framebuf2 circle() and triangle().
+# Compares the former drawing code (a pixel() per outline point, a vline() per
+# filled column, all through the subclass) with the span based circle(), on a
+# plain framebuf2.FrameBuffer and on the SH1107 driver (virtual I2C bus,
+# lib/drivers/virtual/virtual.py), which tracks damage. triangle() is the
+# former code on both sides, as a control.
+# Under CPython with a framebuf module written in Python, hline() costs
+# several pixel() calls and viper code runs as Python, so circle outlines time
+# slower there although they take fewer calls: use the unix port or a board.
+# Run from the airmonitor_nano_gui directory with the unix port:
+# micropython benchmarks/shapes.py
+
+import sys
+sys.path.insert(0, 'lib')
+from time import ticks_us, ticks_diff
+import framebuf
+import framebuf2
+from drivers.virtual.virtual import sh1107
+
+REPEATS = 50
+
+def old_circle(fb, x0, y0, r, c, f=False):  # framebuf2 v209
+    g = 1 - r
+    ddg_x = 1
+    ddg_y = -2 * r
+    x = 0
+    y = r
+    if f:
+        fb.vline(x0, y0 - r, 2 * r + 1, c)
+    else:
+        fb.pixel(x0, y0 + r, c)
+        fb.pixel(x0, y0 - r, c)
+        fb.pixel(x0 + r, y0, c)
+        fb.pixel(x0 - r, y0, c)
+    while x < y:
+        if g >= 0:
+            y -= 1
+            ddg_y += 2
+            g += ddg_y
+        x += 1
+        ddg_x += 2
+        g += ddg_x
+        if f:
+            fb.vline(x0 + x, y0 - y, 2 * y + 1, c)
+            fb.vline(x0 + y, y0 - x, 2 * x + 1, c)
+            fb.vline(x0 - x, y0 - y, 2 * y + 1, c)
+            fb.vline(x0 - y, y0 - x, 2 * x + 1, c)
+        else:
+            for px, py in ((x, y), (-x, y), (x, -y), (-x, -y),
+                           (y, x), (-y, x), (y, -x), (-y, -x)):
+                fb.pixel(x0 + px, y0 + py, c)
+
+def old_triangle(fb, x0, y0, x1, y1, x2, y2, c, f=False):  # framebuf2 v209
+    if not f:
+        fb.line(x0, y0, x1, y1, c)
+        fb.line(x1, y1, x2, y2, c)
+        fb.line(x2, y2, x0, y0, c)
+        return
+    if y0 > y1:
+        y0, y1, x0, x1 = y1, y0, x1, x0
+    if y1 > y2:
+        y2, y1, x2, x1 = y1, y2, x1, x2
+    if y0 > y1:
+        y0, y1, x0, x1 = y1, y0, x1, x0
+    dx01, dy01 = x1 - x0, max(y1 - y0, 1)
+    dx02, dy02 = x2 - x0, max(y2 - y0, 1)
+    dx12, dy12 = x2 - x1, max(y2 - y1, 1)
+    sa = sb = 0
+    y = y0
+    last = y1 - 1 if y0 == y1 else y1
+    while y <= last:
+        a = x0 + sa // dy01
+        b = x0 + sb // dy02
+        sa += dx01
+        sb += dx02
+        if a > b:
+            a, b = b, a
+        fb.hline(a, y, b - a + 1, c)
+        y += 1
+    sa = dx12 * (y - y1)
+    sb = dx02 * (y - y0)
+    while y <= y2:
+        a = x1 + sa // dy12
+        b = x0 + sb // dy02
+        sa += dx12
+        sb += dx02
+        if a > b:
+            a, b = b, a
+        fb.hline(a, y, b - a + 1, c)
+        y += 1
+
+def ms(draw):
+    t = ticks_us()
+    for _ in range(REPEATS):
+        draw()
+    return ticks_diff(ticks_us(), t) / REPEATS / 1000
+
+CASES = (('circle r=10', lambda fb, f : old_circle(fb, 64, 32, 10, 1, f),
+                         lambda fb, f : fb.circle(64, 32, 10, 1, f)),
+         ('circle r=30', lambda fb, f : old_circle(fb, 64, 32, 30, 1, f),
+                         lambda fb, f : fb.circle(64, 32, 30, 1, f)),
+         ('triangle', lambda fb, f : old_triangle(fb, 10, 60, 64, 2, 120, 50, 1, f),
+                      lambda fb, f : fb.triangle(10, 60, 64, 2, 120, 50, 1, f)))
+
+for name, fb in (('framebuf2.FrameBuffer 128x64 MONO_VLSB',
+                  framebuf2.FrameBuffer(bytearray(128 * 64 // 8), 128, 64, framebuf.MONO_VLSB)),
+                 ('SH1107 128x64', sh1107(128, 64))):
+    print('{}, ms per shape'.format(name))
+    print('                    outline        filled')
+    print('                  old     new    old     new')
+    for title, old, new in CASES:
+        print('{:<14}'.format(title) + ''.join('{:7.3f} {:7.3f}'.format(
+              ms(lambda : old(fb, f)), ms(lambda : new(fb, f))) for f in (False, True)))
@@ -0,0 +1,62 @@
+# spi_lines.py Host-side benchmark of the line staging buffer in the 4-bit
+# TFT drivers (ST7735R, ILI9341).
+# Compares full frame time and spi.write call count for N lines per write.
+# Run from the airmonitor_nano_gui directory with the unix port:
+# micropython benchmarks/spi_lines.py
+
+import sys
+sys.path.insert(0, 'lib')
+from time import ticks_us, ticks_diff
+from drivers.st7735r.st7735r144_4bit import ST7735R
+from drivers.ili93xx.ili9341 import ILI9341
+
+BAUDRATE = 12_000_000  # As config.DISPLAY_BAUDRATE
+REPEATS = 10
+
+class SPI:  # Counts calls and bytes instead of driving hardware
+    def __init__(self):
+        self.calls = 0
+        self.nbytes = 0
+
+    def write(self, buf):
+        self.calls += 1
+        self.nbytes += len(buf)
+
+class Pin:
+    def __call__(self, v=None):
+        return 1
+
+    def value(self, v=None):
+        return 1
+
+def frame_time(ssd, spi, show):
+    ssd.fill_rect(0, 0, ssd.width // 2, ssd.height, 3)  # Some non-trivial content
+    spi.calls = 0
+    spi.nbytes = 0
+    t = ticks_us()
+    for _ in range(REPEATS):
+        show()
+    dt = ticks_diff(ticks_us(), t) / REPEATS
+    return dt / 1000, spi.calls // REPEATS, spi.nbytes // REPEATS
+
+def run(name, make):
+    print(name)
+    print('   N  frame ms  writes   bytes  wire ms')
+    for n in (1, 4, 8, 16):
+        spi = SPI()
+        ssd, show = make(spi, n)
+        ms, calls, nbytes = frame_time(ssd, spi, show)
+        wire = nbytes * 8 * 1000 / BAUDRATE
+        print('{:4d} {:9.2f} {:7d} {:7d} {:8.2f}'.format(n, ms, calls, nbytes, wire))
+
+def st7735r(spi, n):
+    ssd = ST7735R(spi, Pin(), Pin(), Pin(), bl=Pin(), height=128, width=160,
+                  linebuf_size=n * 160 * 2)
+    return ssd, lambda : ssd.show(True)
+
+def ili9341(spi, n):
+    ssd = ILI9341(spi, Pin(), Pin(), Pin(), Pin(), linebuf_size=n * 320 * 2)
+    return ssd, ssd.show
+
+run('ST7735R 160x128 GS4', st7735r)
+run('ILI9341 320x240 GS4', ili9341)
@@ -0,0 +1,66 @@
+# strip_chart.py Host-side benchmark of fplot TSequence on the ST7735R driver
+# (virtual SPI bus, lib/drivers/virtual/virtual.py).
+# Adds samples to a full 100 sample trace, refreshing after each: as before,
+# clearing the graph and plotting every sample, and as a strip chart
+# (scroll=True) which moves the traces with a blit and draws the newest
+# segment.
+# Run from the airmonitor_nano_gui directory with the unix port:
+# micropython benchmarks/strip_chart.py [samples]
+
+import sys
+sys.path.insert(0, 'lib')
+sys.path.insert(0, '.')
+import color_setup_virtual
+sys.modules['color_setup'] = color_setup_virtual  # as USE_VIRTUAL in color_setup.py
+from color_setup_virtual import ssd_st7735 as ssd
+
+from time import ticks_us, ticks_diff
+from math import sin
+from drivers.virtual.virtual import percentile
+from gui.core.nanogui import refresh
+from gui.core.writer import CWriter
+from gui.core.fplot import CartesianGraph, TSequence
+import gui.fonts.arial10 as arial10
+from gui.core.colors import *
+
+SAMPLES = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+SIZE = 100
+
+calls = {}
+def count(name):  # Count calls of a drawing method of ssd
+    f = getattr(ssd, name)
+    def wrapped(*args):
+        calls[name] = calls.get(name, 0) + 1
+        return f(*args)
+    setattr(ssd, name, wrapped)
+
+for name in ('line', 'hline', 'vline', 'fill_rect', 'blit'):
+    count(name)
+
+def run(scroll):
+    refresh(ssd, True)
+    wri = CWriter(ssd, arial10, GREEN, BLACK, verbose=False)
+    g = CartesianGraph(wri, 4, 4, height=100, width=150, xorigin=10, fgcolor=GREEN,
+                       gridcolor=LIGHTGREEN, bdcolor=False)
+    ts = TSequence(g, YELLOW, SIZE, scroll=scroll)
+    for t in range(SIZE):  # Fill the trace
+        ts.add(sin(t / 10))
+    refresh(ssd)
+    ssd.virtual.reset()
+    calls.clear()
+    times = []
+    for t in range(SAMPLES):
+        tm = ticks_us()
+        if not scroll:
+            g.clear()
+        ts.add(sin(t / 10) * 0.8)
+        times.append(ticks_diff(ticks_us(), tm))
+        refresh(ssd)
+    print('{}: add() ms p50 {:.2f} p90 {:.2f}'.format('scroll' if scroll else 'replot',
+          percentile(times, 50) / 1000, percentile(times, 90) / 1000))
+    print('calls per add(): ' + ', '.join('{} {:.1f}'.format(k, calls[k] / SAMPLES) for k in sorted(calls)))
+    ssd.virtual.report()
+
+print('{} samples added to a {} sample TSequence on ST7735R 160x128'.format(SAMPLES, SIZE))
+run(False)
+run(True)
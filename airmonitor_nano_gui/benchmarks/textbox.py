@@ -0,0 +1,48 @@
+# textbox.py Host-side benchmark of a Textbox event log on the ILI9341 driver
+# (virtual SPI bus, lib/drivers/virtual/virtual.py).
+# Appends log lines to a full Textbox, refreshing after each, once with the
+# box redrawn on every append (as Textbox did before the ring buffer) and
+# once moving the lines kept with a blit and drawing only the new line.
+# Run from the airmonitor_nano_gui directory with the unix port:
+# micropython benchmarks/textbox.py [lines]
+
+import sys
+sys.path.insert(0, 'lib')
+sys.path.insert(0, '.')
+import color_setup_virtual
+sys.modules['color_setup'] = color_setup_virtual  # as USE_VIRTUAL in color_setup.py
+
+from time import ticks_us, ticks_diff
+from drivers.virtual.virtual import ili9341, percentile
+from gui.core.nanogui import refresh
+from gui.core.writer import CWriter
+from gui.widgets.textbox import Textbox
+import gui.fonts.arial10 as arial10
+from gui.core.colors import *
+
+LINES = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+class Redraw(Textbox):  # Never moves the lines on screen
+    def _shift(self, dy):
+        return False
+
+def run(cls):
+    ssd = ili9341()
+    refresh(ssd, True)
+    wri = CWriter(ssd, arial10, GREEN, BLACK, verbose=False)
+    tb = cls(wri, 10, 10, 296, 16, bdcolor=YELLOW)
+    refresh(ssd)
+    ssd.virtual.reset()
+    times = []
+    for n in range(LINES):
+        t = ticks_us()
+        tb.append('{:5d} 12:{:02d}:{:02d} eCO2 {} ppm TVOC {} ppb'.format(n, n // 60 % 60, n % 60, 400 + n * 7 % 900, n * 13 % 500))
+        times.append(ticks_diff(ticks_us(), t))
+        refresh(ssd)
+    print('{}: append() ms p50 {:.2f} p90 {:.2f}'.format(cls.__name__, percentile(times, 50) / 1000,
+                                                   percentile(times, 90) / 1000))
+    ssd.virtual.report()
+
+print('{} lines appended to a 16 line Textbox on ILI9341 320x240'.format(LINES))
+run(Redraw)
+run(Textbox)
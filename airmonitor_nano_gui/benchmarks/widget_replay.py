@@ -0,0 +1,112 @@
+# widget_replay.py Host-side replay of the asnano_oled_tft.py widget workload
+# on virtual displays (lib/drivers/virtual/virtual.py).
+# Each frame updates the three bar Meters with LEDs on the ST7735R and the clock
+# Dial on the SH1107, then refreshes both with arefresh() as the application
+# does. Meter values are a reproducible random walk.
+# Reports frame time percentiles (widget drawing and driver) and the bus
+# traffic and estimated wire time of every display.
+# Run from the airmonitor_nano_gui directory with the unix port:
+# micropython benchmarks/widget_replay.py [frames]
+
+import sys
+sys.path.insert(0, 'lib')
+sys.path.insert(0, '.')
+import color_setup_virtual
+sys.modules['color_setup'] = color_setup_virtual  # as USE_VIRTUAL in color_setup.py
+from color_setup_virtual import ssd_st7735, ssd_sh1107
+
+import uasyncio as asyncio
+from time import ticks_us, ticks_diff
+from drivers.virtual.virtual import percentile
+from gui.core.nanogui import refresh, arefresh
+from gui.core.writer import CWriter
+from gui.widgets.led import LED
+from gui.widgets.meter import Meter
+from gui.widgets.label import Label
+from gui.widgets.dial import Dial, Pointer
+import gui.fonts.arial10 as arial10
+import gui.fonts.font10 as font10
+from gui.core.colors import *
+import cmath
+
+FRAMES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+color = lambda v : RED if v > 0.7 else YELLOW if v > 0.5 else GREEN
+txt = lambda v : 'ovr' if v > 0.7 else 'high' if v > 0.5 else 'ok'
+
+_seed = 12345
+def rand():  # 0..1, same sequence on every run
+    global _seed
+    _seed = (_seed * 1103515245 + 12345) & 0x7fffffff
+    return _seed / 0x7fffffff
+
+def meters(display):
+    wri = CWriter(display, arial10, GREEN, BLACK, verbose=False)
+    wri.set_clip(True, True, False)
+    row = display.height - 16 - wri.height
+    widgets = []
+    for x, text, legend in ((2, 'eco2', ('400', '800', '1200')),
+                            (50, 'voc', ('0', '250', '500')),
+                            (98, 'temp', ('10', '20', '30'))):
+        m = Meter(wri, 5, x, height=row - 10, divisions=4, ptcolor=YELLOW,
+                  label=text, style=Meter.BAR, legends=legend)
+        l = LED(wri, row, x, bdcolor=YELLOW, label='over')
+        widgets.append([m, l, rand()])
+    return widgets
+
+def update_meters(widgets):
+    for w in widgets:
+        v = min(1, max(0, w[2] + (rand() - 0.5) * 0.2))
+        w[2] = v
+        w[0].value(v, color(v))
+        w[1].text(txt(v), fgcolor=color(v))
+
+def clock(display):
+    wri_dial = CWriter(display, arial10, GREEN, BLACK, verbose=False)
+    wri_time = CWriter(display, font10, GREEN, BLACK, verbose=False)
+    wri_dial.set_clip(True, True, False)
+    wri_time.set_clip(True, True, False)
+    h = display.width // 2 - 15
+    dial = Dial(wri_dial, 2, 0, height=h, ticks=12, bdcolor=False, label=2, pip=False)
+    lbltim = Label(wri_time, 5, h + 2, 35, fgcolor=YELLOW)
+    return dial, lbltim, Pointer(dial), Pointer(dial), Pointer(dial)
+
+def update_clock(widgets, secs):
+    dial, lbltim, hrs, mins, sec = widgets
+    uv = lambda phi : cmath.rect(1, phi)
+    pi = cmath.pi
+    h, m, s = (secs // 3600) % 24, (secs // 60) % 60, secs % 60
+    hrs.value(0.7j * uv(-h * pi / 6 - m * pi / 360), YELLOW)
+    mins.value(0.92j * uv(-m * pi / 30), YELLOW)
+    sec.value(0.92j * uv(-s * pi / 30), RED)
+    lbltim.value('{:02d}.{:02d}.{:02d}'.format(h, m, s))
+    dial.text('Sunday 18 Oct 2026')
+
+async def replay():
+    refresh(ssd_st7735, True)
+    refresh(ssd_sh1107, True)
+    tft = meters(ssd_st7735)
+    oled = clock(ssd_sh1107)
+    ssd_st7735.virtual.reset()  # Count the steady state only
+    ssd_sh1107.virtual.reset()
+    t_tft = []
+    t_oled = []
+    for n in range(FRAMES):
+        t = ticks_us()
+        update_meters(tft)
+        await arefresh(ssd_st7735)
+        t_tft.append(ticks_diff(ticks_us(), t))
+        t = ticks_us()
+        update_clock(oled, 36000 + n)
+        await arefresh(ssd_sh1107)
+        t_oled.append(ticks_diff(ticks_us(), t))
+    return t_tft, t_oled
+
+t_tft, t_oled = asyncio.run(replay())
+print('{} frames, frame time in ms (widgets and driver)'.format(FRAMES))
+print('                   p50       p90       p99       max')
+for name, v in (('ST7735R meters', t_tft), ('SH1107 clock', t_oled)):
+    print('{:<14}'.format(name) + ''.join('{:10.2f}'.format(x / 1000) for x in
+          (percentile(v, 50), percentile(v, 90), percentile(v, 99), max(v))))
+ssd_st7735.virtual.report()
+ssd_sh1107.virtual.report()
@@ -0,0 +1,90 @@
+# wrap.py Host-side benchmark of word wrap into the 160 pixel width of the TFT
+# (virtual ST7735R, lib/drivers/virtual/virtual.py).
+# Compares finding the line breaks of log lines the way Writer (stringlen()
+# of shrinking prefixes) and Textbox (own char loop) did with the shared
+# wrap() engine in gui/core/writer.py. Nothing is drawn.
+# Run from the airmonitor_nano_gui directory with the unix port:
+# micropython benchmarks/wrap.py
+
+import sys
+sys.path.insert(0, 'lib')
+from time import ticks_us, ticks_diff
+from drivers.virtual.virtual import st7735r
+from gui.core.writer import Writer, CWriter, wrap
+import gui.fonts.arial10 as arial10
+
+REPEATS = 20
+LOG = ('12:34:56 sgp30 eCO2 812 ppm TVOC 143 ppb, baseline saved; '
+       'aht20 21.4 C 48 % RH; wifi rssi -67 dBm, mqtt publish ok ')
+
+def writer_lines(wri, string):  # Writer._printline() before the wrap engine
+    lines = []
+    while True:
+        rstr = None
+        if wri.stringlen(string, True):
+            pos = 0
+            lstr = string[:]
+            while wri.stringlen(lstr, True):
+                pos = lstr.rfind(' ')
+                lstr = lstr[:pos].rstrip()
+            if pos > 0:
+                rstr = string[pos + 1:]
+                string = lstr
+        lines.append(string)
+        if rstr is None:
+            return lines
+        string = rstr
+
+def textbox_lines(font, width, s):  # Textbox._add_lines() before the wrap engine
+    lines = []
+    n = -1
+    newline = True
+    while True:
+        n += 1
+        if newline:
+            newline = False
+            ls = n
+            col = 0
+        if n >= len(s):
+            if n > ls:
+                lines.append(s[ls :])
+            return lines
+        c = s[n]
+        if c == '\n':
+            lines.append(s[ls : n])
+            newline = True
+            continue
+        col += font.get_ch(c)[2]
+        if col > width:
+            if c == ' ':
+                lines.append(s[ls : n])
+            else:
+                p = s.rfind(' ', ls, n + 1)
+                if p >= 0:
+                    lines.append(s[ls : p])
+                    n = p
+                else:
+                    lines.append(s[ls : n])
+                    n -= 1
+            newline = True
+
+def engine_lines(wri, s, truelen, split):
+    return [s[a : b] for a, b, _ in wrap(s, wri.screenwidth, wri.get_width, 0, truelen, split=split)]
+
+def ms(f):
+    t = ticks_us()
+    for _ in range(REPEATS):
+        f()
+    return ticks_diff(ticks_us(), t) / REPEATS / 1000
+
+ssd = st7735r()
+wri = CWriter(ssd, arial10, verbose=False)
+Writer.measure_cache = 0  # Every prefix is new: measure it
+print('Line breaks for 160 pixels, arial10, ms per log line')
+print(' chars  lines   Writer  wrap()   Textbox  wrap()')
+for n in (1, 2, 4, 8):
+    s = LOG * n
+    nl = len(engine_lines(wri, s, wri._truelen, False))
+    print('{:6d} {:6d} {:8.2f} {:7.2f} {:9.2f} {:7.2f}'.format(len(s), nl,
+          ms(lambda : writer_lines(wri, s)), ms(lambda : engine_lines(wri, s, wri._truelen, False)),
+          ms(lambda : textbox_lines(arial10, 160, s)), ms(lambda : engine_lines(wri, s, None, True))))
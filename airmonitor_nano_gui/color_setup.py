@@ -7,6 +7,7 @@
 # when instantiating the frame buffer. The aim is to do this as early as
 # possible before importing other modules.
 
+# 2026-1018 PP added USE_VIRTUAL: headless virtual displays (Linux build box)
 # 2024-0217 PP changed name 'setup_tft_st7735' to 'color_setup_st7735'
 # 2023-0825 PP adopted for micropython-nano-gui
 #           Tested on PYB-SF2 (i2c) and M5Stack SH1107 OLED-display
@@ -21,12 +22,20 @@ USE_OLED_SH1107    = True  # M5Stack OLED-display - 128*64
 #TODO: USE_TFT_ILI93xx    = False  #TODO: setup TFT-RGB ili9341
 #TODO: USE_EPAPER_SSD1680 = False  #TODO: ePaper WeActStudio 2.9"
 USE_TFT_ST7735     = True   # 1.8" TFT-Display WeAct Studio
+USE_VIRTUAL        = False  # virtual TFT and OLED, replaces the displays above
 
 # *** Choose your color display driver here ***
 # Kept as SSD to maintain compatability
 # Precaution before instantiating framebuf
 gc.collect()
 
+# =========================================================
+# SETUP for virtual displays, MicroPython unix port
+# =========================================================
+if USE_VIRTUAL is True:
+    from color_setup_virtual import *
+    USE_OLED_SH1107 = USE_TFT_ST7735 = False
+
 # =========================================================
 # SETUP for M5Stack, OLED-display. SH1107
 # =========================================================
@@ -3,12 +3,13 @@ nano-gui setup for SH1107 OLED-display, like M5Stack OLED
 
 MCU: Pyboard-SF2
 
+2026-1018 PP: I2C bus from the sharedbus registry
 2024-0414 PP: added config and helper print_i2c_devices
 2024_0413 PP: add display-dependend 'ssd' (ssd_sh1107)
               to have multiple displays in nano-gui programs
 2024-0217 PP modified for Pyboard-SF2 (STM32F722)
 """
-from machine import I2C
+import sharedbus
 import sh1107
 from sh1107 import SH1107_I2C as SSD
 
@@ -21,7 +22,8 @@ import config
 
 # I2C configuration
 #freq not required: i2c = I2C('X', freq=400000) # create hardware I2c object
-i2c = I2C(config.DISPLAY_I2C_ID) # create hardware I2c object
+#i2c = I2C(config.DISPLAY_I2C_ID) # create hardware I2c object
+i2c = sharedbus.i2c(config.DISPLAY_I2C_ID).client('sh1107')  # shared with sensors
 print_i2c_devices(i2c)  # for debugging
 # 2024-0414 PP moved to helpers
 #devices = i2c.scan()
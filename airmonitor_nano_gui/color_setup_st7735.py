@@ -19,6 +19,7 @@ BL       GPIO17 - LOW		 'Y4'    W46
 
 Note: SPI0 socket on Grove Shield could be used as an alternative.
 
+2026-1018 PP: SPI bus from the sharedbus registry
 2024_0413 PP: add display-dependend 'ssd' (ssd_st7735)
               to have multiple displays in nano-gui programs
 2024-0220 PP: modified backligth pin for TFT-LCD power management
@@ -29,8 +30,9 @@ Note: SPI0 socket on Grove Shield could be used as an alternative.
 
 """
 from micropython import const
-from machine import Pin, SPI
+from machine import Pin
 import gc
+import sharedbus
 from helpers import print_display_SPI_configuration
 
 # TFT-display configuration
@@ -52,7 +54,7 @@ prst = Pin(config.DISPLAY_RESET_PIN, Pin.OUT_PP, value=1)
 pbl  = Pin(config.DISPLAY_BL_PIN, Pin.OUT_PP, value=1) # BL is managed in driver
 # Note: pbl LOW (pbl(0)) will turn TFT-display in WHITE screen.
 
-spi = SPI(config.DISPLAY_SPI_ID, baudrate=config.DISPLAY_BAUDRATE)
+spi = sharedbus.spi(config.DISPLAY_SPI_ID, baudrate=config.DISPLAY_BAUDRATE).client('st7735')
 
 gc.collect()  # Precaution before instantiating framebuf
 
@@ -0,0 +1,30 @@
+"""
+nano-gui setup for headless runs on a Linux build box (MicroPython unix port)
+
+Virtual displays in place of the 1.8" TFT-LCD (ST7735) and the SH1107 OLED:
+the real drivers on virtual buses, which count what the displays would have
+been sent (see lib/drivers/virtual/virtual.py). Sizes and bus speeds are
+those in config.py, which needs pyb and is not imported here.
+
+Set SNAPSHOTS to an existing directory to write a PPM image of every frame.
+Print the accounting with ssd.virtual.report().
+
+2026-1018 PP new
+"""
+import sys
+sys.path.insert(0, 'lib')  # run from the airmonitor_nano_gui directory
+
+from drivers.virtual import virtual
+from drivers.st7735r.st7735r144 import ST7735R as SSD
+from helpers import print_display_SPI_configuration, print_display_I2C_configuration
+
+SNAPSHOTS = None  # e.g. '/tmp/frames'
+
+ssd_st7735 = virtual.st7735r(width=160, height=128, baudrate=12_000_000,
+                             driver=SSD, snapshots=SNAPSHOTS)
+ssd_sh1107 = virtual.sh1107(width=128, height=64, freq=400_000, address=0x3c,
+                            rotate=180, snapshots=SNAPSHOTS)
+ssd = ssd_st7735
+
+print_display_SPI_configuration(ssd_st7735, "virtual 1.8 TFT-LCD SPI, 128*160", landscape=True)
+print_display_I2C_configuration(ssd_sh1107, "virtual SH1107 OLED-shield 128*64")
@@ -12,6 +12,7 @@ class BoolPalette(framebuf.FrameBuffer):
     def __init__(self, mode):
         buf = bytearray(4)  # OK for <= 16 bit color
         super().__init__(buf, 2, 1, mode)
+        self.mode = mode  # Format of the destination (CWriter glyph cache)
     
     def fg(self, color):  # Set foreground color
         self.pixel(1, 0, color)
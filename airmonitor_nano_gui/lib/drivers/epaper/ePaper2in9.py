@@ -13,11 +13,45 @@
 # * | This version:   V1.0
 # * | Date        :   2022-09-08
 # -----------------------------------------------------------------------------
+# 2026-1018 PP frame data is converted in bands into a staging buffer. With
+#              block=True each band is sent with CS held low. Drawing records
+#              the changed rectangle and show() only sends that RAM window.
+# 2026-1018 PP show() does nothing, not even a refresh, if nothing changed.
+#              Tracing is printed only with debug = True.
 
 import framebuf
 import uasyncio as asyncio
+from micropython import const
 from time import sleep_ms, ticks_ms, ticks_us, ticks_diff
 
+_NBANDS = const(8)  # Staging buffer is this fraction of the frame
+
+
+# Landscape: for each of ncols framebuf columns from col emit nrows inverted
+# bytes, from byte row r0 + nrows - 1 up to r0. A column is one RAM Y line.
+@micropython.viper
+def _transpose(dest:ptr8, source:ptr8, wid:int, col:int, ncols:int, r0:int, nrows:int):
+    d = 0
+    last = wid * (r0 + nrows - 1)
+    for h in range(col, col + ncols):
+        idx = last + h
+        for _ in range(nrows):
+            dest[d] = source[idx] ^ 0xff
+            d += 1
+            idx -= wid
+
+# Portrait: copy nb inverted bytes from byte column xb0 of nlines framebuf
+# rows, starting at row. A row is one RAM Y line.
+@micropython.viper
+def _invert(dest:ptr8, source:ptr8, stride:int, row:int, nlines:int, xb0:int, nb:int):
+    d = 0
+    for y in range(row, row + nlines):
+        idx = y * stride + xb0
+        for _ in range(nb):
+            dest[d] = source[idx] ^ 0xff
+            d += 1
+            idx += 1
+
 
 class EPD(framebuf.FrameBuffer):
     # A monochrome approach should be used for coding this. The rgb method ensures
@@ -26,7 +60,7 @@ class EPD(framebuf.FrameBuffer):
     def rgb(r, g, b):
         return int((r > 127) or (g > 127) or (b > 127))
 
-    def __init__(self, spi, cs, dc, rst, busy, landscape=False, asyn=False, full=True):
+    def __init__(self, spi, cs, dc, rst, busy, landscape=False, asyn=False, full=True, block=False):
         self._spi = spi
         self._cs = cs  # Pins
         self._dc = dc
@@ -35,6 +69,7 @@ class EPD(framebuf.FrameBuffer):
         self._lsc = landscape
         self._asyn = asyn
         self._full = full
+        self._block = block  # Send each band with CS held low
         self._as_busy = False  # Set immediately on start of task. Cleared when busy pin is logically false (physically 1).
         self._updated = asyncio.Event()
         # Dimensions in pixels. Waveshare code is portrait mode.
@@ -42,8 +77,12 @@ class EPD(framebuf.FrameBuffer):
         self.width = 296 if landscape else 128  
         self.height = 128 if landscape else 296
         self.demo_mode = False  # Special mode enables demos to run
+        self.debug = False  # Print a trace of refreshes
         self._buffer = bytearray(self.height * self.width // 8)
         self._mvb = memoryview(self._buffer)
+        self._stage = bytearray(len(self._buffer) // _NBANDS)
+        self._ram_valid = False  # Panel RAM holds the whole frame
+        self._clear_updates()
         mode = framebuf.MONO_VLSB if landscape else framebuf.MONO_HLSB
         super().__init__(self._buffer, self.width, self.height, mode)
         self.init()
@@ -86,6 +125,7 @@ class EPD(framebuf.FrameBuffer):
         cmd(b'\x4E', b'\x00')
         cmd(b'\x4F', b'\x00\x00')
         self.wait_until_ready()
+        self._ram_valid = False
 
         print('Init Done.')
 
@@ -137,8 +177,9 @@ class EPD(framebuf.FrameBuffer):
         t = ticks_ms()
         while not self.ready():  
             sleep_ms(100)
-        dt = ticks_diff(ticks_ms(), t)
-        print('wait_until_ready {}ms {:5.1f}mins'.format(dt, dt/60_000))
+        if self.debug:
+            dt = ticks_diff(ticks_ms(), t)
+            print('wait_until_ready {}ms {:5.1f}mins'.format(dt, dt/60_000))
 
     async def wait(self):
         await asyncio.sleep_ms(0)  # Ensure tasks run that might make it unready
@@ -154,56 +195,174 @@ class EPD(framebuf.FrameBuffer):
     def ready(self):
         return not(self._as_busy or (self._busy() == 1))  # 1 == busy
 
-    async def _as_show(self, buf1=bytearray(1)):
-        mvb = self._mvb
-        send = self._spi.write
+    # Damage tracking: drawing records the bounding rectangle of all changes
+    # since the last show(). show() then only sends that window of panel RAM.
+    def register_updates(self, y0, y1=None, x0=None, x1=None):
+        if y1 is None:
+            y1 = y0
+        if x0 is None:
+            x0, x1 = 0, self.width - 1
+        elif x1 is None:
+            x1 = x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y1 < 0 or y0 >= self.height or x1 < 0 or x0 >= self.width:
+            return
+        self._x0 = min(self._x0, max(x0, 0))
+        self._x1 = max(self._x1, min(x1, self.width - 1))
+        self._y0 = min(self._y0, max(y0, 0))
+        self._y1 = max(self._y1, min(y1, self.height - 1))
+
+    def _clear_updates(self):
+        self._x0 = self._y0 = 0x7fff
+        self._x1 = self._y1 = -1
+
+    def pixel(self, x, y, c=None):
+        if c is None:
+            return super().pixel(x, y)
+        super().pixel(x, y, c)
+        self.register_updates(y, y, x, x)
+
+    def text(self, s, x, y, c=1):
+        super().text(s, x, y, c)
+        self.register_updates(y, y + 7, x, x + 8 * len(s) - 1)
+
+    def line(self, x0, y0, x1, y1, c):
+        super().line(x0, y0, x1, y1, c)
+        self.register_updates(y0, y1, x0, x1)
+
+    def hline(self, x, y, w, c):
+        super().hline(x, y, w, c)
+        self.register_updates(y, y, x, x + w - 1)
+
+    def vline(self, x, y, h, c):
+        super().vline(x, y, h, c)
+        self.register_updates(y, y + h - 1, x, x)
+
+    def fill(self, c):
+        super().fill(c)
+        self.register_updates(0, self.height - 1)
+
+    def fill_rect(self, x, y, w, h, c):
+        super().fill_rect(x, y, w, h, c)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def rect(self, x, y, w, h, c, *args):
+        super().rect(x, y, w, h, c, *args)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def ellipse(self, x, y, xr, yr, c, *args):
+        super().ellipse(x, y, xr, yr, c, *args)
+        self.register_updates(y - yr, y + yr, x - xr, x + xr)
+
+    def poly(self, x, y, coords, c, *args):
+        super().poly(x, y, coords, c, *args)
+        n = len(coords)
+        if n > 1:
+            xmin = xmax = coords[0]
+            ymin = ymax = coords[1]
+            for i in range(2, n - 1, 2):
+                xmin = min(xmin, coords[i])
+                xmax = max(xmax, coords[i])
+                ymin = min(ymin, coords[i + 1])
+                ymax = max(ymax, coords[i + 1])
+            self.register_updates(y + ymin, y + ymax, x + xmin, x + xmax)
+
+    # A plain FrameBuffer does not know its size: assume it extends to the
+    # edge of the screen unless the source has width and height attributes.
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        super().blit(fbuf, x, y, key, palette)
+        w = getattr(fbuf, 'width', self.width)
+        h = getattr(fbuf, 'height', self.height)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def scroll(self, xstep, ystep):
+        super().scroll(xstep, ystep)
+        self.register_updates(0, self.height - 1)
+
+    # Set the RAM window and address counters for the dirty rectangle. The
+    # whole frame is sent after init() as panel RAM contents are unknown.
+    # Return (first line, number of lines, first byte row/column, bytes per line)
+    # in framebuf terms, or None if nothing has changed.
+    def _window(self):
+        if not self._ram_valid:
+            self._clear_updates()
+            self.register_updates(0, self.height - 1)
+            self._ram_valid = True
+        x0, y0, x1, y1 = self._x0, self._y0, self._x1, self._y1
+        if x1 < 0:
+            return None
+        if self._lsc:  # RAM Y is the framebuf column, RAM X the byte row from the bottom
+            tbc = self.height // 8
+            line0, nlines = x0, x1 - x0 + 1
+            b0, nb = y0 >> 3, (y1 >> 3) - (y0 >> 3) + 1
+            xs, xe = tbc - b0 - nb, tbc - 1 - b0
+        else:  # RAM Y is the framebuf row, RAM X the byte column
+            line0, nlines = y0, y1 - y0 + 1
+            b0, nb = x0 >> 3, (x1 >> 3) - (x0 >> 3) + 1
+            xs, xe = b0, b0 + nb - 1
+        ye = line0 + nlines - 1
         cmd = self._command
+        cmd(b'\x44', bytes((xs, xe)))
+        cmd(b'\x45', bytes((line0 & 0xff, line0 >> 8, ye & 0xff, ye >> 8)))
+        cmd(b'\x4E', bytes((xs,)))
+        cmd(b'\x4F', bytes((line0 & 0xff, line0 >> 8)))
+        return line0, nlines, b0, nb
 
-        cmd(b'\x24')  # DATA_START_TRANSMISSION_2 not in datasheet
+    # Convert up to a staging buffer of lines starting at line. Return the
+    # number of lines converted and the data to send.
+    def _band(self, line, end, b0, nb):
+        stage = self._stage
+        n = min(len(stage) // nb, end - line)
+        if self._lsc:
+            _transpose(stage, self._mvb, self.width, line, n, b0, nb)
+        else:
+            _invert(stage, self._mvb, self.width // 8, line, n, b0, nb)
+        return n, memoryview(stage)[: n * nb]
 
-        self._dc(1)
-        # Necessary to deassert CS after each byte otherwise display does not
-        # clear down correctly
-        t = ticks_ms()
-        if self._lsc:  # Landscape mode
-            wid = self.width
-            tbc = self.height // 8  # Vertical bytes per column
-            iidx = wid * (tbc - 1)  # Initial index
-            idx = iidx  # Index into framebuf
-            vbc = 0  # Current vertical byte count
-            hpc = 0  # Horizontal pixel count
-            for i in range(len(mvb)):
-                self._cs(0)
-                buf1[0] = ~mvb[idx]  # INVERSION HACK ~data
-                send(buf1)
-                self._cs(1)
-                idx -= self.width
-                vbc += 1
-                vbc %= tbc
-                if not vbc:
-                    hpc += 1
-                    idx = iidx + hpc
-                if not(i & 0x1f) and (ticks_diff(ticks_ms(), t) > 20):
-                    await asyncio.sleep_ms(0)
-                    t = ticks_ms()
+    def _send(self, data, buf1=bytearray(1)):
+        if self._block:
+            self._cs(0)
+            self._spi.write(data)
+            self._cs(1)
         else:
-            for i, b in enumerate(mvb):
+            # Some panels need CS deasserted after each byte to clear down correctly
+            send = self._spi.write
+            for b in data:
                 self._cs(0)
-                buf1[0] = ~b  # INVERSION HACK ~data
+                buf1[0] = b
                 send(buf1)
                 self._cs(1)
-                if not(i & 0x1f) and (ticks_diff(ticks_ms(), t) > 20):
-                    await asyncio.sleep_ms(0)
-                    t = ticks_ms()
+
+    async def _as_show(self):
+        cmd = self._command
+        win = self._window()
+        if win is None:  # Nothing has changed: no refresh
+            self._updated.set()
+            self._updated.clear()
+            self._as_busy = False
+            return
+        self._clear_updates()
+        cmd(b'\x24')  # DATA_START_TRANSMISSION_2 not in datasheet
+        self._dc(1)
+        line, nlines, b0, nb = win
+        end = line + nlines
+        while line < end:
+            n, data = self._band(line, end, b0, nb)
+            self._send(data)
+            line += n
+            await asyncio.sleep_ms(0)
 
         self._updated.set()  # framebuf has now been copied to the device
         self._updated.clear()
+        if self.debug:
+            print('async full refresh' if self._full else 'async partial refresh')
         if self._full:
-            print('async full refresh')
             cmd(b'\x22', b'\xF7')
             cmd(b'\x20')  # DISPLAY_REFRESH
         else:
-            print('async partial refresh')
             cmd(b'\x22', b'\x0F')
             cmd(b'\x20')  # DISPLAY_REFRESH
         await asyncio.sleep(1)
@@ -213,7 +372,9 @@ class EPD(framebuf.FrameBuffer):
 
     # draw the current frame memory. Blocking time ~180ms
     def show(self, buf1=bytearray(1)):
-        
+        if self._ram_valid and self._x1 < 0:
+            return  # Nothing has changed: no refresh
+
         if not self._full:
             self.init_partial()
         
@@ -224,50 +385,29 @@ class EPD(framebuf.FrameBuffer):
             asyncio.create_task(self._as_show())
             return
         t = ticks_us()
-        mvb = self._mvb
-        send = self._spi.write
         cmd = self._command
+        win = self._window()
+        self._clear_updates()
 
         cmd(b'\x24')  # DATA_START_TRANSMISSION_2 not in datasheet
 
         self._dc(1)
-        # Necessary to deassert CS after each byte otherwise display does not
-        # clear down correctly
-        if self._lsc:  # Landscape mode
-            wid = self.width
-            tbc = self.height // 8  # Vertical bytes per column
-            iidx = wid * (tbc - 1)  # Initial index
-            idx = iidx  # Index into framebuf
-            vbc = 0  # Current vertical byte count
-            hpc = 0  # Horizontal pixel count
-            for _ in range(len(mvb)):
-                self._cs(0)
-                buf1[0] = ~mvb[idx]  # INVERSION HACK ~data
-                send(buf1)
-                self._cs(1)
-                idx -= self.width
-                vbc += 1
-                vbc %= tbc
-                if not vbc:
-                    hpc += 1
-                    idx = iidx + hpc
-        else:
-            for b in mvb:
-                self._cs(0)
-                buf1[0] = ~b  # INVERSION HACK ~data
-                send(buf1)
-                self._cs(1)
+        line, nlines, b0, nb = win
+        end = line + nlines
+        while line < end:
+            n, data = self._band(line, end, b0, nb)
+            self._send(data)
+            line += n
 
         if self._full:
-            print('sync full refresh')
             cmd(b'\x22', b'\xF7')
             cmd(b'\x20')  # DISPLAY_REFRESH
         else:
-            print('sync partial refresh')
             cmd(b'\x22', b'\x0F')
             cmd(b'\x20')  # DISPLAY_REFRESH
-        te = ticks_us()
-        print('show time', ticks_diff(te, t)//1000, 'ms')
+        if self.debug:
+            print('sync full refresh' if self._full else 'sync partial refresh')
+            print('show time', ticks_diff(ticks_us(), t)//1000, 'ms')
         if not self.demo_mode:
             # Immediate return to avoid blocking the whole application.
             # User should wait for ready before calling refresh()
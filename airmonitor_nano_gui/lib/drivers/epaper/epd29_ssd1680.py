@@ -21,6 +21,8 @@
 
 # =============================================
 # 2023-1012 PP modified import for BoolPalette
+# 2026-1018 PP show() converts the frame in bands with viper routines and
+#              sends each band with a single spi.write
 # =============================================
 
 import framebuf
@@ -32,6 +34,29 @@ from drivers.boolpalette import BoolPalette
 from machine import lightsleep, Pin
 
 
+_NBANDS = const(8)  # The frame is sent in this many SPI writes
+
+
+# Landscape: emit ncols framebuf columns starting at col, each as tbc inverted
+# bytes from the bottom byte row upwards.
+@micropython.viper
+def _transpose(dest:ptr8, source:ptr8, wid:int, tbc:int, col:int, ncols:int):
+    d = 0
+    last = wid * (tbc - 1)
+    for h in range(col, col + ncols):
+        idx = last + h
+        for _ in range(tbc):
+            dest[d] = source[idx] ^ 0xff
+            d += 1
+            idx -= wid
+
+# Portrait: the framebuf layout matches the panel, just invert.
+@micropython.viper
+def _invert(dest:ptr8, source:ptr8, length:int):
+    for i in range(length):
+        dest[i] = source[i] ^ 0xff
+
+
 class TimeoutError(Exception):
     def __init__(self, msg):
         super().__init__(msg)
@@ -68,6 +93,7 @@ class EPD(framebuf.FrameBuffer):
 
         self._buffer = bytearray(self.height * self.width // 8)
         self._mvb = memoryview(self._buffer)
+        self._tbuf = bytearray(len(self._buffer) // _NBANDS)  # Converted band
         mode = framebuf.MONO_VLSB if landscape else framebuf.MONO_HLSB
         self.palette = BoolPalette(mode)
         super().__init__(self._buffer, self.width, self.height, mode)
@@ -163,29 +189,21 @@ class EPD(framebuf.FrameBuffer):
 
         mvb = self._mvb
         cmd = self._command
-        dat = self._data
 
         cmd(b'\x24')
+        tbuf = self._tbuf
         if self._lsc:  # Landscape mode
             wid = self.width
             tbc = self.height // 8  # Vertical bytes per column
-            iidx = wid * (tbc - 1)  # Initial index
-            idx = iidx  # Index into framebuf
-            vbc = 0  # Current vertical byte count
-            hpc = 0  # Horizontal pixel count
-            for _ in range(len(mvb)):
-                buf1[0] = ~mvb[idx]
-                dat(buf1)
-                idx -= wid
-                vbc += 1
-                vbc %= tbc
-                if not vbc:
-                    hpc += 1
-                    idx = iidx + hpc
+            ncols = wid // _NBANDS
+            for col in range(0, wid, ncols):
+                _transpose(tbuf, mvb, wid, tbc, col, ncols)
+                self._spi.write(tbuf)
         else:
-            for b in mvb:
-                buf1[0] = ~b
-                dat(buf1)
+            n = len(tbuf)
+            for start in range(0, len(mvb), n):
+                _invert(tbuf, mvb[start:], n)
+                self._spi.write(tbuf)
 
         if fast_refresh:
             cmd(b'\x22', b'\xFF')
@@ -9,6 +9,13 @@
 # Also this forum thread with ideas from @minyiky:
 # https://forum.micropython.org/viewtopic.php?f=18&t=9368
 
+# 2026-1018 PP: vscroll(): hardware vertical scrolling (portrait), see below
+# 2026-1018 PP: show() sends only the dirty window, see register_updates()
+#               shadow: damage found by comparing with the last frame sent
+# 2026-1018 PP: do_refresh() holds the bus lock when spi is a sharedbus client
+#               show() during do_refresh() is sent when the transfer ends
+# 2026-1018 PP: byte pair table plut: two pixels converted per lookup
+# 2026-1018 PP: linebuf_size: several lines are sent per spi.write
 # 2023-1007 PP: added some methodes from rdagger. Some are work-in-progress
 
 from time import sleep_ms
@@ -16,17 +23,20 @@ import gc
 import framebuf
 import uasyncio as asyncio
 from drivers.boolpalette import BoolPalette
+from drivers.shadow import Shadow, SHADOW_NONE
 
+# _plut: build the byte pair table from the 16 entry color LUT. A GS4 byte
+# holds two pixels; its entry is both RGB565 values in the order sent.
 @micropython.viper
-def _lcopy(dest:ptr16, source:ptr8, lut:ptr16, length:int):
-    # rgb565 - 16bit/pixel
-    n = 0
+def _plut(dest:ptr32, lut:ptr16):
+    for c in range(256):
+        dest[c] = lut[c >> 4] | (lut[c & 0x0f] << 16)
+
+# _lcopy: one 32 bit store (two pixels) per source byte.
+@micropython.viper
+def _lcopy(dest:ptr32, source:ptr8, plut:ptr32, length:int):
     for x in range(length):
-        c = source[x]
-        dest[n] = lut[c >> 4]  # current pixel
-        n += 1
-        dest[n] = lut[c & 0x0f]  # next pixel
-        n += 1
+        dest[x] = plut[source[x]]
 
 # 2023-1007 PP added from rdagger-github: NOT TESTED
 def color565(r, g, b):
@@ -43,6 +53,12 @@ def color565(r, g, b):
 class ILI9341(framebuf.FrameBuffer):
 
     lut = bytearray(32)
+    plut = bytearray(1024)  # 4 output bytes for each GS4 byte, built from lut
+
+    # Called by CWriter.create_color after it has changed lut.
+    @classmethod
+    def lut_changed(cls):
+        _plut(cls.plut, cls.lut)
     
     # 2023-1007 PP added for rotation display
     #           and changed in binary buffer
@@ -63,8 +79,10 @@ class ILI9341(framebuf.FrameBuffer):
 
     # Transpose width & height for landscape mode
     # 2023-1007 PP added led-pin for backlight control
+    # linebuf_size is the RAM budget in bytes for converted lines. It is rounded
+    # down to whole lines (minimum 1); each spi.write sends that many lines.
     def __init__(self, spi, cs, dc, rst, led, height=240, width=320,
-                 usd=False, init_spi=False):
+                 usd=False, init_spi=False, linebuf_size=0, shadow=SHADOW_NONE):
         self._spi = spi
         self._cs = cs
         self._dc = dc
@@ -79,7 +97,18 @@ class ILI9341(framebuf.FrameBuffer):
         buf = bytearray(self.height * self.width // 2)
         self._mvb = memoryview(buf)
         super().__init__(buf, self.width, self.height, mode)
-        self._linebuf = bytearray(self.width * 2)
+        self._lines = max(linebuf_size // (self.width * 2), 1)  # Lines per spi.write
+        self._linebuf = bytearray(self.width * 2 * self._lines)
+        self._mvlb = memoryview(self._linebuf)
+        self.bytes_sent = 0  # Bytes written to the panel by the last show()
+        self._clear_updates()
+        # Hardware scroll area (rows, inclusive) and offset, see vscroll()
+        self._va0 = 0
+        self._va1 = self.height - 1
+        self._voff = 0
+        # shadow: SHADOW_CRC or SHADOW_FULL (see drivers/shadow.py) replaces
+        # damage reported by drawing methods with a comparison of frames.
+        self._shadow = Shadow(shadow, self._mvb, self.height, self.width // 2, 1, 2) if shadow else None
         # Hardware reset
         self._rst(0)
         sleep_ms(50)
@@ -87,7 +116,10 @@ class ILI9341(framebuf.FrameBuffer):
         sleep_ms(50)
         if self._spi_init:  # A callback was passed
             self._spi_init(spi)  # Bus may be shared
-        self._lock = asyncio.Lock()
+        # Held by do_refresh(). A sharedbus client provides the bus lock.
+        self._lock = getattr(spi, 'lock', None) or asyncio.Lock()
+        self._refreshing = False  # do_refresh() is sending a window
+        self._pending = False  # show() was called meanwhile: send again
         # Send initialization commands
         self._wcmd(b'\x01')  # SWRESET Software reset
         sleep_ms(100)
@@ -152,54 +184,280 @@ class ILI9341(framebuf.FrameBuffer):
         self._spi.write(data)
         self._cs(1)
 
-# Time (ESP32 stock freq) 196ms portrait, 185ms landscape.
-# mem free on ESP32 43472 bytes (vs 110192)
-    @micropython.native
-    def show(self):
-        clut = ILI9341.lut
-        wd = self.width // 2
-        ht = self.height
-        lb = self._linebuf
-        buf = self._mvb
+# =========== Dirty window: only changed pixels are sent by show() ==========
+# Each drawing method records the bounding box of what it touched. show()
+# sets CASET/RASET to the union of those boxes and sends only those lines.
+
+    def _clear_updates(self):  # Empty window: ._y1 < ._y0
+        self._y0 = self.height
+        self._y1 = -1
+        self._x0 = self.width
+        self._x1 = -1
+
+    # Add a rectangle (inclusive coordinates, any order) to the dirty window.
+    # x0 None means full width. Off-screen parts are ignored.
+    def register_updates(self, y0, y1=None, x0=None, x1=None):
+        if y1 is None:
+            y1 = y0
+        elif y0 > y1:
+            y0, y1 = y1, y0
+        if x0 is None:
+            x0 = 0
+            x1 = self.width - 1
+        elif x1 is None:
+            x1 = x0
+        elif x0 > x1:
+            x0, x1 = x1, x0
+        if y1 < 0 or x1 < 0 or y0 >= self.height or x0 >= self.width:
+            return
+        if y0 < self._y0:
+            self._y0 = max(y0, 0)
+        if y1 > self._y1:
+            self._y1 = min(y1, self.height - 1)
+        if x0 < self._x0:
+            self._x0 = max(x0, 0)
+        if x1 > self._x1:
+            self._x1 = min(x1, self.width - 1)
+
+    def pixel(self, x, y, c=None):
+        if c is None:
+            return super().pixel(x, y)
+        super().pixel(x, y, c)
+        self.register_updates(y, y, x, x)
+
+    def text(self, s, x, y, c=1):
+        super().text(s, x, y, c)
+        self.register_updates(y, y + 7, x, x + 8 * len(s) - 1)
+
+    def line(self, x0, y0, x1, y1, c):
+        super().line(x0, y0, x1, y1, c)
+        self.register_updates(y0, y1, x0, x1)
+
+    def hline(self, x, y, w, c):
+        super().hline(x, y, w, c)
+        self.register_updates(y, y, x, x + w - 1)
+
+    def vline(self, x, y, h, c):
+        super().vline(x, y, h, c)
+        self.register_updates(y, y + h - 1, x, x)
+
+    def fill(self, c):
+        super().fill(c)
+        self.register_updates(0, self.height - 1)
+
+    def fill_rect(self, x, y, w, h, c):
+        super().fill_rect(x, y, w, h, c)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def rect(self, x, y, w, h, c, *args):
+        super().rect(x, y, w, h, c, *args)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def ellipse(self, x, y, xr, yr, c, *args):
+        super().ellipse(x, y, xr, yr, c, *args)
+        self.register_updates(y - yr, y + yr, x - xr, x + xr)
+
+    def poly(self, x, y, coords, c, *args):
+        super().poly(x, y, coords, c, *args)
+        n = len(coords)
+        if n > 1:
+            xmin = xmax = coords[0]
+            ymin = ymax = coords[1]
+            for i in range(2, n - 1, 2):
+                xmin = min(xmin, coords[i])
+                xmax = max(xmax, coords[i])
+                ymin = min(ymin, coords[i + 1])
+                ymax = max(ymax, coords[i + 1])
+            self.register_updates(y + ymin, y + ymax, x + xmin, x + xmax)
+
+    # A plain FrameBuffer does not know its size: assume it extends to the
+    # edge of the screen unless the source has width and height attributes.
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        super().blit(fbuf, x, y, key, palette)
+        w = getattr(fbuf, 'width', self.width)
+        h = getattr(fbuf, 'height', self.height)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def scroll(self, xstep, ystep):
+        super().scroll(xstep, ystep)
+        self.register_updates(0, self.height - 1)
+
+    # Take the dirty window. Return its pieces as (first row, rows, panel RAM
+    # row) (see _parts()), its first column and one window line of the line
+    # buffer. None if nothing changed.
+    def _begin(self, full_update):
+        if self._shadow:
+            self._clear_updates()
+            self._shadow.diff(self.register_updates)
+        if full_update:
+            self.register_updates(0, self.height - 1)
+        self.bytes_sent = 0
+        y0 = self._y0
+        y1 = self._y1
+        if y1 < y0:  # Nothing has changed
+            return None
+        x0 = self._x0 & ~1  # Window must start and end on a byte boundary
+        x1 = self._x1 | 1
+        self._clear_updates()
+        return self._parts(y0, y1), x0, self._mvlb[: (x1 - x0 + 1) * 2]
+
+    # Contiguous pieces (first row, rows, panel RAM row) of rows y0..y1. Rows
+    # of the scroll area are rotated in panel RAM by the scroll offset.
+    def _parts(self, y0, y1):
+        a, b, off = self._va0, self._va1, self._voff
+        if not off or y1 < a or y0 > b:
+            return ((y0, y1 - y0 + 1, y0),)
+        parts = []
+        if y0 < a:
+            parts.append((y0, a - y0, y0))
+            y0 = a
+        r = a + (y0 - a + off) % (b - a + 1)
+        n = min(y1, b) - y0 + 1
+        k = min(n, b + 1 - r)  # Rows before the wrap in RAM
+        parts.append((y0, k, r))
+        if k < n:
+            parts.append((y0 + k, n - k, a))
+        if y1 > b:
+            parts.append((b + 1, y1 - b, b + 1))
+        return parts
+
+    # Set the panel window for nlines lines from row y, stored from RAM row
+    # ram, and start WRITE_RAM, leaving CS asserted. Return the framebuf index
+    # of the first line.
+    def _window(self, y, nlines, ram, x0, lb):
         if self._spi_init:  # A callback was passed
             self._spi_init(self._spi)  # Bus may be shared
-        # Commands needed to start data write 
-        self._wcd(b'\x2a', int.to_bytes(self.width, 4, 'big'))  # SET_COLUMN
-        self._wcd(b'\x2b', int.to_bytes(ht, 4, 'big'))  # SET_PAGE
-        self._wcmd(b'\x2c')  # WRITE_RAM
-        self._dc(1)
+        # Commands needed to start data write
+        x1 = x0 + len(lb) // 2 - 1
+        self._wcd(b'\x2a', int.to_bytes((x0 << 16) + x1, 4, 'big'))  # SET_COLUMN
+        self._wcd(b'\x2b', int.to_bytes((ram << 16) + ram + nlines - 1, 4, 'big'))  # SET_PAGE
+        self._dc(0)
         self._cs(0)
-        for start in range(0, wd*ht, wd):  # For each line
-            _lcopy(lb, buf[start :], clut, wd)  # Copy and map colors
-            self._spi.write(lb)
-        self._cs(1)
+        self._spi.write(b'\x2c')  # WRITE_RAM
+        self._dc(1)
+        self.bytes_sent += 11 + len(lb) * nlines  # SET_COLUMN, SET_PAGE, WRITE_RAM + data
+        return (self.width * y + x0) // 2
 
+    # Convert and send nlines lines starting at framebuf index start. lb is
+    # one window line of the line buffer: lines are staged in the buffer so
+    # that each spi.write sends as many as fit. Return the index of the next line.
+    @micropython.native
+    def _send(self, start, nlines, lb):
+        clut = ILI9341.plut
+        wd = self.width // 2
+        nb = len(lb) // 4  # Source bytes per line
+        lbytes = len(lb)
+        buf = self._mvb
+        stage = self._mvlb
+        per = len(stage) // lbytes  # Lines per spi.write
+        while nlines > 0:
+            n = min(per, nlines)
+            end = n * lbytes
+            for off in range(0, end, lbytes):
+                _lcopy(stage[off :], buf[start :], clut, nb)  # Copy and map colors
+                start += wd
+            self._spi.write(stage[: end])
+            nlines -= n
+        return start
+
+# Time (ESP32 stock freq) 196ms portrait, 185ms landscape for a full frame.
+# A window costs in proportion to its area. full_update=True ignores the window.
+# mem free on ESP32 43472 bytes (vs 110192)
+    def show(self, full_update=False):
+        if self._refreshing:  # Would break into the window being sent
+            if full_update:
+                self.register_updates(0, self.height - 1)
+            self._pending = True  # do_refresh() sends the changes when done
+            return
+        w = self._begin(full_update)
+        if w is None:
+            return
+        parts, x0, lb = w
+        for y, nlines, ram in parts:
+            self._send(self._window(y, nlines, ram, x0, lb), nlines, lb)
+            self._cs(1)
+
+    # As show() but yields to the scheduler after every height // split lines.
     async def do_refresh(self, split=4):
+        lines, mod = divmod(self.height, split)  # Lines per segment
+        if mod:
+            raise ValueError('Invalid do_refresh arg.')
         async with self._lock:
-            lines, mod = divmod(self.height, split)  # Lines per segment
-            if mod:
-                raise ValueError('Invalid do_refresh arg.')
-            clut = ILI9341.lut
-            wd = self.width // 2
-            ht = self.height
-            lb = self._linebuf
-            buf = self._mvb
-            # Commands needed to start data write 
-            self._wcd(b'\x2a', int.to_bytes(self.width, 4, 'big'))  # SET_COLUMN
-            self._wcd(b'\x2b', int.to_bytes(ht, 4, 'big'))  # SET_PAGE
-            self._wcmd(b'\x2c')  # WRITE_RAM
-            self._dc(1)
-            line = 0
-            for _ in range(split):  # For each segment
-                if self._spi_init:  # A callback was passed
-                    self._spi_init(self._spi)  # Bus may be shared
-                self._cs(0)
-                for start in range(wd * line, wd * (line + lines), wd):  # For each line
-                    _lcopy(lb, buf[start :], clut, wd)  # Copy and map colors
-                    self._spi.write(lb)
-                line += lines
-                self._cs(1)  # Allow other tasks to use bus
-                await asyncio.sleep_ms(0)
+            self._refreshing = True
+            try:
+                while True:
+                    self._pending = False
+                    w = self._begin(False)
+                    if w is None:
+                        return
+                    parts, x0, lb = w
+                    for y, nlines, ram in parts:
+                        start = self._window(y, nlines, ram, x0, lb)
+                        while nlines > 0:  # For each segment
+                            if self._spi_init:  # A callback was passed
+                                self._spi_init(self._spi)  # Bus may be shared
+                            self._cs(0)
+                            start = self._send(start, min(lines, nlines), lb)
+                            nlines -= lines
+                            self._cs(1)  # Allow other tasks to use bus
+                            await asyncio.sleep_ms(0)
+                    if not self._pending:
+                        return
+            finally:
+                self._refreshing = False
+
+    # Hardware vertical scroll of rows y0..y1 (default all) by dy rows, as
+    # scroll(0, dy) would do to those rows: the framebuf rows are moved, the
+    # panel start address (VSCRSADD) changes and only the exposed rows are
+    # marked for show(). Like scroll() the exposed rows keep their old
+    # content; callers clear or redraw them. Rows are full width.
+    # The panel scrolls along its 320 line side, so this works in portrait
+    # mode only, and not while do_refresh() is sending. Return False, having
+    # done nothing, when it cannot be used.
+    def vscroll(self, dy, y0=0, y1=None):
+        ht = self.height
+        if y1 is None:
+            y1 = ht - 1
+        nrows = y1 - y0 + 1
+        if (self.width > ht or self._refreshing or y0 < 0 or y1 >= ht
+                or not 0 < abs(dy) < nrows):
+            return False
+        if (y0, y1) != (self._va0, self._va1):  # New scroll area
+            if self._voff:  # Rows of the old area are rotated in RAM
+                self.register_updates(self._va0, self._va1)
+                if self._shadow:
+                    self._shadow.invalidate()
+            self._va0, self._va1, self._voff = y0, y1, 0
+        wb = self.width // 2
+        framebuf.FrameBuffer(self._mvb[y0 * wb : (y1 + 1) * wb], self.width, nrows,
+                             framebuf.GS4_HMSB).scroll(0, dy)
+        if self._y0 <= y1 and self._y1 >= y0:  # Dirty rows in the area move too
+            self.register_updates(max(max(self._y0, y0) + dy, y0),
+                                  min(min(self._y1, y1) + dy, y1), self._x0, self._x1)
+        if dy < 0:
+            self.register_updates(y1 + dy + 1, y1)
+        else:
+            self.register_updates(y0, y0 + dy - 1)
+        if self._shadow:
+            self._shadow.scroll(dy, y0, y1)
+        self._voff = (self._voff - dy) % nrows
+        self._vscrdef()
+        return True
+
+    # Send the scroll area and start address. Rotation 0 sets MY in MADCTL,
+    # which reverses the RAM rows against the scan: areas and offset count
+    # from the other end.
+    def _vscrdef(self):
+        nrows = self._va1 - self._va0 + 1
+        if self.ROTATE[self._rotation][0] & 0x80:
+            tfa = self.height - 1 - self._va1
+            ssa = tfa + (-self._voff) % nrows
+        else:
+            tfa = self._va0
+            ssa = tfa + self._voff
+        bfa = self.height - tfa - nrows
+        self._wcd(b'\x33', int.to_bytes((tfa << 32) + (nrows << 16) + bfa, 6, 'big'))  # VSCRDEF
+        self._wcd(b'\x37', int.to_bytes(ssa, 2, 'big'))  # VSCRSADD
         
     # ======================================
     # 2023-1007 PP added from rdagger-github
@@ -242,8 +500,14 @@ class ILI9341(framebuf.FrameBuffer):
         data = self.ROTATE[self._rotation]
         #print(f"rotation={self._rotation}, data={data}")
         self._wcd(b'\x36', data)
+        if self._voff:  # 2026-1018 PP: scroll offset does not survive rotation
+            self._va0, self._va1, self._voff = 0, self.height - 1, 0
+            self._wcd(b'\x33', int.to_bytes(max(self.width, self.height) << 16, 6, 'big'))  # VSCRDEF
+            self._wcd(b'\x37', b'\x00\x00')  # VSCRSADD
+            if self._shadow:
+                self._shadow.invalidate()
         if refresh is True:
-            self.show()  # required to update display
+            self.show(True)  # required to update display
         sleep_ms(100)
 
     def is_off_grid(self, xmin, ymin, xmax, ymax):
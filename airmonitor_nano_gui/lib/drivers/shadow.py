@@ -0,0 +1,171 @@
+# shadow.py Shadow frame for nano-gui drivers with windowed show().
+
+# Released under the MIT License (MIT). See LICENSE.
+
+# A Shadow remembers the frame last sent to the panel and finds what has
+# changed since by comparing it with the framebuffer, so code which writes the
+# buffer without reporting damage still gets partial updates. The driver calls
+# diff() when it is about to send and passes its register_updates method.
+# Memory against speed is chosen per display:
+# SHADOW_NONE no shadow: the driver relies on damage reported by drawing.
+# SHADOW_CRC  4 bytes per line: a hash per line finds changed lines.
+# SHADOW_FULL a copy of the frame: finds changed lines and the span of
+#             changed bytes within each.
+
+# 2026-1018 PP new
+
+from micropython import const
+from array import array
+import framebuf
+
+SHADOW_NONE = const(0)
+SHADOW_CRC = const(1)
+SHADOW_FULL = const(2)
+
+# Compare nlines lines of lbytes bytes. For each line store the first and last
+# changed byte in spans (0xffff, 0 if unchanged) and copy the changes into
+# shadow. Return the number of changed lines.
+@micropython.viper
+def _diff_lines(shadow:ptr8, buf:ptr8, nlines:int, lbytes:int, spans:ptr16) -> int:
+    changed = 0
+    base = 0
+    for i in range(nlines):
+        f = 0
+        while f < lbytes and shadow[base + f] == buf[base + f]:
+            f += 1
+        if f == lbytes:
+            spans[2 * i] = 0xffff
+            spans[2 * i + 1] = 0
+        else:
+            l = lbytes - 1
+            while shadow[base + l] == buf[base + l]:
+                l -= 1
+            j = f
+            while j <= l:
+                shadow[base + j] = buf[base + j]
+                j += 1
+            spans[2 * i] = f
+            spans[2 * i + 1] = l
+            changed += 1
+        base += lbytes
+    return changed
+
+# Hash each line (30 bit djb2 variant). Set flags[i] if the hash of line i
+# differs from hashes[i], which is updated. Return the number of changed lines.
+@micropython.viper
+def _hash_lines(hashes:ptr32, buf:ptr8, nlines:int, lbytes:int, flags:ptr8) -> int:
+    changed = 0
+    base = 0
+    for i in range(nlines):
+        h = 5381
+        for j in range(base, base + lbytes):
+            h = ((h << 5) + h + buf[j]) & 0x3fffffff
+        if int(hashes[i]) == h:
+            flags[i] = 0
+        else:
+            hashes[i] = h
+            flags[i] = 1
+            changed += 1
+        base += lbytes
+    return changed
+
+
+class Shadow:
+
+    # buf is the framebuffer, nlines lines of line_bytes bytes. A line covers
+    # rows_per_line pixel rows (8 for MONO_VLSB pages) and each byte of it
+    # px_per_byte pixel columns (2 for GS4, 8 for MONO_HMSB, 1 for GS8/VLSB).
+    def __init__(self, mode, buf, nlines, line_bytes, rows_per_line=1, px_per_byte=1):
+        if mode not in (SHADOW_CRC, SHADOW_FULL):
+            raise ValueError('Shadow mode must be SHADOW_CRC or SHADOW_FULL')
+        self.mode = mode
+        self._buf = buf
+        self._nlines = nlines
+        self._lbytes = line_bytes
+        self._rpl = rows_per_line
+        self._ppb = px_per_byte
+        if mode == SHADOW_FULL:
+            self._shadow = bytearray(nlines * line_bytes)
+            self._spans = array('H', (0 for _ in range(2 * nlines)))
+        else:
+            self._hashes = array('I', (0 for _ in range(nlines)))
+            self._flags = bytearray(nlines)
+        self.lines_changed = 0  # Found by the last diff()
+        self.invalidate()
+
+    # Panel contents unknown (power up, wake, rotation): next diff() reports
+    # the whole frame.
+    def invalidate(self):
+        self._valid = False
+
+    # The panel was scrolled in hardware by dlines lines within lines
+    # first..last: rotate the remembered frame with it, as the panel RAM is.
+    def scroll(self, dlines, first=0, last=None):
+        if last is None:
+            last = self._nlines - 1
+        n = last - first + 1
+        if not self._valid or not dlines:
+            return
+        if abs(dlines) >= n:
+            self.invalidate()
+            return
+        if self.mode == SHADOW_FULL:
+            lb = self._lbytes
+            band = memoryview(self._shadow)[first * lb : (last + 1) * lb]
+            k = abs(dlines) * lb
+            out = bytes(band[: k] if dlines < 0 else band[-k :])  # Lines scrolled out
+            framebuf.FrameBuffer(band, lb, n, framebuf.GS8).scroll(0, dlines)
+            if dlines < 0:
+                band[-k :] = out
+            else:
+                band[: k] = out
+        else:
+            h = self._hashes
+            old = h[first : last + 1]
+            for i in range(n):
+                h[first + i] = old[(i - dlines) % n]
+
+    # Report what changed since the last diff() through register(y0, y1, x0, x1),
+    # once per run of consecutive changed lines.
+    def diff(self, register):
+        nlines, lbytes, rpl = self._nlines, self._lbytes, self._rpl
+        if not self._valid:
+            if self.mode == SHADOW_FULL:
+                self._shadow[:] = self._buf[: nlines * lbytes]
+            else:
+                _hash_lines(self._hashes, self._buf, nlines, lbytes, self._flags)
+            self._valid = True
+            self.lines_changed = nlines
+            register(0, nlines * rpl - 1)
+            return nlines
+        ppb = self._ppb
+        if self.mode == SHADOW_FULL:
+            n = _diff_lines(self._shadow, self._buf, nlines, lbytes, self._spans)
+            spans = self._spans
+            i = 0
+            while n and i < nlines:
+                f = spans[2 * i]
+                if f == 0xffff:
+                    i += 1
+                    continue
+                first, l = i, spans[2 * i + 1]
+                i += 1
+                while i < nlines and spans[2 * i] != 0xffff:
+                    f = min(f, spans[2 * i])
+                    l = max(l, spans[2 * i + 1])
+                    i += 1
+                register(first * rpl, i * rpl - 1, f * ppb, (l + 1) * ppb - 1)
+        else:
+            n = _hash_lines(self._hashes, self._buf, nlines, lbytes, self._flags)
+            flags = self._flags
+            i = 0
+            while n and i < nlines:
+                if not flags[i]:
+                    i += 1
+                    continue
+                first = i
+                while i < nlines and flags[i]:
+                    i += 1
+                register(first * rpl, i * rpl - 1)
+        self.lines_changed = n
+        return n
@@ -2,6 +2,10 @@
 TFT-driver for ST7735 - 1.44" TFT
 ====== This is a modified nano-gui driver ======
 
+# 2026-1018 PP: shadow: damage found by comparing with the last frame sent
+# 2026-1018 PP: do_refresh() holds the bus lock when spi is a sharedbus client
+#               show() during do_refresh() is sent when the transfer ends
+# 2026-1018 PP: show() sends only the dirty window, see register_updates()
 # 2024-0330 PP: modified order of parameters in rgb() - fixed R and B switching
 # 2024-0220 PP added poweroff() and poweron().
 # Supports 1.8" TFT-display from WeAct Studio. However: colors R and B are reversed
@@ -28,7 +32,9 @@ from time import sleep_ms
 import framebuf
 import gc
 import micropython
+import uasyncio as asyncio
 from drivers.boolpalette import BoolPalette
+from drivers.shadow import Shadow, SHADOW_NONE
 
 # Datasheet para 8.4 scl write cycle 66ns == 15MHz
 
@@ -63,7 +69,8 @@ class ST7735R(framebuf.FrameBuffer):
         return (r & 0xe0) | ((g >> 3) & 0x1c) | (b >> 6)
 
     # rst and cs are active low, SPI is mode 0
-    def __init__(self, spi, cs, dc, rst, bl=None, height=128, width=128, rotation=0, init_spi=False):
+    def __init__(self, spi, cs, dc, rst, bl=None, height=128, width=128, rotation=0, init_spi=False,
+                 shadow=SHADOW_NONE):
         self._spi = spi
         self._rst = rst  # Pins
         self._dc = dc
@@ -79,6 +86,19 @@ class ST7735R(framebuf.FrameBuffer):
         self._mvb = memoryview(buf)
         super().__init__(buf, self.width, self.height, mode)
         self._linebuf = bytearray(self.width * 2)  # 16 bit color out
+        self._mvlb = memoryview(self._linebuf)
+        self.bytes_sent = 0  # Bytes written to the panel by the last show()
+        self._clear_updates()
+        self.register_updates(0, self.height - 1)  # First show() is a full frame
+        # shadow: SHADOW_CRC or SHADOW_FULL (see drivers/shadow.py) replaces
+        # damage reported by drawing methods with a comparison of frames.
+        self._shadow = Shadow(shadow, self._mvb, self.height, len(buf) // self.height,
+                              1, 1) if shadow else None
+        # Held by do_refresh() for its whole transfer. A sharedbus client
+        # provides the bus lock, so other clients wait for the transfer.
+        self._lock = getattr(spi, 'lock', None) or asyncio.Lock()
+        self._refreshing = False  # do_refresh() is sending a window
+        self._pending = False  # show() was called meanwhile: send again
         quad, mod = divmod(rotation, 90)  # Get quadrant
         if mod or quad > 3:
             quad %= 4
@@ -145,6 +165,8 @@ class ST7735R(framebuf.FrameBuffer):
                         (b'\x40', 2, 1),
                         (b'\xe0', 3, 2),
                         (b'\x80', 2, 3))[quad]
+        self._co = co  # Needed by show() to address a window
+        self._ro = ro
         wcd(b'\x36', rval)  # MADCTL: rotation mode for 1.44" display
         wcd(b'\x3a', b'\x05')  # COLMOD 16 bit
         wcd(b'\xe0', b'\x02\x1c\x07\x12\x37\x32\x29\x2d\x29\x25\x2B\x39\x00\x01\x03\x10')  # GMCTRP1 Gamma
@@ -195,27 +217,192 @@ class ST7735R(framebuf.FrameBuffer):
     
 # =========== PP: endof add poweroff and poweron ==============
 
-    def show(self):  # Blocks 38.6ms on Pyboard D at stock frequency
-        # PP: when TFT-display sleeps and is off
-        #     no need to update screen
-        if self._is_awake is False:
+
+# =========== Dirty window: only changed pixels are sent by show() ==========
+# Each drawing method records the bounding box of what it touched. show()
+# sets CASET/RASET to the union of those boxes and sends only those lines.
+
+    def _clear_updates(self):  # Empty window: ._y1 < ._y0
+        self._y0 = self.height
+        self._y1 = -1
+        self._x0 = self.width
+        self._x1 = -1
+
+    # Add a rectangle (inclusive coordinates, any order) to the dirty window.
+    # x0 None means full width. Off-screen parts are ignored.
+    def register_updates(self, y0, y1=None, x0=None, x1=None):
+        if y1 is None:
+            y1 = y0
+        elif y0 > y1:
+            y0, y1 = y1, y0
+        if x0 is None:
+            x0 = 0
+            x1 = self.width - 1
+        elif x1 is None:
+            x1 = x0
+        elif x0 > x1:
+            x0, x1 = x1, x0
+        if y1 < 0 or x1 < 0 or y0 >= self.height or x0 >= self.width:
             return
-        
-        # PP: test lut from st7789_4bit
-        #clut = ST7735R.lut
+        if y0 < self._y0:
+            self._y0 = max(y0, 0)
+        if y1 > self._y1:
+            self._y1 = min(y1, self.height - 1)
+        if x0 < self._x0:
+            self._x0 = max(x0, 0)
+        if x1 > self._x1:
+            self._x1 = min(x1, self.width - 1)
 
-        wd = self.width
+    def pixel(self, x, y, c=None):
+        if c is None:
+            return super().pixel(x, y)
+        super().pixel(x, y, c)
+        self.register_updates(y, y, x, x)
+
+    def text(self, s, x, y, c=1):
+        super().text(s, x, y, c)
+        self.register_updates(y, y + 7, x, x + 8 * len(s) - 1)
+
+    def line(self, x0, y0, x1, y1, c):
+        super().line(x0, y0, x1, y1, c)
+        self.register_updates(y0, y1, x0, x1)
+
+    def hline(self, x, y, w, c):
+        super().hline(x, y, w, c)
+        self.register_updates(y, y, x, x + w - 1)
+
+    def vline(self, x, y, h, c):
+        super().vline(x, y, h, c)
+        self.register_updates(y, y + h - 1, x, x)
+
+    def fill(self, c):
+        super().fill(c)
+        self.register_updates(0, self.height - 1)
+
+    def fill_rect(self, x, y, w, h, c):
+        super().fill_rect(x, y, w, h, c)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def rect(self, x, y, w, h, c, f=False):
+        super().rect(x, y, w, h, c, f)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def ellipse(self, x, y, xr, yr, c, *args):
+        super().ellipse(x, y, xr, yr, c, *args)
+        self.register_updates(y - yr, y + yr, x - xr, x + xr)
+
+    def poly(self, x, y, coords, c, *args):
+        super().poly(x, y, coords, c, *args)
+        n = len(coords)
+        if n > 1:
+            xmin = xmax = coords[0]
+            ymin = ymax = coords[1]
+            for i in range(2, n - 1, 2):
+                xmin = min(xmin, coords[i])
+                xmax = max(xmax, coords[i])
+                ymin = min(ymin, coords[i + 1])
+                ymax = max(ymax, coords[i + 1])
+            self.register_updates(y + ymin, y + ymax, x + xmin, x + xmax)
+
+    # A plain FrameBuffer does not know its size: assume it extends to the
+    # edge of the screen unless the source has width and height attributes.
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        super().blit(fbuf, x, y, key, palette)
+        w = getattr(fbuf, 'width', self.width)
+        h = getattr(fbuf, 'height', self.height)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def scroll(self, xstep, ystep):
+        super().scroll(xstep, ystep)
+        self.register_updates(0, self.height - 1)
+
+    # Set the panel window to the dirty window and start RAMWR, leaving CS
+    # asserted. Return the framebuf index of the first (lowest) line, the
+    # number of lines and the line buffer. None if nothing has changed.
+    def _begin(self, full_update):
+        if self._shadow:
+            self._clear_updates()
+            self._shadow.diff(self.register_updates)
+        if full_update:
+            self.register_updates(0, self.height - 1)
+        self.bytes_sent = 0
+        y0 = self._y0
+        y1 = self._y1
+        if y1 < y0:  # Nothing has changed
+            return None
+        x0 = self._x0
+        x1 = self._x1
+        self._clear_updates()
         ht = self.height
-        lb = self._linebuf
-        buf = self._mvb
-        self._dc(0)
-        self._cs(0)
+        co = self._co
+        ro = self._ro
+        lb = self._mvlb[: (x1 - x0 + 1) * 2]
         if self._spi_init:  # A callback was passed
             self._spi_init(self._spi)  # Bus may be shared
+        # Lines are sent bottom up: framebuf row y is panel row ht - 1 - y
+        self._wcd(b'\x2a', int.to_bytes(((co + x0) << 16) + co + x1, 4, 'big'))  # CASET
+        self._wcd(b'\x2b', int.to_bytes(((ro + ht - 1 - y1) << 16) + ro + ht - 1 - y0, 4, 'big'))  # RASET
+        self._dc(0)
+        self._cs(0)
         self._spi.write(b'\x2c')  # RAMWR
         self._dc(1)
-        for start in range(wd * (ht - 1), -1, - wd):  # For each line
-            _lcopy(lb, buf[start :], wd)  # Copy and map colors (68us)
-            #PP test lut: _lcopy(lb, buf[start:], clut, wd)  # Copy and map colors
+        nlines = y1 - y0 + 1
+        self.bytes_sent = 11 + len(lb) * nlines  # CASET, RASET, RAMWR + data
+        return self.width * y1 + x0, nlines, lb
+
+    # Full frame blocks 38.6ms on Pyboard D at stock frequency. A window costs
+    # in proportion to its area. full_update=True ignores the dirty window.
+    def show(self, full_update=False):
+        # PP: when TFT-display sleeps and is off
+        #     no need to update screen
+        if self._is_awake is False:
+            return  # Dirty window is retained until the display wakes
+        if self._refreshing:  # Would break into the window being sent
+            if full_update:
+                self.register_updates(0, self.height - 1)
+            self._pending = True  # do_refresh() sends the changes when done
+            return
+        w = self._begin(full_update)
+        if w is None:
+            return
+        start, nlines, lb = w
+        wd = self.width
+        nx = len(lb) // 2  # Pixels per line
+        buf = self._mvb
+        for start in range(start, start - nlines * wd, - wd):  # For each line
+            _lcopy(lb, buf[start :], nx)  # Copy and map colors (68us per full line)
             self._spi.write(lb)
         self._cs(1)
+
+    # As show() but yields to the scheduler after every height // split lines,
+    # so other tasks run during the transfer. split=8 gives segments of about
+    # 5ms for a full 160x128 frame; a small dirty window goes in one segment.
+    async def do_refresh(self, split=8):
+        async with self._lock:
+            self._refreshing = True
+            try:
+                while self._is_awake is not False:
+                    self._pending = False
+                    w = self._begin(False)
+                    if w is None:
+                        return
+                    start, nlines, lb = w
+                    lines = max(self.height // split, 1)  # Lines per segment
+                    wd = self.width
+                    nx = len(lb) // 2  # Pixels per line
+                    buf = self._mvb
+                    while nlines > 0:  # For each segment
+                        if self._spi_init:  # A callback was passed
+                            self._spi_init(self._spi)  # Bus may be shared
+                        self._cs(0)
+                        for _ in range(min(lines, nlines)):  # For each line
+                            _lcopy(lb, buf[start :], nx)  # Copy and map colors (68us per full line)
+                            self._spi.write(lb)
+                            start -= wd
+                        nlines -= lines
+                        self._cs(1)  # Allow other tasks to use bus
+                        await asyncio.sleep_ms(0)
+                    if not self._pending:
+                        return
+            finally:
+                self._refreshing = False
@@ -0,0 +1,252 @@
+# virtual.py Headless virtual displays for nano-gui on a Linux build box.
+
+# Released under the MIT License (MIT). See LICENSE.
+
+# A virtual display is the real driver (ST7735R, ILI9341 or SH1107) talking to
+# a virtual bus, so gui/core, gui/widgets and application code use it
+# unchanged and the accounting follows the driver's own update windows:
+#   from drivers.virtual.virtual import st7735r
+#   ssd = st7735r(snapshots='/tmp/frames')  # optional PPM file per frame
+#   ...
+#   ssd.virtual.report()
+# Every show() and every do_refresh() is a frame. A frame records the host time
+# spent in the driver, the bytes, command bytes and bus writes sent and the
+# estimated wire time. Wire time counts bus clocks only: 8 per byte on SPI;
+# 9 per byte plus address, start and stop on I2C. Gaps between writes and
+# chip select handling are not included, so it is a lower bound.
+# The panel is not emulated: snapshots are taken from the framebuffer, with
+# colors decoded through the driver's rgb() and lut.
+
+# 2026-1018 PP new
+
+from time import ticks_us, ticks_diff
+
+
+class Pin:  # Output pin which remembers its level
+
+    OUT = 1
+
+    def __init__(self, value=0):
+        self._v = value
+
+    def init(self, mode=None, value=None):
+        if value is not None:
+            self._v = value
+
+    def __call__(self, v=None):
+        if v is None:
+            return self._v
+        self._v = v
+
+    def value(self, v=None):
+        return self(v)
+
+
+class _Bus:
+
+    def __init__(self, freq):
+        self.freq = freq
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.writes = 0
+        self.nbytes = 0
+        self.cmd_bytes = 0
+        self.clocks = 0
+
+    def wire_us(self, clocks=None):
+        return (self.clocks if clocks is None else clocks) * 1_000_000 // self.freq
+
+
+class SPI(_Bus):
+
+    def __init__(self, baudrate=12_000_000):
+        super().__init__(baudrate)
+        self.dc = Pin()  # Pass to the driver: bytes sent while low are commands
+
+    def init(self, baudrate=None, **kwargs):
+        if baudrate is not None:
+            self.freq = baudrate
+
+    def write(self, buf):
+        n = len(buf)
+        self.writes += 1
+        self.nbytes += n
+        self.clocks += 8 * n
+        if not self.dc():
+            self.cmd_bytes += n
+
+
+# Command bytes in an SSD1306/SH1107 I2C message. A control byte with Co set
+# (0x80) is followed by one byte, otherwise by the rest of the message. D/C#
+# (0x40) set marks display data.
+def _cmd_bytes(vector):
+    n = 0
+    single = -1  # Control byte announcing a single byte
+    for k, b in enumerate(vector):
+        for i in range(len(b)):
+            c = b[i]
+            if single >= 0:
+                if not single & 0x40:
+                    n += 1
+                single = -1
+            elif c & 0x80:
+                single = c
+            elif c & 0x40:
+                return n
+            else:
+                return n + len(b) - i - 1 + sum(len(x) for x in vector[k + 1:])
+    return n
+
+
+class I2C(_Bus):
+
+    def __init__(self, freq=400_000, addresses=(0x3c,)):
+        super().__init__(freq)
+        self._addresses = addresses
+
+    def scan(self):
+        return list(self._addresses)
+
+    def writeto(self, addr, buf, stop=True):
+        self.writevto(addr, (buf,), stop)
+
+    def writevto(self, addr, vector, stop=True):
+        n = sum(len(b) for b in vector)
+        self.writes += 1
+        self.nbytes += n
+        self.clocks += 9 * (n + 1) + 2
+        self.cmd_bytes += _cmd_bytes(vector)
+
+
+# Nearest rank percentile p (0..100) of a sequence of numbers.
+def percentile(values, p):
+    if not values:
+        return 0
+    s = sorted(values)
+    return s[min(max((len(s) * p + 99) // 100 - 1, 0), len(s) - 1)]
+
+
+class Recorder:
+
+    # Replaces show() and do_refresh() of the display ssd with versions which
+    # record a frame each. bus is the virtual bus of the display.
+    def __init__(self, ssd, bus, name, snapshots=None):
+        self.ssd = ssd
+        self.bus = bus
+        self.name = name
+        self.snapshots = snapshots  # Directory for a PPM file per frame
+        self._show = ssd.show
+        ssd.show = self.show
+        if hasattr(ssd, 'do_refresh'):
+            self._do_refresh = ssd.do_refresh
+            ssd.do_refresh = self.do_refresh
+        self._channels = None
+        self.reset()
+
+    # (host us, bytes, command bytes, writes, wire us) per frame
+    def reset(self):
+        self.frames = []
+        self.bus.reset_stats()
+
+    def show(self, *args):
+        b = self.bus
+        mark = (b.nbytes, b.cmd_bytes, b.writes, b.clocks)
+        t = ticks_us()
+        self._show(*args)
+        self._frame(ticks_diff(ticks_us(), t), mark)
+
+    # Host time includes other tasks running while the transfer yields.
+    async def do_refresh(self, *args):
+        b = self.bus
+        mark = (b.nbytes, b.cmd_bytes, b.writes, b.clocks)
+        t = ticks_us()
+        await self._do_refresh(*args)
+        self._frame(ticks_diff(ticks_us(), t), mark)
+
+    def _frame(self, dt, mark):
+        b = self.bus
+        self.frames.append((dt, b.nbytes - mark[0], b.cmd_bytes - mark[1],
+                            b.writes - mark[2], b.wire_us(b.clocks - mark[3])))
+        if self.snapshots is not None:
+            self.snapshot('{}/{}_{:05d}.ppm'.format(self.snapshots, self.name, len(self.frames)))
+
+    # Per channel: (bits of the channel, {bits: level}, level at full scale),
+    # found by probing the driver's rgb().
+    def _decoder(self):
+        rgb = self.ssd.rgb
+        channels = []
+        for ch in range(3):
+            levels = {}
+            for x in range(256):
+                v = rgb(*(x if i == ch else 0 for i in range(3)))
+                if v not in levels:
+                    levels[v] = x
+            mask = rgb(*(255 if i == ch else 0 for i in range(3)))
+            channels.append((mask, levels, levels[mask]))
+        return channels
+
+    def _color(self, c):
+        lut = getattr(self.ssd, 'lut', None)
+        if lut is not None:  # 4 bit drivers: c is a lut index
+            c = lut[2 * c] | lut[2 * c + 1] << 8
+        out = bytearray(3)
+        for i, (mask, levels, top) in enumerate(self._channels):
+            out[i] = levels.get(c & mask, 0) * 255 // top
+        return out
+
+    # Write the framebuffer as a binary PPM image.
+    def snapshot(self, path):
+        if self._channels is None:
+            self._channels = self._decoder()
+        ssd = self.ssd
+        w = ssd.width
+        colors = {}
+        line = bytearray(3 * w)
+        with open(path, 'wb') as f:
+            f.write('P6\n{} {}\n255\n'.format(w, ssd.height).encode())
+            for y in range(ssd.height):
+                for x in range(w):
+                    c = ssd.pixel(x, y)
+                    if c not in colors:
+                        colors[c] = self._color(c)
+                    line[3 * x: 3 * x + 3] = colors[c]
+                f.write(line)
+
+    def report(self):
+        f = self.frames
+        print('{} frames on virtual {}'.format(len(f), self.name))
+        if not f:
+            return
+        print('              p50       p90       p99       max     total')
+        for title, i, scale in (('host ms', 0, 1000), ('wire ms', 4, 1000),
+                                ('bytes', 1, 1), ('cmd bytes', 2, 1), ('writes', 3, 1)):
+            v = [r[i] for r in f]
+            print('{:<9}'.format(title) + ''.join('{:10.1f}'.format(x / scale) for x in
+                  (percentile(v, 50), percentile(v, 90), percentile(v, 99), max(v), sum(v))))
+
+
+def _attach(ssd, bus, name, snapshots):
+    ssd.virtual = Recorder(ssd, bus, name, snapshots)  # Set-up traffic is not counted
+    return ssd
+
+# driver: the driver class, default ST7735R from st7735r144 (8 bit color).
+# Other kwargs are passed to the driver.
+def st7735r(width=160, height=128, baudrate=12_000_000, driver=None, snapshots=None, **kwargs):
+    if driver is None:
+        from drivers.st7735r.st7735r144 import ST7735R as driver
+    spi = SPI(baudrate)
+    ssd = driver(spi, Pin(1), spi.dc, Pin(1), bl=Pin(1), height=height, width=width, **kwargs)
+    return _attach(ssd, spi, 'st7735r', snapshots)
+
+def ili9341(width=320, height=240, baudrate=12_000_000, snapshots=None, **kwargs):
+    from drivers.ili93xx.ili9341 import ILI9341
+    spi = SPI(baudrate)
+    ssd = ILI9341(spi, Pin(1), spi.dc, Pin(1), Pin(1), height=height, width=width, **kwargs)
+    return _attach(ssd, spi, 'ili9341', snapshots)
+
+def sh1107(width=128, height=64, freq=400_000, address=0x3c, snapshots=None, **kwargs):
+    from sh1107 import SH1107_I2C
+    i2c = I2C(freq, (address,))
+    ssd = SH1107_I2C(width, height, i2c, address=address, **kwargs)
+    return _attach(ssd, i2c, 'sh1107', snapshots)
@@ -13,12 +13,23 @@ Port of Adafruit GFX Arduino library to MicroPython
 Based on: https://github.com/adafruit/Adafruit-GFX-Library
 Author: Tony DiCola (original GFX author Phil Burgess)
 License: MIT License (https://opensource.org/licenses/MIT)
+
+2026-1018 PP: large_text() blits each character from a cache of scaled and
+              rotated glyphs (least recently used are dropped, see GLYPH_CACHE)
+2026-1018 PP: circle() draws horizontal spans, at most two per scanline (one
+              for a fill), computed by viper code. They go to the
+              framebuf.FrameBuffer hline(), so a subclass tracking damage
+              registers a circle once, in its own circle(). triangle() is
+              as in v209: span code in native gained nothing over it
 """
 
 __version__ = "v209"
 __repo__ = "https://github.com/peter-l5/framebuf2"
 
 import framebuf
+import micropython
+from array import array
+from collections import OrderedDict
 
 # constants available in MicroPython 1.19.1
 MONO_VLSB = framebuf.MONO_VLSB
@@ -29,6 +40,95 @@ GS2_HMSB = framebuf.GS2_HMSB
 GS4_HMSB = framebuf.GS4_HMSB
 GS8 = framebuf.GS8
 
+# large_text() glyphs kept, by (character, size multiple, rotation). A glyph
+# takes 8 * m * m bytes: 128 bytes at m=4. 0 disables the cache.
+GLYPH_CACHE = 24
+_glyphs = OrderedDict()
+# palette for blitting glyphs: index 1 is the text colour, index 0 any other
+# colour, keyed out
+_palette = framebuf.FrameBuffer(bytearray(4), 2, 1, RGB565)
+
+
+class _Glyph(framebuf.FrameBuffer):  # knows its size, for drivers tracking damage
+    def __init__(self, buf, width, height, mode):
+        super().__init__(buf, width, height, mode)
+        self.width = width
+        self.height = height
+
+
+# glyph of character ch from the built-in 8x8 font, scaled by m and turned
+# t quarters clockwise
+def _glyph(ch, m, t):
+    key = (ch, m, t)
+    g = _glyphs.pop(key, None)
+    if g is None:
+        letter = framebuf.FrameBuffer(bytearray(8), 8, 8, MONO_HMSB)
+        letter.text(ch, 0, 0, 1)
+        a, b, c, d = 1, 0, 0, 1
+        for i in range(0, t):
+            a, b, c, d = c, d, -a, -b
+        x0 = 0 if a + c > 0 else 7
+        y0 = 0 if b + d > 0 else 7
+        w = 8 * m
+        g = _Glyph(bytearray(w * w // 8), w, w, MONO_HLSB)
+        for i in range(0, 8):
+            for j in range(0, 8):
+                if letter.pixel(i, j):
+                    g.fill_rect((x0 + a * i + c * j) * m, (y0 + b * i + d * j) * m, m, m, 1)
+        if GLYPH_CACHE <= 0:
+            return g
+        while len(_glyphs) >= GLYPH_CACHE:
+            _glyphs.pop(next(iter(_glyphs)))  # least recently used
+    _glyphs[key] = g  # most recently used last
+    return g
+
+
+# Midpoint circle of radius r, by row offset k = 0..r from the centre:
+# outline pixels are at column offsets lo[k]..hi[k] either side.
+# For a fill, hi[k] is the half width of the row and lo is not used.
+@micropython.viper
+def _spans(r: int, lo: ptr16, hi: ptr16, fill: int):
+    for k in range(r + 1):
+        lo[k] = 0xffff
+        hi[k] = 0
+    lo[r] = 0
+    if not fill:
+        lo[0] = r
+        hi[0] = r
+    g = 1 - r
+    ddg_x = 1
+    ddg_y = -2 * r
+    x = 0
+    y = r
+    while x < y:
+        if g >= 0:
+            y -= 1
+            ddg_y += 2
+            g += ddg_y
+        x += 1
+        ddg_x += 2
+        g += ddg_x
+        if x < lo[y]:
+            lo[y] = x
+        if x > hi[y]:
+            hi[y] = x
+        if y < lo[x]:
+            lo[x] = y
+        if y > hi[x]:
+            hi[x] = y
+    if fill:
+        m = 0
+        k = r
+        while k >= 0:  # a row is as wide as the widest row outside it
+            if hi[k] > m:
+                m = hi[k]
+            hi[k] = m
+            k -= 1
+
+# _spans() scratch, grown for larger radii
+_lo = array('H', bytes(2 * 64))
+_hi = array('H', bytes(2 * 64))
+
 
 class FrameBuffer(framebuf.FrameBuffer):
     def _reverse(self, s: string) -> string:
@@ -47,35 +147,21 @@ class FrameBuffer(framebuf.FrameBuffer):
         optional parameter, r is rotation of the text: 0, 90, 180, or 270 degrees
         optional parameter, t is rotation of each character within the text: 0, 90, 180, or 270 degrees
         """
-        colour = c
-        smallbuffer = bytearray(8)
-        letter = framebuf.FrameBuffer(smallbuffer, 8, 8, framebuf.MONO_HMSB)
+        k = c ^ 1  # background key, never the text colour
+        _palette.pixel(0, 0, k)
+        _palette.pixel(1, 0, c)
         r = r % 360 // 90
         dx = 8 * m if r in (0, 2) else 0
         dy = 8 * m if r in (1, 3) else 0
         if r in (2, 3):
             s = self._reverse(s)
         t = r if t is None else t % 360 // 90
-        a, b, c, d = 1, 0, 0, 1
-        for i in range(0, t):
-            a, b, c, d = c, d, -a, -b
-        x0 = 0 if a + c > 0 else 7
-        y0 = 0 if b + d > 0 else 7
         for character in s:
-            letter.fill(0)
-            letter.text(character, 0, 0, 1)
-            for i in range(0, 8):
-                for j in range(0, 8):
-                    if letter.pixel(i, j) == 1:
-                        p = x0 + a * i + c * j
-                        q = y0 + b * i + d * j
-                        if m == 1:
-                            self.pixel(x + p, y + q, colour)
-                        else:
-                            self.fill_rect(x + p * m, y + q * m, m, m, colour)
+            self.blit(_glyph(character, m, t), x, y, k, _palette)
             x += dx
             y += dy
 
+    @micropython.native
     def circle(self, x0, y0, radius, c, f: bool = None):
         """
         Circle drawing function.  Will draw a single pixel wide circle with
@@ -83,51 +169,32 @@ class FrameBuffer(framebuf.FrameBuffer):
         colour c
         fill if f is True
         """
-        if f is None or f != True:
-            g = 1 - radius
-            ddG_x = 1
-            ddG_y = -2 * radius
-            x = 0
-            y = radius
-            self.pixel(x0, y0 + radius, c)
-            self.pixel(x0, y0 - radius, c)
-            self.pixel(x0 + radius, y0, c)
-            self.pixel(x0 - radius, y0, c)
-            while x < y:
-                if g >= 0:
-                    y -= 1
-                    ddG_y += 2
-                    g += ddG_y
-                x += 1
-                ddG_x += 2
-                g += ddG_x
-                self.pixel(x0 + x, y0 + y, c)
-                self.pixel(x0 - x, y0 + y, c)
-                self.pixel(x0 + x, y0 - y, c)
-                self.pixel(x0 - x, y0 - y, c)
-                self.pixel(x0 + y, y0 + x, c)
-                self.pixel(x0 - y, y0 + x, c)
-                self.pixel(x0 + y, y0 - x, c)
-                self.pixel(x0 - y, y0 - x, c)
-        else:
-            self.vline(x0, y0 - radius, 2 * radius + 1, c)
-            g = 1 - radius
-            ddG_x = 1
-            ddG_y = -2 * radius
-            x = 0
-            y = radius
-            while x < y:
-                if g >= 0:
-                    y -= 1
-                    ddG_y += 2
-                    g += ddG_y
-                x += 1
-                ddG_x += 2
-                g += ddG_x
-                self.vline(x0 + x, y0 - y, 2 * y + 1, c)
-                self.vline(x0 + y, y0 - x, 2 * x + 1, c)
-                self.vline(x0 - x, y0 - y, 2 * y + 1, c)
-                self.vline(x0 - y, y0 - x, 2 * x + 1, c)
+        if radius < 0:
+            return
+        fill = f is not None and f == True
+        global _lo, _hi
+        if len(_hi) <= radius:
+            _lo = array('H', bytes(2 * radius + 2))
+            _hi = array('H', bytes(2 * radius + 2))
+        lo = _lo
+        hi = _hi
+        _spans(radius, lo, hi, fill)
+        hline = super().hline
+        for k in range(radius + 1):
+            b = hi[k]
+            a = 0 if fill else lo[k]
+            if a == 0:  # one span across
+                w = 2 * b + 1
+                hline(x0 - b, y0 - k, w, c)
+                if k:
+                    hline(x0 - b, y0 + k, w, c)
+            else:  # left and right arc
+                w = b - a + 1
+                hline(x0 - b, y0 - k, w, c)
+                hline(x0 + a, y0 - k, w, c)
+                if k:
+                    hline(x0 - b, y0 + k, w, c)
+                    hline(x0 + a, y0 + k, w, c)
 
     def triangle(self, x0, y0, x1, y1, x2, y2, c, f: bool = None):
         """
@@ -0,0 +1,145 @@
+# fontfile.py Fonts read from a file on demand, for nano-gui Writer and CWriter.
+
+# Released under the MIT License (MIT). See LICENSE.
+
+# A font module holds its whole bitmap, which is compiled and loaded when the
+# module is imported. A FontFile keeps only the glyph index in RAM and reads
+# glyphs from the file when they are printed, keeping the most recently used.
+# It has the interface of a font module, so it is passed to a Writer as is:
+#   from gui.core.fontfile import FontFile
+#   arial35 = FontFile('/mmc/fonts/arial35.bin')
+#   wri = CWriter(ssd, arial35, GREEN, BLACK)
+# Make the file from a font module, on the board or on a PC (with
+# lib on the path):
+#   micropython lib/gui/core/fontfile.py gui.fonts.arial35 arial35.bin
+#   >>> from gui.core.fontfile import convert
+#   >>> convert('gui.fonts.arial35', '/mmc/fonts/arial35.bin')
+
+# File format, little endian:
+#   header  4s magic b'NGF1', B flags (1 hmap, 2 reverse, 4 monospaced),
+#           B 0, H height, H max_width, H min_ch, H max_ch, H nslots
+#   widths  H per slot
+#   offsets I per slot: file position of the glyph bitmap
+#   glyphs  rows of (width + 7) // 8 bytes, height rows per glyph
+# Only horizontally mapped fonts are converted (as Writer requires): glyph
+# sizes follow from width and height, and are not in the file.
+# Slot 0 is the glyph printed for chars outside min_ch..max_ch, slot n is
+# char min_ch + n - 1.
+
+# 2026-1018 PP new
+
+from array import array
+from collections import OrderedDict
+import struct
+
+_MAGIC = b'NGF1'
+_HEADER = '<4sBBHHHHH'
+_HMAP = 1
+_REVERSE = 2
+_MONOSPACED = 4
+
+
+class FontFile:
+
+    # cache: no. of glyphs kept in RAM
+    def __init__(self, path, cache=16):
+        self._f = f = open(path, 'rb')
+        magic, flags, _, ht, mw, lo, hi, n = struct.unpack(_HEADER, f.read(struct.calcsize(_HEADER)))
+        if magic != _MAGIC:
+            f.close()
+            raise ValueError('Not a font file: ' + path)
+        self._flags = flags
+        self._height = ht
+        self._max_width = mw
+        self._min_ch = lo
+        self._max_ch = hi
+        self._widths = array('H', struct.unpack('<{}H'.format(n), f.read(2 * n)))
+        self._offs = array('I', struct.unpack('<{}I'.format(n), f.read(4 * n)))
+        self.cache = cache
+        self._glyphs = OrderedDict()  # Least recently used first
+
+    def close(self):
+        self._f.close()
+
+    def height(self):
+        return self._height
+
+    def max_width(self):
+        return self._max_width
+
+    def hmap(self):
+        return bool(self._flags & _HMAP)
+
+    def reverse(self):
+        return bool(self._flags & _REVERSE)
+
+    def monospaced(self):
+        return bool(self._flags & _MONOSPACED)
+
+    def min_ch(self):
+        return self._min_ch
+
+    def max_ch(self):
+        return self._max_ch
+
+    def _slot(self, ch):
+        oc = ord(ch)
+        return oc - self._min_ch + 1 if oc >= self._min_ch and oc <= self._max_ch else 0
+
+    def get_width(self, ch):
+        return self._widths[self._slot(ch)]
+
+    def get_ch(self, ch):
+        n = self._slot(ch)
+        width = self._widths[n]
+        glyph = self._glyphs.pop(n, None)
+        if glyph is None:
+            glyph = bytearray(((width - 1) // 8 + 1) * self._height)
+            self._f.seek(self._offs[n])
+            self._f.readinto(glyph)
+            if self.cache <= 0:
+                return memoryview(glyph), self._height, width
+            while len(self._glyphs) >= self.cache:
+                self._glyphs.pop(next(iter(self._glyphs)))
+        self._glyphs[n] = glyph  # Most recently used last
+        return memoryview(glyph), self._height, width
+
+
+# Write font module (a module or its name) to a font file at path.
+def convert(module, path):
+    if isinstance(module, str):
+        module = __import__(module, None, None, ('get_ch',))
+    lo = module.min_ch() if hasattr(module, 'min_ch') else 32
+    hi = module.max_ch() if hasattr(module, 'max_ch') else 126
+    chars = [chr(0)] + [chr(c) for c in range(lo, hi + 1)]  # chr(0): the default glyph
+    n = len(chars)
+    if not module.hmap():
+        raise ValueError('Font must be horizontally mapped.')
+    flags = _HMAP | (_REVERSE if module.reverse() else 0)
+    flags |= _MONOSPACED if module.monospaced() else 0
+    header = struct.pack(_HEADER, _MAGIC, flags, 0, module.height(), module.max_width(), lo, hi, n)
+    pos = len(header) + 6 * n
+    widths = []
+    offs = []
+    glyphs = []
+    for ch in chars:
+        glyph, _, width = module.get_ch(ch)
+        widths.append(width)
+        offs.append(pos)
+        glyphs.append(glyph)
+        pos += len(glyph)
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(struct.pack('<{}H'.format(n), *widths))
+        f.write(struct.pack('<{}I'.format(n), *offs))
+        for glyph in glyphs:
+            f.write(glyph)
+    return pos
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) != 3:
+        print('Usage: fontfile.py font_module font_file')
+    else:
+        print('{} bytes written'.format(convert(sys.argv[1], sys.argv[2])))
@@ -23,8 +23,15 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-from gui.core.nanogui import DObject, circle
+# 2026-1018 PP: TSequence(scroll=True) makes a strip chart: add() moves the
+# traces left by one step with a blit, redraws the grid in the columns exposed
+# on the right and draws the newest segment. See TSequence.
+# 2026-1018 PP: Curve.points(xs, ys) plots arrays of samples in one native
+# pass, as point() would one by one.
+
+from gui.core.nanogui import DObject, circle, _awake, _frame_view, _ppb
 from cmath import rect, pi
+import micropython
 from micropython import const
 from array import array
 
@@ -40,6 +47,104 @@ _XMAX = const(1)
 _XMIN = const(-1)
 _YMAX = const(1)
 _YMIN = const(-1)
+_BREAK = const(-32768)  # Ends a run of pixels in a polyline
+_CHUNK = const(64)  # Samples per pass of Curve.points()
+
+
+# Scale samples i0..i1 - 1 of xs and ys as Curve._scale() does, clip the
+# segments joining them (the first from scaled point lx, ly unless lx is None)
+# to the +-1 box as Curve._clip() does and map their ends to pixels as the
+# graph's line() does. Put the result in array('h') out as runs of x, y pairs,
+# each run ended by _BREAK. Repeated pixels are dropped and segments which
+# carry on in the same horizontal, vertical or diagonal direction merged, so
+# the runs cover the pixels which point() would draw.
+# m: x and y origins and excursions, pixel origins and axis lengths.
+# Return the length of out used and the last point, scaled.
+@micropython.native
+def _polyline(xs, ys, i0, i1, lx, ly, m, out):
+    ox, oy, ex, ey, xpo, ypo, xlen, ylen = m
+    n = 0
+    pen = False  # A run is open
+    px = 0  # Its last pixel
+    py = 0
+    ux = 0  # Unit step of its last segment if it may be merged, else 0, 0
+    uy = 0
+    for i in range(i0, i1):
+        x1 = (xs[i] - ox) / ex
+        y1 = (ys[i] - oy) / ey
+        x0 = lx
+        y0 = ly
+        lx = x1
+        ly = y1
+        if x0 is None:
+            continue
+        oc0 = (_TOP if y0 > 1 else 0) | (_BOTTOM if y0 < -1 else 0) | (_RIGHT if x0 > 1 else 0) | (_LEFT if x0 < -1 else 0)
+        oc1 = (_TOP if y1 > 1 else 0) | (_BOTTOM if y1 < -1 else 0) | (_RIGHT if x1 > 1 else 0) | (_LEFT if x1 < -1 else 0)
+        while oc0 | oc1 and not oc0 & oc1:  # Cohen–Sutherland
+            oc = oc0 if oc0 else oc1
+            if oc & _TOP:
+                x = x0 + (_YMAX - y0)*(x1 - x0)/(y1 - y0)
+                y = _YMAX
+            elif oc & _BOTTOM:
+                x = x0 + (_YMIN - y0)*(x1 - x0)/(y1 - y0)
+                y = _YMIN
+            elif oc & _RIGHT:
+                y = y0 + (_XMAX - x0)*(y1 - y0)/(x1 - x0)
+                x = _XMAX
+            else:
+                y = y0 + (_XMIN - x0)*(y1 - y0)/(x1 - x0)
+                x = _XMIN
+            if oc0:
+                x0 = x
+                y0 = y
+                oc0 = (_TOP if y0 > 1 else 0) | (_BOTTOM if y0 < -1 else 0) | (_RIGHT if x0 > 1 else 0) | (_LEFT if x0 < -1 else 0)
+            else:
+                x1 = x
+                y1 = y
+                oc1 = (_TOP if y1 > 1 else 0) | (_BOTTOM if y1 < -1 else 0) | (_RIGHT if x1 > 1 else 0) | (_LEFT if x1 < -1 else 0)
+        if oc0 | oc1:  # Outside the box
+            if pen:
+                out[n] = _BREAK
+                n += 1
+                pen = False
+            continue
+        xs0 = round(xpo + x0 * xlen)
+        ys0 = round(ypo - y0 * ylen)
+        xs1 = round(xpo + x1 * xlen)
+        ys1 = round(ypo - y1 * ylen)
+        if not pen or xs0 != px or ys0 != py:  # Start a run
+            if pen:
+                out[n] = _BREAK
+                n += 1
+            out[n] = xs0
+            out[n + 1] = ys0
+            n += 2
+            pen = True
+            px = xs0
+            py = ys0
+            ux = 0
+            uy = 0
+        dx = xs1 - px
+        dy = ys1 - py
+        if dx or dy:
+            sx = (dx > 0) - (dx < 0)
+            sy = (dy > 0) - (dy < 0)
+            if dx and dy and dx * sx != dy * sy:  # Not a straight pixel line: no merging
+                sx = 0
+                sy = 0
+            if (sx or sy) and sx == ux and sy == uy:  # Extend the last segment
+                n -= 2
+            out[n] = xs1
+            out[n + 1] = ys1
+            n += 2
+            px = xs1
+            py = ys1
+            ux = sx
+            uy = sy
+    if pen:
+        out[n] = _BREAK
+        n += 1
+    return n, lx, ly
 
 
 class Curve():
@@ -86,6 +191,28 @@ class Curve():
             self.graph.line(res[0:2], res[2:], self.color)
         self.lastpoint = self.newpoint  # Scaled but not clipped
 
+    # Plot samples xs[i], ys[i] as point(xs[i], ys[i]) would for each i, in
+    # native passes which allocate nothing per sample. xs and ys are arrays,
+    # preferably array('f'). A PolarCurve takes the real and imaginary parts.
+    def points(self, xs, ys):
+        g = self.graph
+        if isinstance(g, PolarGraph):
+            xlen = ylen = g.radius
+        else:
+            xlen = g.x_axis_len
+            ylen = g.y_axis_len
+        x0, y0 = self.origin
+        xr, yr = self.excursion
+        m = (x0, y0, xr, yr, g.xp_origin, g.yp_origin, xlen, ylen)
+        lx, ly = (None, None) if self.lastpoint is None else self.lastpoint
+        n = min(len(xs), len(ys))
+        out = array('h', bytes(10 * min(n, _CHUNK)))  # Up to 5 per segment
+        for i in range(0, n, _CHUNK):
+            k, lx, ly = _polyline(xs, ys, i, min(i + _CHUNK, n), lx, ly, m, out)
+            g.polyline(out, k, self.color)
+        if lx is not None:
+            self.lastpoint = self.newpoint = (lx, ly)
+
     # Cohen–Sutherland line clipping algorithm
     # If self.newpoint and self.lastpoint are valid clip them so that both lie
     # in +-1 range. If both are outside the box return None.
@@ -152,13 +279,29 @@ class PolarCurve(Curve): # Points are complex
         self.lastpoint = self.newpoint  # Scaled but not clipped
 
 
+# With scroll=True the graph is a strip chart whose traces move left as samples
+# are added: the newest sample is drawn at the right of the area of negative x,
+# up to the graph's right hand grid line, and the area is moved left by
+# x_axis_len / size pixels per sample. Vertical grid lines move with the
+# traces. add() clears the graph and draws all the traces again only if it
+# was cleared, by the caller or the screen, or if the area cannot be moved by
+# a blit: the graph's rows must start on a byte of the frame on MONO_VLSB
+# displays, and on displays with several pixels per byte along a row the move
+# must be a whole number of bytes. If a sample is worth at least a byte the
+# moves are rounded to bytes. Several TSequences may scroll on one graph: each
+# must have the same size and must add one sample per step. Traces older than
+# the graph is wide are drawn as far as they fit only while they scroll.
 class TSequence(Curve):
-    def __init__(self, graph, color, size, yorigin=0, yexc=1):
+    def __init__(self, graph, color, size, yorigin=0, yexc=1, scroll=False):
         super().__init__(graph, color, origin=(0, yorigin), excursion=(1, yexc))
         self.data = array('f', (0 for _ in range(size)))
         self.cur = 0
         self.size = size
         self.count = 0
+        self.scroll = scroll
+        if scroll:
+            graph._strip(self)
+            self._t = graph._ticks  # Step of the last sample added
 
     def add(self, v):
         p = self.cur
@@ -168,6 +311,19 @@ class TSequence(Curve):
         self.cur %= size
         if self.count < size:
             self.count += 1
+        if self.scroll:
+            g = self.graph
+            if self._t == g._ticks:  # First curve of this step: move the traces
+                g._tick()
+            self._t = g._ticks
+            if not _awake(g.device):
+                g._drawn = 0
+            elif g._drawn != DObject.clears.get(g.device):
+                g._replot()
+            elif self.count > 1:  # Newest segment
+                xr = g._xr
+                self._segment(xr - g._step(1), self.data[p - 1], xr, v)
+            return
         x = 0
         dx = 1/size
         for _ in range(self.count):
@@ -177,6 +333,48 @@ class TSequence(Curve):
             p %= size
         self.point()
 
+    # Draw the stored samples on a strip chart which is ready for them.
+    def _plot(self):
+        g = self.graph
+        xr = g._xr
+        xl = g._xl
+        d = (g._ticks - self._t) % g._period  # Steps since the last sample
+        p = self.cur - 1
+        v = self.data[p]
+        x = xr - g._step(d)
+        for a in range(1, self.count):
+            x0 = xr - g._step(d + a)
+            if x0 < xl:  # Scrolled out
+                break
+            v0 = self.data[p - a]
+            self._segment(x0, v0, x, v)
+            x = x0
+            v = v0
+
+    # Draw the segment from value va at column xa to vb at xb, clipped to the
+    # rows of the graph. Clipping is relative to xa so that a segment is drawn
+    # the same wherever it lies.
+    def _segment(self, xa, va, xb, vb):
+        g = self.graph
+        top = g.y0
+        bot = g.y1
+        ya = g.yp_origin - self._scale(0, va)[1] * g.y_axis_len
+        yb = g.yp_origin - self._scale(0, vb)[1] * g.y_axis_len
+        if (ya < top and yb < top) or (ya > bot and yb > bot):
+            return
+        w = xb - xa
+        x0 = 0
+        x1 = w
+        y0 = ya
+        y1 = yb
+        if ya < top or ya > bot:
+            y0 = top if ya < top else bot
+            x0 = w * (y0 - ya) / (yb - ya)
+        if yb < top or yb > bot:
+            y1 = top if yb < top else bot
+            x1 = w * (y1 - ya) / (yb - ya)
+        g.device.line(xa + round(x0), round(y0), xa + round(x1), round(y1), self.color)
+
 
 class Graph(DObject):
     def __init__(self, writer, row, col, height, width, fgcolor, bgcolor, bdcolor, gridcolor):
@@ -193,6 +391,27 @@ class Graph(DObject):
     def clear(self):
         self.show()  # Clear working area
 
+    # Draw runs of pixel coordinates made by _polyline(), in buf[:n]: a line
+    # from each point to the next, a pixel for a run of one point.
+    def polyline(self, buf, n, color):
+        dev = self.device
+        line = dev.line
+        i = 0
+        while i < n:
+            x = buf[i]
+            y = buf[i + 1]
+            i += 2
+            if buf[i] == _BREAK:
+                dev.pixel(x, y, color)
+            while buf[i] != _BREAK:
+                x1 = buf[i]
+                y1 = buf[i + 1]
+                i += 2
+                line(x, y, x1, y1, color)
+                x = x1
+                y = y1
+            i += 1
+
 class CartesianGraph(Graph):
     def __init__(self,  writer, row, col, *, height=90, width = 120, fgcolor=None, bgcolor=None, bdcolor=None,
                  gridcolor=None, xdivs=10, ydivs=10, xorigin=5, yorigin=5):
@@ -205,6 +424,8 @@ class CartesianGraph(Graph):
         self.yp_origin = self.y0 + (ydivs - yorigin) * height / ydivs
         self.xorigin = xorigin
         self.yorigin = yorigin
+        self._curves = []  # Strip chart TSequences
+        self._drawn = 0  # Screen clears count when the strip chart was drawn
         self.show()
 
     def show(self):
@@ -214,19 +435,107 @@ class CartesianGraph(Graph):
         x1 = self.x1
         y0 = self.y0
         y1 = self.y1
+        self._drawn = 0  # Traces are gone
         if self.ydivs > 0:
-            dy = self.height / (self.ydivs) # Y grid line
-            for line in range(self.ydivs + 1):
-                color = self.fgcolor if line == self.yorigin else self.gridcolor
-                ypos = round(self.y1 - dy * line)
-                ssd.hline(x0, ypos, x1 - x0, color)
+            self._hgrid(x0, x1 - 1)
         if self.xdivs > 0:
             width = x1 - x0
             dx = width / (self.xdivs) # X grid line
             for line in range(self.xdivs + 1):
                 color = self.fgcolor if line == self.xorigin else self.gridcolor
                 xpos = round(x0 + dx * line)
-                ssd.vline(xpos, y0, y1 - y0, color)
+                if not (self._curves and self._xl <= xpos <= self._xr):
+                    ssd.vline(xpos, y0, y1 - y0, color)
+            if self._curves:
+                self._vgrid(self._xl, self._xr)
+
+    # Y grid lines in columns xa..xb
+    def _hgrid(self, xa, xb):
+        xa = max(xa, self.x0)
+        xb = min(xb, self.x1 - 1)
+        dy = self.height / (self.ydivs) # Y grid line
+        for line in range(self.ydivs + 1):
+            color = self.fgcolor if line == self.yorigin else self.gridcolor
+            ypos = round(self.y1 - dy * line)
+            self.device.hline(xa, ypos, xb - xa + 1, color)
+
+    # Strip chart. Traces lie in columns _xl.._xr, inside the left and right
+    # grid lines, and move left by _step(1) pixels per step. Steps are counted
+    # modulo _period, after which the moves repeat, shifted by a whole number
+    # of graph widths.
+    def _strip(self, curve):
+        if self._curves:
+            if curve.size != self._curves[0].size:
+                raise ValueError('TSequences scrolling on a graph must have the same size.')
+        else:
+            # Pixels per step: x_axis_len / size == _num / _den
+            self._num = max(self.xorigin, self.xdivs - self.xorigin) * self.width
+            self._den = self.xdivs * curve.size
+            q = _ppb(getattr(getattr(self.device, 'palette', None), 'mode', None))
+            if self._num < q * self._den:  # Less than a byte per step
+                q = 1
+            xl = max(self.x0 + 1, round(self.xp_origin - self.x_axis_len))
+            self._xl = -(-xl // q) * q  # Whole bytes from the frame's edge
+            self._xr = min(self.x1 - 1, round(self.xp_origin))
+            self._q = q  # Moves are multiples of q pixels
+            self._period = q * self._den
+            self._ticks = 0
+        self._curves.append(curve)
+        self._drawn = 0
+
+    # Position after t steps, in pixels rounded to bytes of the frame
+    def _x(self, t):
+        q = self._q
+        return q * ((2 * t * self._num + q * self._den) // (2 * q * self._den))
+
+    def _step(self, n):  # Distance of a sample added n steps ago from one added now
+        t = self._ticks
+        return self._x(t) - self._x(t - n)
+
+    # Move the traces left by one step. If the graph is on screen the area is
+    # moved by a blit and the columns exposed are cleared and their grid drawn.
+    def _tick(self):
+        self._ticks = (self._ticks + 1) % self._period
+        if self._drawn != DObject.clears.get(self.device) or not _awake(self.device):
+            return
+        s = self._step(1)
+        if not s:
+            return
+        xl = self._xl
+        xr = self._xr
+        y0 = self.y0
+        ht = self.y1 - y0 + 1
+        dev = self.device
+        view = _frame_view(dev, xl + s, y0, xr - xl + 1 - s, ht) if s <= xr - xl else None
+        if view is None:
+            self._drawn = 0  # add() draws it all
+            return
+        dev.blit(view, xl, y0)
+        xa = xr - s + 1
+        dev.fill_rect(xa, y0, s, ht, self.bgcolor)
+        if self.ydivs > 0:
+            self._hgrid(xa, xr)
+        self._vgrid(xa, xr)
+
+    # X grid lines of the strip chart in columns xa..xb. They move with the
+    # traces, so that a line which leaves on the left comes back on the right.
+    def _vgrid(self, xa, xb):
+        if self.xdivs <= 0:
+            return
+        width = self.width
+        dx = width / (self.xdivs) # X grid line
+        sh = self._x(self._ticks) % width
+        for line in range(2 * self.xdivs + 1):
+            xpos = round(self.x0 + dx * line) - sh
+            if xa <= xpos <= xb:
+                self.device.vline(xpos, self.y0, self.y1 - self.y0, self.gridcolor)
+
+    # Clear the strip chart and draw the traces
+    def _replot(self):
+        self.show()
+        for curve in self._curves:
+            curve._plot()
+        self._drawn = DObject.clears.get(self.device)
 
     # Called by Curve
     def line(self, start, end, color): # start and end relative to origin and scaled -1 .. 0 .. +1
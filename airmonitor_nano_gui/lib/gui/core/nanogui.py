@@ -1,6 +1,11 @@
 # nanogui.py Displayable objects based on the Writer and CWriter classes
 # V0.41 Peter Hinch 16th Nov 2020
 # Move cmath dependency to widgets/dial
+# 2026-1018 PP: rendering is suspended while a device is asleep (.is_awake False)
+# 2026-1018 PP: DObject.clears counts screen clears, for widgets which redraw
+#               only what changed since they were last drawn
+# 2026-1018 PP: _frame_view() for widgets which move an area of the frame with
+#               blit()
 
 # Released under the MIT License (MIT). See LICENSE.
 # Copyright (c) 2018-2021 Peter Hinch
@@ -27,29 +32,107 @@ def fillcircle(dev, x0, y0, r, color): # Draw filled circle
     x, y, r = int(x0), int(y0), int(r)
     dev.ellipse(x, y, r, r, color, True)
     
+# A device whose .is_awake is False (display powered off) is suspended: widgets
+# which change are pended instead of drawn and refresh() sends nothing. The
+# first refresh after wake draws each pended widget once, in its latest state.
+def _awake(device):
+    return getattr(device, 'is_awake', True) is not False
+
+# Pixels per byte along a row of a frame of format mode.
+def _ppb(mode):
+    if mode == framebuf.GS4_HMSB:
+        return 2
+    if mode == framebuf.GS2_HMSB:
+        return 4
+    if mode == framebuf.MONO_HLSB or mode == framebuf.MONO_HMSB:
+        return 8
+    return 1
+
+# A view of part of a frame, which knows its size for drivers tracking damage.
+class _View(framebuf.FrameBuffer):
+    def __init__(self, buf, width, height, mode, stride):
+        super().__init__(buf, width, height, mode, stride)
+        self.width = width
+        self.height = height
+
+# View of the w * h area at x, y of the frame of device, to blit() it elsewhere
+# on the device. blit() copies pixel by pixel from the top row down and from
+# left to right, so the area may be moved up or left onto itself. None if the
+# format of the device is unknown, the area does not start on a byte or the
+# view's h rows of stride wd would run past the end of the frame (firmware
+# 1.20-1.22 refuse such a buffer, e.g. an area on the last row with x > 0).
+def _frame_view(device, x, y, w, h):
+    mode = getattr(getattr(device, 'palette', None), 'mode', None)
+    wd = device.width
+    if mode == framebuf.MONO_VLSB:
+        if y & 7:
+            return None
+        offs = (y >> 3) * wd + x
+        size = ((h + 7) >> 3) * wd
+    elif mode == framebuf.RGB565:
+        offs = (y * wd + x) * 2
+        size = h * wd * 2
+    elif mode in (framebuf.GS8, framebuf.GS4_HMSB, framebuf.GS2_HMSB,
+                  framebuf.MONO_HLSB, framebuf.MONO_HMSB):
+        ppb = _ppb(mode)
+        if x % ppb or wd % ppb:
+            return None
+        offs = (y * wd + x) // ppb
+        size = h * wd // ppb
+    else:
+        return None
+    buf = memoryview(device)
+    if offs + size > len(buf):
+        return None
+    return _View(buf[offs:], w, h, mode, wd)
+
 # If a (framebuf based) device is passed to refresh, the screen is cleared.
 # None causes pending widgets to be drawn and the result to be copied to hardware.
 # The pend mechanism enables a displayable object to postpone its renedering
 # until it is complete: efficient for e.g. Dial which may have multiple Pointers
 def refresh(device, clear=False):
+    _update(device, clear)
+    if _awake(device):
+        device.show()
+
+# Asynchronous refresh. Drivers with an awaitable .do_refresh() (ILI9341,
+# ST7735R) copy the frame in segments, yielding to other tasks between them.
+# split is passed on to .do_refresh(); None uses the driver default. Other
+# drivers fall back to a blocking .show().
+async def arefresh(device, clear=False, split=None):
+    _update(device, clear)
+    if not _awake(device):
+        return
+    if hasattr(device, 'do_refresh'):
+        if split is None:
+            await device.do_refresh()
+        else:
+            await device.do_refresh(split)
+    else:
+        device.show()
+
+# Draw pending widgets to the framebuf, or clear it.
+def _update(device, clear):
     if not isinstance(device, framebuf.FrameBuffer):
         raise ValueError('Device must be derived from FrameBuffer.')
     if device not in DObject.devices:
         DObject.devices[device] = set()
+        DObject.clears[device] = 1
         device.fill(0)
     else:
         if clear:
             DObject.devices[device].clear()  # Clear the pending set
+            DObject.clears[device] += 1
             device.fill(0)
-        else:
+        elif _awake(device):
             for obj in DObject.devices[device]:
                 obj.show()
             DObject.devices[device].clear()
-    device.show()
 
 # Displayable object: effectively an ABC for all GUI objects.
 class DObject():
     devices = {}  # Index device instance, value is a set of pending objects
+    clears = {}  # Index device instance, value is no. of times screen was cleared
 
     @classmethod
     def _set_pend(cls, obj):
@@ -96,6 +179,14 @@ class DObject():
         # has_border is True if a border was drawn
         self.has_border = False
 
+    # Widgets call _redraw() when their state changes. While the device is
+    # suspended the object is pended, to be drawn by the refresh after wake.
+    def _redraw(self):
+        if _awake(self.device) or self.device not in DObject.devices:
+            self.show()
+        else:
+            DObject._set_pend(self)
+
     def warning(self):
         print('Warning: attempt to create {} outside screen dimensions.'.format(self.__class__.__name__))
 
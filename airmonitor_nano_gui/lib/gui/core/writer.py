@@ -1,6 +1,20 @@
 # writer.py Implements the Writer class.
 # Handles colour, word wrap and tab stops
 
+# V0.5.7 Oct 2026 Word wrap by wrap(), shared with Textbox: each char is measured
+# once. Writer breaks lines where it always did. _truelen() scans every row of
+# a glyph.
+# V0.5.6 Oct 2026 Printable widths of glyphs are found once per font and char.
+# Widths of recently measured strings are kept (Writer.measure_cache).
+# V0.5.5 Oct 2026 Text is measured with the font's get_width(), which has
+# precomputed tables, if it has one.
+# V0.5.4 Oct 2026 CWriter keeps recently used glyphs rendered in the display's
+# own format and colors, blitted without building a FrameBuffer or setting the
+# palette (see the cache constructor arg).
+# V0.5.3 Oct 2026 Scrolling uses the display's hardware scroll (.vscroll()) if
+# it has one, so only the new line is sent to the panel.
+# V0.5.2 Oct 2026 Glyphs are blitted from a FrameBuffer which carries its size,
+# so drivers which track damage can mark only the area written.
 # V0.5.1 Dec 2022 Support 4-bit color display drivers.
 # V0.5.0 Sep 2021 Color now requires firmware >= 1.17.
 # V0.4.3 Aug 2021 Support for fast blit to color displays (PR7682).
@@ -25,8 +39,9 @@ import framebuf
 from uctypes import bytearray_at, addressof
 from sys import implementation
 import os
+from collections import OrderedDict
 
-__version__ = (0, 5, 1)
+__version__ = (0, 5, 7)
 
 fast_mode = True  # Does nothing. Kept to avoid breaking code.
 
@@ -35,15 +50,179 @@ class DisplayState():
         self.text_row = 0
         self.text_col = 0
 
+# A plain FrameBuffer does not expose its dimensions to the blit() target.
+class _Glyph(framebuf.FrameBuffer):
+    def __init__(self, buf, width, height, mode):
+        super().__init__(buf, width, height, mode)
+        self.width = width
+        self.height = height
+
+# Bytes for a w * h FrameBuffer of a given mode. None if not known.
+def _bufsize(mode, w, h):
+    if mode == framebuf.MONO_VLSB:
+        return w * ((h + 7) >> 3)
+    if mode == framebuf.MONO_HLSB or mode == framebuf.MONO_HMSB:
+        return ((w + 7) >> 3) * h
+    if mode == framebuf.GS2_HMSB:
+        return ((w + 3) >> 2) * h
+    if mode == framebuf.GS4_HMSB:
+        return ((w + 1) >> 1) * h
+    if mode == framebuf.GS8:
+        return w * h
+    if mode == framebuf.RGB565:
+        return 2 * w * h
+    return None
+
 def _get_id(device):
     if not isinstance(device, framebuf.FrameBuffer):
         raise ValueError('Device must be derived from FrameBuffer.')
     return id(device)
 
+# Line breaking for Writer and Textbox. Yields (start, end, next) for each line
+# of string s: s[start:end] is printed and the next line starts at s[next].
+# Every char is measured once, with get_width(char).
+# width: pixels per line, None to break at '\n' only. col: column at which the
+# first line starts, the others start at 0.
+# truelen: None or a function giving the width of a char less any blank
+# columns on its RHS, to fit the last char of a line.
+# clip: the rest of a line which does not fit is dropped instead of wrapped.
+# Lines break after the last word which fits, dropping the spaces which
+# follow it. The last line is yielded even if empty when s ends with '\n'.
+# split (Textbox): a word which does not fit from col moves to a line of its
+# own, and a word too long for a line of its own is broken after its last char
+# which fits. With split=False (Writer) lines break at spaces only, as Writer
+# always did: see _wrap_at_spaces().
+def wrap(s, width, get_width, col=0, truelen=None, clip=False, split=True):
+    if width is None:
+        width = 0x3fffffff
+    if not split:
+        yield from _wrap_at_spaces(s, width, get_width, col, truelen)
+        return
+    ln = len(s)
+    ls = 0  # Start of line
+    col0 = col  # Column of ls
+    brk = -1  # End of the last word which fits and is followed by spaces
+    nxt = -1  # Start of the word after those spaces
+    ncol = 0  # Column of nxt
+    space = False  # Last char was a space
+    n = 0
+    while n < ln:
+        c = s[n]
+        if c == '\n':
+            # Trailing spaces which overhang are dropped
+            yield ls, brk if space and brk >= 0 and col > width else n, n + 1
+            n += 1
+            ls = n
+            col = col0 = 0
+            brk = -1
+            space = False
+            continue
+        w = get_width(c)
+        if c == ' ':
+            if not space and n > ls:
+                brk = n  # A word ended
+                nxt = -1
+            space = True
+        else:
+            if space and brk >= 0:
+                nxt = n  # The word after a break
+                ncol = col
+            space = False
+            if col + w > width and (truelen is None or col + truelen(c) > width):
+                # c does not fit
+                if clip:  # Drop spaces before c if they overhang
+                    p = s.find('\n', n)
+                    yield ls, brk if nxt == n and ncol > width else n, ln if p < 0 else p + 1
+                    if p < 0:
+                        return
+                    n = ls = p + 1
+                    col = 0
+                elif nxt >= 0:  # Break after the word which fitted
+                    yield ls, brk, nxt
+                    ls = nxt
+                    col -= ncol
+                elif col0 > 0:  # Try the word on a line of its own
+                    yield ls, ls, ls
+                    col -= col0
+                elif n > ls:  # Break the word
+                    yield ls, n, n
+                    ls = n
+                    col = 0
+                else:  # Not even one char fits
+                    yield ls, n + 1, n + 1
+                    n = ls = n + 1
+                    col = 0
+                col0 = 0
+                brk = -1
+                nxt = -1
+                continue  # Measure c again on the new line
+        col += w
+        n += 1
+    if ls < ln or (ln and s[-1] == '\n'):
+        yield ls, brk if space and brk >= 0 and col > width else ln, ln
+
+# wrap() with split=False. A line which does not fit breaks at the last run of
+# spaces before the first char which does not fit, unless that is a single
+# space starting the line. With no such run the rest of the line is yielded
+# whole, for _get_char() to clip. Spaces which overhang at the end of a line
+# break it before them, leaving an empty line.
+def _wrap_at_spaces(s, width, get_width, col, truelen):
+    ln = len(s)
+    ls = 0  # Start of line
+    run = -1  # Start of the current run of spaces
+    brk = -1  # Start of the last run of spaces which ended
+    nxt = -1  # End of that run
+    ncol = 0  # Column of nxt
+    w = 0  # Width of the last char
+    n = 0
+    while n <= ln:
+        if n == ln or s[n] == '\n':
+            if (run >= 0 and n - 1 > ls
+                    and col - w + (truelen(s[n - 1]) if truelen else w) > width):
+                yield ls, run, n  # Spaces overhang
+                ls = n
+            if ln:
+                yield ls, n, min(n + 1, ln)
+            n += 1
+            ls = n
+            col = 0
+            run = brk = nxt = -1
+            continue
+        c = s[n]
+        w = get_width(c)
+        if c == ' ':
+            if run < 0:
+                run = n
+        else:
+            if run >= 0:
+                brk, nxt, ncol = run, n, col
+                run = -1
+            if col + w > width and (truelen is None or col + truelen(c) > width):
+                if nxt > ls + 1:  # Break before the run of spaces
+                    yield ls, brk, nxt
+                    ls = nxt
+                    col -= ncol
+                    brk = nxt = -1
+                    continue  # Measure c again on the new line
+                p = s.find('\n', n)
+                if p < 0:
+                    yield ls, ln, ln
+                    return
+                yield ls, p, p + 1
+                n = ls = p + 1
+                col = 0
+                brk = nxt = -1
+                continue
+        col += w
+        n += 1
+
 # Basic Writer class for monochrome displays
 class Writer():
 
     state = {}  # Holds a display state for each device
+    _truelens = {}  # Index font, value is a dict of printable width by char
+    measure_cache = 32  # No. of strings whose width is kept. 0: none
+    _measured = OrderedDict()  # (font, string): width
 
     @staticmethod
     def set_textpos(device, row=None, col=None):
@@ -67,6 +246,8 @@ class Writer():
         if self.devid not in Writer.state:
             Writer.state[self.devid] = DisplayState()
         self.font = font
+        # Width of a char. Fonts without precomputed tables lack get_width().
+        self.get_width = getattr(font, 'get_width', None) or (lambda c : font.get_ch(c)[2])
         if font.height() >= device.height or font.max_width() >= device.width:
             raise ValueError('Font too large for screen')
         # Allow to work with reverse or normal font mapping
@@ -105,7 +286,9 @@ class Writer():
         y = self.screenheight + margin
         if margin < 0:
             if not self.row_clip:
-                self.device.scroll(0, margin)
+                vscroll = getattr(self.device, 'vscroll', None)
+                if not (vscroll and vscroll(margin)):
+                    self.device.scroll(0, margin)
                 self.device.fill_rect(0, y, self.screenwidth, abs(margin), self.bgcolor)
                 s.text_row += margin
 
@@ -123,72 +306,61 @@ class Writer():
         return self.font.height()
 
     def printstring(self, string, invert=False):
-        # word wrapping. Assumes words separated by single space.
-        q = string.split('\n')
-        last = len(q) - 1
-        for n, s in enumerate(q):
-            if s:
-                self._printline(s, invert)
-            if n != last:
+        # Word wrap at spaces, see wrap()
+        width = self.screenwidth if self.wrap else None
+        nl = False
+        for start, end, _ in wrap(string, width, self.get_width,
+                                  self._getstate().text_col, self._truelen, split=False):
+            if nl:
                 self._printchar('\n')
-
-    def _printline(self, string, invert):
-        rstr = None
-        if self.wrap and self.stringlen(string, True):  # Length > self.screenwidth
-            pos = 0
-            lstr = string[:]
-            while self.stringlen(lstr, True):  # Length > self.screenwidth
-                pos = lstr.rfind(' ')
-                lstr = lstr[:pos].rstrip()
-            if pos > 0:
-                rstr = string[pos + 1:]
-                string = lstr
-                
-        for char in string:
-            self._printchar(char, invert)
-        if rstr is not None:
-            self._printchar('\n')
-            self._printline(rstr, invert)  # Recurse
+            for n in range(start, end):
+                self._printchar(string[n], invert)
+            nl = True
 
     def stringlen(self, string, oh=False):
         if not len(string):
             return 0
+        key = (self.font, string)
+        l = Writer._measured.pop(key, None)
+        if l is None:
+            get_width = self.get_width
+            l = 0
+            for char in string:
+                l += get_width(char)
+            while len(Writer._measured) >= Writer.measure_cache > 0:
+                Writer._measured.pop(next(iter(Writer._measured)))
+        if Writer.measure_cache > 0:
+            Writer._measured[key] = l  # Most recently used last
+        if not oh:
+            return l
         sc = self._getstate().text_col  # Start column
-        wd = self.screenwidth
-        l = 0
-        for char in string[:-1]:
-            _, _, char_width = self.font.get_ch(char)
-            l += char_width
-            if oh and l + sc > wd:
-                return True  # All done. Save time.
-        char = string[-1]
-        _, _, char_width = self.font.get_ch(char)
-        if oh and l + sc + char_width > wd:
-            l += self._truelen(char)  # Last char might have blank cols on RHS
-        else:
-            l += char_width  # Public method. Return same value as old code.
-        return l + sc > wd if oh else l
+        if l + sc <= self.screenwidth:
+            return False
+        char = string[-1]  # Last char might have blank cols on RHS
+        return l - self.get_width(char) + self._truelen(char) + sc > self.screenwidth
 
     # Return the printable width of a glyph less any blank columns on RHS
     def _truelen(self, char):
+        t = Writer._truelens.get(self.font)
+        if t is None:
+            t = Writer._truelens[self.font] = {}
+        n = t.get(char)
+        if n is None:
+            n = t[char] = self._scan(char)
+        return n
+
+    # Find the rightmost lit column of a glyph
+    def _scan(self, char):
         glyph, ht, wd = self.font.get_ch(char)
-        div, mod = divmod(wd, 8)
-        gbytes = div + 1 if mod else div  # No. of bytes per row of glyph
+        gbytes = (wd + 7) >> 3  # No. of bytes per row of glyph
         mc = 0  # Max non-blank column
-        data = glyph[(wd - 1) // 8]  # Last byte of row 0
         for row in range(ht):  # Glyph row
-            for col in range(wd -1, -1, -1):  # Glyph column
-                gbyte, gbit = divmod(col, 8)
-                if gbit == 0:  # Next glyph byte
-                    data = glyph[row * gbytes + gbyte]
-                if col <= mc:
-                    break
-                if data & (1 << (7 - gbit)):  # Pixel is lit (1)
+            for col in range(wd - 1, mc, -1):  # Glyph columns right of mc
+                if glyph[row * gbytes + (col >> 3)] & (0x80 >> (col & 7)):  # Pixel is lit (1)
                     mc = col  # Eventually gives rightmost lit pixel
                     break
-            if mc + 1 == wd:
+            if mc + 1 >= wd:
                 break  # All done: no trailing space
-        # print('Truelen', char, wd, mc + 1)  # TEST 
         return mc + 1
 
     def _get_char(self, char, recurse):
@@ -240,7 +412,7 @@ class Writer():
         if invert:
             for i, v in enumerate(buf):
                 buf[i] = 0xFF & ~ v
-        fbc = framebuf.FrameBuffer(buf, self.clip_width, self.char_height, self.map)
+        fbc = _Glyph(buf, self.clip_width, self.char_height, self.map)
         self.device.blit(fbc, s.text_col, s.text_row)
         s.text_col += self.char_width
         self.cpos += 1
@@ -266,9 +438,14 @@ class CWriter(Writer):
         x = idx << 1
         ssd.lut[x] = c & 0xff
         ssd.lut[x + 1] = c >> 8
+        if hasattr(ssd, 'lut_changed'):  # Driver has tables derived from lut
+            ssd.lut_changed()
         return idx
 
-    def __init__(self, device, font, fgcolor=None, bgcolor=None, verbose=True):
+    # cache: no. of rendered glyphs kept, keyed by char, colors and clip width.
+    # A glyph costs a width * height FrameBuffer in the display's format. 0
+    # disables the cache. .hits and .misses count lookups, to help sizing it.
+    def __init__(self, device, font, fgcolor=None, bgcolor=None, verbose=True, cache=16):
         if not hasattr(device, 'palette'):
             raise OSError('Incompatible device driver.')
         if implementation[1] < (1, 17, 0):
@@ -281,21 +458,55 @@ class CWriter(Writer):
             self.fgcolor = fgcolor
         self.def_bgcolor = self.bgcolor
         self.def_fgcolor = self.fgcolor
+        # Palette of a driver without .mode: no cache
+        self._mode = getattr(device.palette, 'mode', None)
+        self.cache = cache if _bufsize(self._mode, 1, 1) else 0
+        self._glyphs = OrderedDict()  # Least recently used first
+        self.hits = 0
+        self.misses = 0
 
     def _printchar(self, char, invert=False, recurse=False):
         s = self._getstate()
         self._get_char(char, recurse)
         if self.glyph is None:
             return  # All done
-        buf = bytearray_at(addressof(self.glyph), len(self.glyph))
-        fbc = framebuf.FrameBuffer(buf, self.clip_width, self.char_height, self.map)
-        palette = self.device.palette
-        palette.bg(self.fgcolor if invert else self.bgcolor)
-        palette.fg(self.bgcolor if invert else self.fgcolor)
-        self.device.blit(fbc, s.text_col, s.text_row, -1, palette)
+        fg = self.bgcolor if invert else self.fgcolor
+        bg = self.fgcolor if invert else self.bgcolor
+        if self.cache > 0:
+            key = (char, fg, bg, self.clip_width)
+            fbc = self._glyphs.pop(key, None)
+            if fbc is None:
+                self.misses += 1
+                fbc = self._render(fg, bg)
+                while len(self._glyphs) >= self.cache:
+                    self._glyphs.pop(next(iter(self._glyphs)))
+            else:
+                self.hits += 1
+            self._glyphs[key] = fbc  # Most recently used last
+            self.device.blit(fbc, s.text_col, s.text_row)
+        else:
+            buf = bytearray_at(addressof(self.glyph), len(self.glyph))
+            fbc = _Glyph(buf, self.clip_width, self.char_height, self.map)
+            palette = self.device.palette
+            palette.bg(bg)
+            palette.fg(fg)
+            self.device.blit(fbc, s.text_col, s.text_row, -1, palette)
         s.text_col += self.char_width
         self.cpos += 1
 
+    # The current glyph in colors fg on bg, in the display's format.
+    def _render(self, fg, bg):
+        w = self.clip_width
+        h = self.char_height
+        buf = bytearray_at(addressof(self.glyph), len(self.glyph))
+        src = framebuf.FrameBuffer(buf, w, h, self.map)
+        fbc = _Glyph(bytearray(_bufsize(self._mode, w, h)), w, h, self._mode)
+        palette = self.device.palette
+        palette.bg(bg)
+        palette.fg(fg)
+        fbc.blit(src, 0, 0, -1, palette)
+        return fbc
+
     def setcolor(self, fgcolor=None, bgcolor=None):
         if fgcolor is None and bgcolor is None:
             self.fgcolor = self.def_fgcolor
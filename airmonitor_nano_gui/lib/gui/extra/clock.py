@@ -34,7 +34,7 @@ class Clock(DObject):
 
     def value(self, t):
         super().value(t)
-        self.show()
+        self._redraw()
 
     def show(self):
         super().show()
@@ -128,12 +128,19 @@ b'\x78\x04\x84\x04\x84\x04\x90\x04\x90\x04\x9c\x04\x9c\x04\xa8\x04'\
 
 _mvfont = memoryview(_font)
 
+# 2026-1018 PP: glyph offsets and widths tabulated at import, so get_ch() does
+# no int.from_bytes() calls and get_width() allocates nothing.
+from array import array
+_offs = array('H', (_index[i] | _index[i + 1] << 8 for i in range(0, len(_index), 4)))
+_ends = array('H', (_index[i] | _index[i + 1] << 8 for i in range(2, len(_index), 4)))
+_widths = array('H', (_font[o] | _font[o + 1] << 8 for o in _offs))
+
 def get_ch(ch):
-    ordch = ord(ch)
-    ordch = ordch + 1 if ordch >= 32 and ordch <= 126 else 32
-    idx_offs = 4 * (ordch - 32)
-    offset = int.from_bytes(_index[idx_offs : idx_offs + 2], 'little')
-    next_offs = int.from_bytes(_index[idx_offs + 2 : idx_offs + 4], 'little')
-    width = int.from_bytes(_font[offset:offset + 2], 'little')
-    return _mvfont[offset + 2:next_offs], 10, width
- 
+    oc = ord(ch)
+    n = oc - 31 if oc >= 32 and oc <= 126 else 0
+    doff = _offs[n]
+    return _mvfont[doff + 2:_ends[n]], 10, _widths[n]
+
+def get_width(ch):
+    oc = ord(ch)
+    return _widths[oc - 31 if oc >= 32 and oc <= 126 else 0]
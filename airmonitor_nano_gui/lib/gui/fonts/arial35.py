@@ -657,15 +657,20 @@ b'\x47\x23\xd5\x23\x1d\x24\x88\x24\xf3\x24\x3b\x25\x83\x25\xcb\x25'\
 b'\x36\x26'
 
 _mvfont = memoryview(_font)
-_mvi = memoryview(_index)
-ifb = lambda l : l[0] | (l[1] << 8)
+
+# 2026-1018 PP: glyph offsets and widths tabulated at import, so get_ch() does
+# no int.from_bytes() calls and get_width() allocates nothing.
+from array import array
+_offs = array('H', (_index[i] | _index[i + 1] << 8 for i in range(0, len(_index) - 2, 2)))
+_widths = array('H', (_font[o] | _font[o + 1] << 8 for o in _offs))
+_ends = array('H', (o + 2 + ((w - 1) // 8 + 1) * 35 for o, w in zip(_offs, _widths)))
 
 def get_ch(ch):
     oc = ord(ch)
-    ioff = 2 * (oc - 32 + 1) if oc >= 32 and oc <= 126 else 0
-    doff = ifb(_mvi[ioff : ])
-    width = ifb(_mvfont[doff : ])
+    n = oc - 31 if oc >= 32 and oc <= 126 else 0
+    doff = _offs[n]
+    return _mvfont[doff + 2:_ends[n]], 35, _widths[n]
 
-    next_offs = doff + 2 + ((width - 1)//8 + 1) * 35
-    return _mvfont[doff + 2:next_offs], 35, width
- 
+def get_width(ch):
+    oc = ord(ch)
+    return _widths[oc - 31 if oc >= 32 and oc <= 126 else 0]
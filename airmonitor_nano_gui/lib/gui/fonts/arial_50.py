@@ -218,15 +218,20 @@ b'\xe0\x07\xdc\x08\xd8\x09\xd4\x0a\x00\x00\x00\x00\x00\x00\x00\x00'\
 b'\x00\x00\x6c\x0b'
 
 _mvfont = memoryview(_font)
-_mvi = memoryview(_index)
-ifb = lambda l : l[0] | (l[1] << 8)
+
+# 2026-1018 PP: glyph offsets and widths tabulated at import, so get_ch() does
+# no int.from_bytes() calls and get_width() allocates nothing.
+from array import array
+_offs = array('H', (_index[i] | _index[i + 1] << 8 for i in range(0, len(_index) - 2, 2)))
+_widths = array('H', (_font[o] | _font[o + 1] << 8 for o in _offs))
+_ends = array('H', (o + 2 + ((w - 1) // 8 + 1) * 50 for o, w in zip(_offs, _widths)))
 
 def get_ch(ch):
     oc = ord(ch)
-    ioff = 2 * (oc - 48 + 1) if oc >= 48 and oc <= 63 else 0
-    doff = ifb(_mvi[ioff : ])
-    width = ifb(_mvfont[doff : ])
+    n = oc - 47 if oc >= 48 and oc <= 63 else 0
+    doff = _offs[n]
+    return _mvfont[doff + 2:_ends[n]], 50, _widths[n]
 
-    next_offs = doff + 2 + ((width - 1)//8 + 1) * 50
-    return _mvfont[doff + 2:next_offs], 50, width
- 
+def get_width(ch):
+    oc = ord(ch)
+    return _widths[oc - 47 if oc >= 48 and oc <= 63 else 0]
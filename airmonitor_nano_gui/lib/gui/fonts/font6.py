@@ -162,15 +162,19 @@ b'\x7a\x07'
 
 _mvfont = memoryview(_font)
 
-def _chr_addr(ordch):
-    offset = 2 * (ordch - 32)
-    return int.from_bytes(_index[offset:offset + 2], 'little')
+# 2026-1018 PP: glyph offsets and widths tabulated at import, so get_ch() does
+# no int.from_bytes() calls and get_width() allocates nothing.
+from array import array
+_offs = array('H', (_index[i] | _index[i + 1] << 8 for i in range(0, len(_index) - 2, 2)))
+_ends = array('H', (_index[i] | _index[i + 1] << 8 for i in range(2, len(_index), 2)))
+_widths = array('H', (_font[o] | _font[o + 1] << 8 for o in _offs))
 
 def get_ch(ch):
-    ordch = ord(ch)
-    ordch = ordch + 1 if ordch >= 32 and ordch <= 126 else 32
-    offset = _chr_addr(ordch)
-    width = int.from_bytes(_font[offset:offset + 2], 'little')
-    next_offs = _chr_addr(ordch +1)
-    return _mvfont[offset + 2:next_offs], 14, width
- 
+    oc = ord(ch)
+    n = oc - 31 if oc >= 32 and oc <= 126 else 0
+    doff = _offs[n]
+    return _mvfont[doff + 2:_ends[n]], 14, _widths[n]
+
+def get_width(ch):
+    oc = ord(ch)
+    return _widths[oc - 31 if oc >= 32 and oc <= 126 else 0]
@@ -3,6 +3,10 @@
 # Released under the MIT License (MIT). See LICENSE.
 # Copyright (c) 2018-2022 Peter Hinch
 
+# 2026-1018 PP: value() does nothing if the text and colors are already on
+# screen. If only the text changed, show() redraws the glyphs which differ and,
+# from the first glyph whose width differs, the rest of the text.
+
 from micropython import const
 from gui.core.nanogui import DObject
 from gui.core.writer import Writer
@@ -23,6 +27,8 @@ class Label(DObject):
         height = writer.height
         super().__init__(writer, row, col, height, width, fgcolor, bgcolor, bdcolor)
         self.align = align
+        self._shown = None  # (state, text, rel. column) when last drawn
+        self._old = None  # Text on screen if show() may redraw only changes
         if text is not None:
             self.value(text, invert)
 
@@ -37,14 +43,26 @@ class Label(DObject):
         self.bdcolor = self.def_bdcolor if bdcolor is None else bdcolor
         if align is not None:
             self.align = align
-        self.show()
+        self._old = None
+        shown = self._shown
+        if shown is not None and shown[0] == self._state():
+            if shown[1] == txt:
+                return txt  # Already on screen
+            self._old = shown[1]
+        self._redraw()
         return txt
 
+    # What, apart from the text, decides the label's appearance
+    def _state(self):
+        return (self.invert, self.fgcolor, self.bgcolor, self.bdcolor, self.align,
+                DObject.clears.get(self.device, 0))
+
     def show(self):
         txt = super().value()
         if txt is None:  # No content to draw. Future use.
             return
-        super().show()  # Draw or erase border
+        old = self._old
+        self._old = None
         wri = self.writer
         dev = self.device
         rcol = 0  # Relative column of LHS of text
@@ -52,7 +70,45 @@ class Label(DObject):
             txt_width = wri.stringlen(txt)
             if self.width > txt_width:
                 rcol = self.width - txt_width if self.align == ALIGN_RIGHT else self.width // 2 - txt_width // 2
-        Writer.set_textpos(dev, self.row, self.col + rcol)
         wri.setcolor(self.fgcolor, self.bgcolor)
-        wri.printstring(txt, self.invert)
+        if old is None or rcol != self._shown[2] or not self._changes(old, txt, self.col + rcol):
+            super().show()  # Draw or erase border
+            Writer.set_textpos(dev, self.row, self.col + rcol)
+            wri.printstring(txt, self.invert)
         wri.setcolor()  # Restore defaults
+        self._shown = (self._state(), txt, rcol)
+
+    # Replace text old starting at column x with txt. Glyphs of the same
+    # width are drawn over their predecessors (a glyph sets its whole cell)
+    # if they differ. From the first change of width the area is cleared to
+    # the end of the label and the rest of the text printed.
+    # Returns False if only a full redraw will do: glyphs already drawn are
+    # then drawn again.
+    def _changes(self, old, txt, x):
+        for s in (old, txt):
+            if '\n' in s or '\t' in s:
+                return False
+        wri = self.writer
+        dev = self.device
+        get_width = wri.get_width
+        n = min(len(old), len(txt))
+        i = 0
+        while i < n:
+            w = get_width(txt[i])
+            if w != get_width(old[i]):
+                break
+            if txt[i] != old[i] and x < dev.width:
+                Writer.set_textpos(dev, self.row, x)
+                wri.printstring(txt[i], self.invert)
+            x += w
+            i += 1
+        if i < len(old) or i < len(txt):
+            end = self.col + self.width
+            if x + wri.stringlen(old[i:]) > end:
+                return False  # Old text overhangs the label (and any border)
+            if x < end:
+                dev.fill_rect(x, self.row, end - x, self.height, self.bgcolor)
+            if i < len(txt) and x < dev.width:
+                Writer.set_textpos(dev, self.row, x)
+                wri.printstring(txt[i:], self.invert)
+        return True
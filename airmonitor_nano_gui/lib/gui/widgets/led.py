@@ -16,7 +16,7 @@ class LED(DObject):
 
     def color(self, c=None):
         self.fgcolor = self.bgcolor if c is None else c
-        self.show()
+        self._redraw()
 
     def show(self):
         super().show()
@@ -35,7 +35,7 @@ class Meter(DObject):
         n = super().value(min(1, max(0, n)))
         if color is not None:
             self.ptcolor = color
-        self.show()
+        self._redraw()
         return n
         
     def show(self):
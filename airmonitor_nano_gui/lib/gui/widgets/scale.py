@@ -119,5 +119,5 @@ class Scale(DObject):
             v = self._to_int(val)
             if v != self._value:
                 self._value = v
-                self.show()
+                self._redraw()
         return self._fvalue(self._value)
@@ -6,14 +6,28 @@
 # Usage:
 # from gui.widgets.textbox import Textbox
 
-from gui.core.nanogui import DObject
-from gui.core.writer import Writer
+from gui.core.nanogui import DObject, _awake, _frame_view
+from gui.core.writer import Writer, wrap
 
 # Reason for no tab support in private/reason_for_no_tabs
 
+# 2026-1018 PP: hwscroll=True scrolls with the display's hardware scroll
+# (.vscroll()): only the lines scrolled into view are drawn and sent. The
+# hardware moves whole screen rows, so nothing else may share the rows of
+# the Textbox.
+# 2026-1018 PP: lines are held in a ring of fixed capacity: maxlines, default
+# nlines, which is also the default ntrim of append(). The ring grows if
+# append() is asked to keep more. Once the box has been drawn, append(),
+# scroll() and goto() draw only the lines which are new or come into view:
+# the lines which stay are moved by the hardware scroll or by blitting the
+# box's area of the frame onto itself. The blit needs the box to start on a
+# byte of the frame (e.g. even columns on 4 bit displays, rows and line
+# heights multiple of 8 on SH1107). Otherwise, and after the screen was
+# cleared, the box is redrawn.
+
 class Textbox(DObject):
     def __init__(self, writer, row, col, width, nlines, *, bdcolor=None, fgcolor=None,
-                 bgcolor=None, clip=True):
+                 bgcolor=None, clip=True, hwscroll=False, maxlines=None):
         height = nlines * writer.height
         devht = writer.device.height
         devwd = writer.device.width
@@ -22,105 +36,173 @@ class Textbox(DObject):
         super().__init__(writer, row, col, height, width, fgcolor, bgcolor, bdcolor)
         self.nlines = nlines
         self.clip = clip
-        self.lines = []
+        self.hwscroll = hwscroll
+        self.maxlines = max(nlines, 0 if maxlines is None else maxlines)  # Default ntrim
+        self._ring = [None] * self.maxlines
+        self._head = 0  # Ring index of the oldest line
+        self._count = 0
         self.start = 0  # Start line for display
+        self._drawn = 0  # Screen clears count when the box was last drawn in full
+
+    @property
+    def lines(self):  # Oldest first
+        return [self._line(n) for n in range(self._count)]
+
+    def _line(self, n):
+        ring = self._ring
+        return ring[(self._head + n) % len(ring)]
+
+    # Add a line, dropping the oldest if the ring is full. Return lines dropped.
+    def _push(self, line):
+        ring = self._ring
+        if self._count < len(ring):
+            ring[(self._head + self._count) % len(ring)] = line
+            self._count += 1
+            return 0
+        ring[self._head] = line
+        self._head = (self._head + 1) % len(ring)
+        return 1
+
+    def _drop(self, n):  # Drop the n oldest lines
+        ring = self._ring
+        for _ in range(n):
+            ring[self._head] = None
+            self._head = (self._head + 1) % len(ring)
+        self._count -= n
+
+    def _resize(self, size):
+        ring = self.lines
+        self._head = 0
+        self._ring = ring + [None] * (size - len(ring))
 
     def _add_lines(self, s):
-        width = self.width
-        font = self.writer.font
-        n = -1  # Index into string
-        newline = True
-        while True:
-            n += 1
-            if newline:
-                newline = False
-                ls = n  # Start of line being processed
-                col = 0  # Column relative to text area
-            if n >= len(s):  # End of string
-                if n > ls:
-                    self.lines.append(s[ls :])
-                return
-            c = s[n]  # Current char
-            if c == '\n':
-                self.lines.append(s[ls : n])
-                newline = True
-                continue  # Line fits window
-            col += font.get_ch(c)[2]  # width of current char
-            if col > width:
-                if self.clip:
-                    p = s[ls :].find('\n')  # end of 1st line
-                    if p == -1:
-                        self.lines.append(s[ls : n])  # clip, discard all to right
-                        return
-                    self.lines.append(s[ls : n])  # clip, discard to 1st newline
-                    n = p  # n will move to 1st char after newline
-                elif c == ' ':  # Easy word wrap
-                    self.lines.append(s[ls : n])
-                else:  # Edge splits a word
-                    p = s.rfind(' ', ls, n + 1)
-                    if p >= 0:  # spacechar in line: wrap at space
-                        assert (p > 0), 'space char in position 0'
-                        self.lines.append(s[ls : p])
-                        n = p
-                    else:  # No spacechar: wrap at end
-                        self.lines.append(s[ls : n])
-                        n -= 1  # Don't skip current char
-                newline = True
-
-    def _print_lines(self):
-        if len(self.lines) == 0:
+        ln = len(s)
+        dropped = 0
+        for start, end, _ in wrap(s, self.width, self.writer.get_width, clip=self.clip):
+            if start < ln:  # A final '\n' does not start a line
+                dropped += self._push(s[start : end])
+        return dropped
+
+    # first, n: window lines to print, default all
+    def _print_lines(self, first=0, n=None):
+        if self._count == 0:
             return
 
         dev = self.device
         wri = self.writer
         col = self.col
-        row = self.row
-        left = col
+        row = self.row + first * wri.height
         ht = wri.height
         wri.setcolor(self.fgcolor, self.bgcolor)
-        # Print the first (or last?) lines that fit widget's height
-        #for line in self.lines[-self.nlines : ]:
-        for line in self.lines[self.start : self.start + self.nlines]:
+        start = self.start + first
+        end = min(self._count, start + (self.nlines - first if n is None else n))
+        for line in range(start, end):
             Writer.set_textpos(dev, row, col)
-            wri.printstring(line)
+            wri.printstring(self._line(line))
             row += ht
-            col = left
         wri.setcolor()  # Restore defaults
 
     def show(self):
         dev = self.device
         super().show()
         self._print_lines()
+        self._drawn = DObject.clears.get(dev, 0)
 
     def append(self, s, ntrim=None, line=None):
-        self._add_lines(s)
-        if ntrim is None:  # Default to no. of lines that can fit
-            ntrim = self.nlines
-        if len(self.lines) > ntrim:
-            self.lines = self.lines[-ntrim:]
-        self.goto(line)
+        nold = self._count
+        if ntrim is None:  # Default to no. of lines that can fit, or maxlines
+            ntrim = self.maxlines
+        if ntrim > len(self._ring):
+            self._resize(ntrim)
+        trim = self._add_lines(s)
+        if self._count > ntrim:
+            trim += self._count - ntrim
+            self._drop(self._count - ntrim)
+        self.start -= trim  # Lines on screen moved up in the ring
+        nold -= trim
+        self._move(self._first(line), nold)
+
+    # Show the window from line start. nold: lines which were in the ring
+    # when it was drawn (the rest are new). If the box on screen is current,
+    # lines which stay visible are moved and only new lines and those coming
+    # into view are drawn, else all is redrawn.
+    def _move(self, start, nold=None):
+        d = start - self.start  # Lines to scroll up
+        self.start = start
+        if nold is None:
+            nold = self._count
+        dev = self.device
+        n = self.nlines
+        if (abs(d) < n and self._drawn == DObject.clears.get(dev) and _awake(dev)
+                and self not in DObject.devices[dev]
+                and (d == 0 or self._shift(d * self.writer.height))):
+            if d > 0:  # Lines scrolled into view
+                self._draw_rows(n - d, d)
+            elif d < 0:
+                self._draw_rows(0, -d)
+            first = max(nold - start, 0, -d)  # First row of a new line
+            last = min(self._count - start, n - max(d, 0))
+            if first < last:
+                self._draw_rows(first, last - first)
+            return
+        self._drawn = 0
+        self._redraw()
+
+    def _draw_rows(self, first, n):
+        ht = self.writer.height
+        self.device.fill_rect(self.col, self.row + first * ht, self.width, n * ht, self.bgcolor)
+        self._print_lines(first, n)
+
+    # Move the contents of the box up dy pixel rows (down if dy < 0), leaving
+    # the rows exposed for the caller to redraw. Return False, having done
+    # nothing, if it cannot be done.
+    def _shift(self, dy):
+        dev = self.device
+        if self.hwscroll:
+            vscroll = getattr(dev, 'vscroll', None)
+            if vscroll and vscroll(-dy, self.row, self.row + self.height - 1):
+                return True
+        h = self.height - abs(dy)
+        if dy > 0:
+            moves = ((self.row + dy, self.row, h),)
+        else:  # blit() copies from the top down: move bands of -dy rows, the lowest first
+            moves = []
+            y = self.row + h
+            while y > self.row:
+                b = min(-dy, y - self.row)
+                y -= b
+                moves.append((y, y - dy, b))
+        views = [_frame_view(dev, self.col, y, self.width, b) for y, _, b in moves]
+        if None in views:
+            return False
+        for view, (_, y, _) in zip(views, moves):
+            dev.blit(view, self.col, y)
+        return True
 
     def scroll(self, n):  # Relative scrolling
-        value = len(self.lines)
+        value = self._count
         if n == 0 or value <= self.nlines:  # Nothing to do
             return False
         s = self.start
-        self.start = max(0, min(self.start + n, value - self.nlines))
-        if s != self.start:
-            self.show()
+        start = max(0, min(self.start + n, value - self.nlines))
+        if s != start:
+            self._move(start)
             return True
         return False
 
     def value(self):
-        return len(self.lines)
+        return self._count
 
     def clear(self):
-        self.lines = []
-        self.show()
+        self._drop(self._count)
+        self._head = 0
+        self.start = 0
+        self._redraw()
 
-    def goto(self, line=None):  # Absolute scrolling
+    def _first(self, line):  # Start of the window showing line, default the last lines
         if line is None:
-            self.start = max(0, len(self.lines) - self.nlines)
-        else:
-            self.start = max(0, min(line, len(self.lines) - self.nlines))
-        self.show()
+            return max(0, self._count - self.nlines)
+        return max(0, min(line, self._count - self.nlines))
+
+    def goto(self, line=None):  # Absolute scrolling
+        self._move(self._first(line))
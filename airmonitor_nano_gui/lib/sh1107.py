@@ -80,7 +80,17 @@ __version__ = "v317"
 __repo__ = "https://github.com/peter-l5/SH1107"
 
 ## SH1107 module code
+# 2026-1018 PP dirty column ranges are tracked per page as well as dirty pages
+#              show() sends each dirty window as a single transaction using
+#              page addressing mode (combined command + data on I2C)
+# 2026-1018 PP damage from blit(), poly(), ellipse() and large_text() uses the
+#              real bounding box; pages_sent and bytes_sent report the last show()
+# 2026-1018 PP shadow argument: damage found by comparing with the last frame sent
+# 2026-1018 PP is_awake property fixed; show() sends nothing while the display is off
+#                (init_display() sends the cleared frame after poweron())
+# 2026-1018 PP vscroll(): hardware vertical scroll with the display start line
 from micropython import const
+import micropython
 import time
 # import extended framebuffer if available)
 try:
@@ -92,6 +102,7 @@ except:
 print("framebuf is ", ("standard" if _fb_variant ==1 else "extended") )
 # 2023-0825 PP added palette attribute (required by micropython-nano-gui)
 from drivers.boolpalette import BoolPalette
+from drivers.shadow import Shadow, SHADOW_NONE
 
 # a few register definitions with SH1107 data sheet reference numbers
 _LOW_COLUMN_ADDRESS      = const(0x00)   # 1. Set Column Address 4 lower bits (POR = 00H) 
@@ -124,7 +135,7 @@ class SH1107(framebuf.FrameBuffer):
         return int((r > 127) or (g > 127) or (b > 127))
     # end of added
 
-    def __init__(self, width, height, external_vcc, rotate=0):
+    def __init__(self, width, height, external_vcc, rotate=0, shadow=SHADOW_NONE):
         self.width = width
         self.height = height
         self.external_vcc = external_vcc
@@ -140,6 +151,15 @@ class SH1107(framebuf.FrameBuffer):
         self.displaybuf = bytearray(self.bufsize)
         self.displaybuf_mv = memoryview(self.displaybuf)
         self.pages_to_update = 0
+        self.pages_sent = 0  # dirty pages written by the last show()
+        self.bytes_sent = 0  # display data bytes written by the last show()
+        # dirty column range of each page, empty while _xmin > _xmax
+        self._xmin = bytearray(b"\xff" * self.pages)
+        self._xmax = bytearray(self.pages)
+        # staging buffer for gathering a display page in non-rotated mode
+        self._stage = bytearray(self.height)
+        self._win_cmd = bytearray(3)
+        self._vpage = 0  # hardware scroll: page p is in RAM page (p + _vpage) % pages
         self._is_awake = False
         # 2023-0825 PP added self.palette (required for micropython nano-gui)
         if self.rotate90:
@@ -149,6 +169,14 @@ class SH1107(framebuf.FrameBuffer):
             mode = framebuf.MONO_HMSB   # PP added
             super().__init__(self.displaybuf, self.width, self.height, mode)
         self.palette = BoolPalette(mode)  # PP added
+        # shadow: SHADOW_CRC or SHADOW_FULL (see drivers/shadow.py) replaces
+        # damage reported by drawing methods with a comparison of frames
+        if not shadow:
+            self._shadow = None
+        elif self.rotate90:  # a line is a page of width bytes
+            self._shadow = Shadow(shadow, self.displaybuf_mv, self.pages, self.width, 8, 1)
+        else:  # a line is a row, 8 pixels per byte
+            self._shadow = Shadow(shadow, self.displaybuf_mv, self.height, self.width // 8, 1, 8)
         self.init_display()
 
     def init_display(self):
@@ -158,13 +186,14 @@ class SH1107(framebuf.FrameBuffer):
         self.fill(0)
         self.write_command(_SET_DC_DC_CONVERTER_SF.to_bytes(2,"big"))
         self.write_command((_SET_MULTIPLEX_RATIO | multiplex_ratio).to_bytes(2,"big"))
-        self.write_command((_MEM_ADDRESSING_MODE | (0x00 if self.rotate90 else 0x01)).to_bytes(1,"big"))
+        self.write_command(_MEM_ADDRESSING_MODE.to_bytes(1,"big"))  # page addressing
         self.write_command(_SET_PAGE_ADDRESS.to_bytes(1,"big")) # set page address to zero
         self.contrast(0)
         self.invert(0)
         # requires a call to flip() for setting up
         self.flip(self.flip_flag)
         self.poweron()
+        self.show(True)  # flip() sent nothing while the display was off
 
     def poweron(self):
         self.write_command(_SET_DISPLAY_ON.to_bytes(1,"big"))
@@ -182,7 +211,7 @@ class SH1107(framebuf.FrameBuffer):
             self.poweron()
     
     @property
-    def is_awake() -> bool:
+    def is_awake(self) -> bool:
         return self._is_awake
 
     def flip(self, flag=None, update=True):
@@ -200,6 +229,11 @@ class SH1107(framebuf.FrameBuffer):
         self.write_command((_SET_SEGMENT_REMAP  | remap ).to_bytes(1,"big") )
         self.write_command((_SET_SCAN_DIRECTION | direction ).to_bytes(1,"big") )
         self.flip_flag = flag
+        if self._vpage:  # scroll direction changed: start again unscrolled
+            self._vpage = 0
+            self.display_start_line(0)
+            if self._shadow:
+                self._shadow.invalidate()
         if update:
             self.show(True) # full update
 
@@ -224,75 +258,139 @@ class SH1107(framebuf.FrameBuffer):
         self.inverse = invert
 
     def show(self, full_update: bool = False):
+        if not self._is_awake:
+            return  # display is off: dirty pages are kept until it wakes
 #         _start = time.ticks_us()
         (w, p, db_mv) = (self.width, self.pages, self.displaybuf_mv)
-        current_page = 1
+        if self._shadow:
+            self._clear_updates()
+            self._shadow.diff(self.register_updates)
         if full_update:
-            pages_to_update = (1 << p) - 1
-        else:
-            pages_to_update = self.pages_to_update
+            self._update_all()
+        pages_to_update = self.pages_to_update
+        xmin, xmax = self._xmin, self._xmax
+        pages_sent = bytes_sent = 0
         if self.rotate90:
-            buffer_3Bytes = bytearray(3)
-            buffer_3Bytes[1] = _LOW_COLUMN_ADDRESS
-            buffer_3Bytes[2] = _HIGH_COLUMN_ADDRESS
+            # one window per dirty page: page rows map directly onto RAM pages
             for page in range(p):
-                if pages_to_update & current_page:
-                    buffer_3Bytes[0] = _SET_PAGE_ADDRESS | page
-                    self.write_command(buffer_3Bytes)
+                if pages_to_update & (1 << page):
                     page_start = w * page
-                    self.write_data(db_mv[page_start : page_start + w])
-                current_page <<= 1
+                    self.write_window((page + self._vpage) % p, xmin[page],
+                                      db_mv[page_start + xmin[page] : page_start + xmax[page] + 1])
+                    pages_sent += 1
+                    bytes_sent += xmax[page] - xmin[page] + 1
         else:
+            # framebuffer rows are display columns and each byte of a row is a
+            # display page: runs of consecutive dirty pages are sent as one
+            # window per byte column, gathered from the rows of the run
             row_bytes = w // 8
-            buffer_2Bytes = bytearray(2)
-            for start_row in range(0, p * 8, 8):
-                if pages_to_update & current_page:
-                    for row in range(start_row, start_row + 8):
-                        buffer_2Bytes[0] = row & 0x0f  # low column (low col. cmd is 0x00)
-                        buffer_2Bytes[1] = _HIGH_COLUMN_ADDRESS | (row >> 4) 
-                        self.write_command(buffer_2Bytes)
-                        slice_start = row * row_bytes
-                        self.write_data(db_mv[slice_start : slice_start + row_bytes])
-                current_page <<= 1
-        self.pages_to_update = 0
+            stage = self._stage
+            stage_mv = memoryview(stage)
+            page = 0
+            while page < p:
+                if not pages_to_update & (1 << page):
+                    page += 1
+                    continue
+                first = page
+                x0, x1 = xmin[page], xmax[page]
+                page += 1
+                while page < p and pages_to_update & (1 << page):
+                    x0 = min(x0, xmin[page])
+                    x1 = max(x1, xmax[page])
+                    page += 1
+                start_row = first * 8
+                n = (page - first) * 8
+                for col_byte in range(x0 >> 3, (x1 >> 3) + 1):
+                    _gather(stage, db_mv[start_row * row_bytes + col_byte :], row_bytes, n)
+                    self.write_window(col_byte, start_row, stage_mv[:n])
+                    bytes_sent += n
+                pages_sent += page - first
+        self.pages_sent = pages_sent
+        self.bytes_sent = bytes_sent
+        self._clear_updates()
 #         print("screen update used ", (time.ticks_us() - _start) / 1000, "ms")
 
+    # set the RAM page and column address then write buf from there on
+    # SH1107_I2C overrides this with a single combined transaction
+    def write_window(self, page, col, buf):
+        cmd = self._win_cmd
+        cmd[0] = _SET_PAGE_ADDRESS | page
+        cmd[1] = _LOW_COLUMN_ADDRESS | (col & 0x0f)
+        cmd[2] = _HIGH_COLUMN_ADDRESS | (col >> 4)
+        self.write_command(cmd)
+        self.write_data(buf)
+
     def pixel(self, x, y, c=None):
         if c is None:
             return super().pixel(x, y)
         else:
             super().pixel(x, y , c)
-            page = y // 8
-            self.pages_to_update |= 1 << page
+            self.register_updates(y, y, x, x)
 
     def text(self, text, x, y, c=1):
         super().text(text, x, y, c)
-        self.register_updates(y, y + 7)
+        self.register_updates(y, y + 7, x, x + 8 * len(text) - 1)
 
     def line(self, x0, y0, x1, y1, c):
         super().line(x0, y0, x1, y1, c)
-        self.register_updates(y0, y1)
+        self.register_updates(y0, y1, x0, x1)
 
     def hline(self, x, y, w, c):
         super().hline(x, y, w, c)
-        self.register_updates(y)
+        self.register_updates(y, y, x, x + w - 1)
 
     def vline(self, x, y, h, c):
         super().vline(x, y, h, c)
-        self.register_updates(y, y + h - 1)
+        self.register_updates(y, y + h - 1, x, x)
 
     def fill(self, c):
         super().fill(c)
-        self.pages_to_update = (1 << self.pages) - 1
+        self._update_all()
 
+    # a plain FrameBuffer does not know its size: assume the source extends to
+    # the edge of the screen unless it has width and height attributes
     def blit(self, fbuf, x, y, key=-1, palette=None):
         super().blit(fbuf, x, y, key, palette)
-        self.register_updates(y, y + self.height)
+        w = getattr(fbuf, 'width', self.width)
+        h = getattr(fbuf, 'height', self.height)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
 
     def scroll(self, x, y):
         # my understanding is that scroll() does a full screen change
         super().scroll(x, y)
-        self.pages_to_update = (1 << self.pages) - 1
+        self._update_all()
+
+    # hardware vertical scroll by dy rows, as scroll(0, dy) would do: the
+    # framebuffer is moved, the display start line changes and only the
+    # exposed rows are marked for show(). Like scroll() the exposed rows keep
+    # their old content, callers clear or redraw them.
+    # The start line moves the 128 RAM rows, which are screen rows when
+    # rotated by 90 or 270 degrees on a 128 row display, and RAM is written in
+    # pages: dy must be a multiple of 8 and rows y0..y1 the whole screen.
+    # Return False, having done nothing, when it cannot be used.
+    def vscroll(self, dy, y0=0, y1=None):
+        h = self.height
+        if (not self.rotate90 or h != 128 or dy % 8 or not 0 < abs(dy) < h
+                or y0 != 0 or y1 not in (None, h - 1) or not self._is_awake):
+            return False
+        super().scroll(0, dy)
+        p = self.pages
+        dp = dy // 8
+        xmin, xmax = self._xmin, self._xmax
+        moved = [(page + dp, xmin[page], xmax[page]) for page in range(p)
+                 if self.pages_to_update & (1 << page) and 0 <= page + dp < p]
+        for page, x0, x1 in moved:  # dirty pages move with the content
+            self.register_updates(8 * page, 8 * page, x0, x1)
+        if dy < 0:
+            self.register_updates(h + dy, h - 1)
+        else:
+            self.register_updates(0, dy - 1)
+        if self._shadow:
+            self._shadow.scroll(dp)
+        self._vpage = (self._vpage - dp) % p
+        reverse = (self.rotate == 270) ^ self.flip_flag  # scan direction
+        self.display_start_line(8 * (-self._vpage % p if reverse else self._vpage))
+        return True
 
     # rect() and fill_rect() amended to be compatible with new rect() method
     # from latest micropython as well as 1.20.0 and previous versions
@@ -301,7 +399,7 @@ class SH1107(framebuf.FrameBuffer):
             super().fill_rect(x, y, w, h, c)
         except:
             super().rect(x, y, w, h, c, f=True)
-        self.register_updates(y, y + h - 1)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
 
     def rect(self, x, y, w, h, c, f=None):
         if f == None or f == False:
@@ -311,15 +409,24 @@ class SH1107(framebuf.FrameBuffer):
                 super().rect(x, y, w, h, c, f)
             except:
                 super().fill_rect(x, y, w, h, c)
-        self.register_updates(y, y + h - 1)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
     
     def ellipse(self, x, y, xr, yr, c, *args, **kwargs):
         super().ellipse(x, y, xr, yr, c, *args, **kwargs)
-        self.register_updates(y - yr, y + yr)
-
-    def poly(self, *args, **kwargs):
-        super().poly(*args, **kwargs)
-        self.pages_to_update = (1 << self.pages) - 1
+        self.register_updates(y - yr, y + yr, x - xr, x + xr)
+
+    def poly(self, x, y, coords, c, *args, **kwargs):
+        super().poly(x, y, coords, c, *args, **kwargs)
+        n = len(coords)
+        if n > 1:
+            xmin = xmax = coords[0]
+            ymin = ymax = coords[1]
+            for i in range(2, n - 1, 2):
+                xmin = min(xmin, coords[i])
+                xmax = max(xmax, coords[i])
+                ymin = min(ymin, coords[i + 1])
+                ymax = max(ymax, coords[i + 1])
+            self.register_updates(y + ymin, y + ymax, x + xmin, x + xmax)
 
     # conditionally define optimisations for framebuf extension if loaded
     if _fb_variant == 2:
@@ -328,33 +435,57 @@ class SH1107(framebuf.FrameBuffer):
                 super().large_text(s, x, y, m, c, r, *args, **kwargs)
             except:
                 raise Exception("extended framebuffer v206+ required")
-            h = (8 * m) * (1 if r is None or r % 360 // 90 in (0, 2) else len(s))
-            self.register_updates(y, y + h - 1)
+            # text runs along x for 0 and 180 degrees, along y otherwise
+            if s:
+                n = 1 if r is None or r % 360 // 90 in (0, 2) else len(s)
+                self.register_updates(y, y + 8 * m * n - 1, x, x + 8 * m * (len(s) // n) - 1)
 
         def circle(self, x, y, radius, c, f:bool = None):
             super().circle(x, y, radius, c, f)
-            self.register_updates(y-radius, y+radius)
+            self.register_updates(y-radius, y+radius, x-radius, x+radius)
         
         def triangle(self, x0, y0, x1, y1, x2, y2, c, f: bool = None):
             super().triangle(x0, y0, x1, y1, x2, y2, c, f)
-            self.register_updates(min(y0, y1, y2), max(y0, y1, y2))
-
-    def register_updates(self, y0, y1=None):
-        y1 = min((y1 if y1 is not None else y0), self.height - 1)
-        # this function takes the top and optional bottom address of the changes made
-        # and updates the pages_to_change list with any changed pages
-        # that are not yet on the list
-        start_page = y0 // 8
-        end_page = (y1 // 8) if (y1 is not None) else start_page
-        # rearrange start_page and end_page if coordinates were given from bottom to top
-        if start_page > end_page:
-            start_page, end_page = end_page, start_page
-        # ensure that start and end page values for update are non-negative (-ve is off-screen)
-        if end_page >= 0:
-            if start_page < 0:
-                start_page = 0
-            for page in range(start_page, end_page + 1):
-                self.pages_to_update |= 1 << page
+            self.register_updates(min(y0, y1, y2), max(y0, y1, y2),
+                                  min(x0, x1, x2), max(x0, x1, x2))
+
+    def register_updates(self, y0, y1=None, x0=None, x1=None):
+        # this function takes the top and optional bottom address of the changes made,
+        # optionally the left and right columns (default is the full width),
+        # and adds the changed pages and column ranges to those to be updated
+        if y1 is None:
+            y1 = y0
+        if y0 > y1:
+            y0, y1 = y1, y0
+        if x0 is None:
+            x0, x1 = 0, self.width - 1
+        elif x1 is None:
+            x1 = x0
+        if x0 > x1:
+            x0, x1 = x1, x0
+        # ignore changes that are entirely off-screen
+        if y1 < 0 or y0 >= self.height or x1 < 0 or x0 >= self.width:
+            return
+        start_page = max(y0, 0) // 8
+        end_page = min(y1, self.height - 1) // 8
+        x0 = max(x0, 0)
+        x1 = min(x1, self.width - 1)
+        xmin, xmax = self._xmin, self._xmax
+        for page in range(start_page, end_page + 1):
+            self.pages_to_update |= 1 << page
+            if x0 < xmin[page]:
+                xmin[page] = x0
+            if x1 > xmax[page]:
+                xmax[page] = x1
+
+    def _update_all(self):
+        self.register_updates(0, self.height - 1)
+
+    def _clear_updates(self):
+        self.pages_to_update = 0
+        for page in range(self.pages):
+            self._xmin[page] = 0xff
+            self._xmax[page] = 0
 
     def reset(self, res):
         if res is not None:
@@ -367,13 +498,15 @@ class SH1107(framebuf.FrameBuffer):
 
 class SH1107_I2C(SH1107):
     def __init__(self, width, height, i2c, res=None, address=0x3d,
-                 rotate=0, external_vcc=False):
+                 rotate=0, external_vcc=False, shadow=SHADOW_NONE):
         self.i2c = i2c
         self.address = address
         self.res = res
+        # page, low and high column address commands, each with Co=1
+        self._co_cmd = bytearray(b"\x80\xb0\x80\x00\x80\x10")
         if res is not None:
             res.init(res.OUT, value=1)
-        super().__init__(width, height, external_vcc, rotate)
+        super().__init__(width, height, external_vcc, rotate, shadow)
 
     def write_command(self, command_list):
         self.i2c.writeto(self.address, b"\x00" + command_list)
@@ -381,12 +514,19 @@ class SH1107_I2C(SH1107):
     def write_data(self, buf):
         self.i2c.writevto(self.address, (b"\x40", buf))
 
+    def write_window(self, page, col, buf):
+        cmd = self._co_cmd
+        cmd[1] = _SET_PAGE_ADDRESS | page
+        cmd[3] = _LOW_COLUMN_ADDRESS | (col & 0x0f)
+        cmd[5] = _HIGH_COLUMN_ADDRESS | (col >> 4)
+        self.i2c.writevto(self.address, (cmd, b"\x40", buf))
+
     def reset(self):
         super().reset(self.res)
 
 class SH1107_SPI(SH1107):
     def __init__(self, width, height, spi, dc, res=None, cs=None,
-                 rotate=0, external_vcc=False):
+                 rotate=0, external_vcc=False, shadow=SHADOW_NONE):
         dc.init(dc.OUT, value=0)
         if res is not None:
             res.init(res.OUT, value=0)
@@ -396,7 +536,7 @@ class SH1107_SPI(SH1107):
         self.dc = dc
         self.res = res
         self.cs = cs
-        super().__init__(width, height, external_vcc, rotate)
+        super().__init__(width, height, external_vcc, rotate, shadow)
 
     def write_command(self, cmd):
         if self.cs is not None:
@@ -421,4 +561,13 @@ class SH1107_SPI(SH1107):
             self.spi.write(buf)
 
     def reset(self):
-        super().reset(self.res)
\ No newline at end of file
+        super().reset(self.res)
+
+
+# copy n bytes spaced stride apart in source into consecutive bytes of dest
+@micropython.viper
+def _gather(dest:ptr8, source:ptr8, stride:int, n:int):
+    s = 0
+    for i in range(n):
+        dest[i] = source[s]
+        s += stride
@@ -0,0 +1,198 @@
+"""
+sharedbus - one registry for the I2C and SPI buses shared by displays and sensors
+
+Every caller asks the registry for a bus by its id and gets the same
+SharedBus, wrapping a single machine.I2C or machine.SPI instance. Drivers are
+given a BusClient: a proxy with the methods of the bus which counts the
+transactions, bytes and bus time used by that client.
+
+Single calls (writeto, readfrom_into, spi.write, ...) are atomic for uasyncio
+tasks. A sequence which awaits between bus accesses, like a segmented display
+refresh or a sensor command followed by an awaited conversion delay, must hold
+the bus lock. Waiting tasks are queued in the order they asked for the lock:
+
+    from sharedbus import i2c
+    bus = i2c('X')
+    aht10 = ahtx0.AHT10(bus.client('aht10'), 0x38)
+    async with bus.client('sgp30') as sgp:  # queue for, then hold, the bus
+        ...
+    bus.report()  # bus usage per client
+
+2026-1018 PP new
+"""
+import machine
+import uasyncio as asyncio
+from time import ticks_us, ticks_diff
+
+_buses = {}  # (kind, id) -> SharedBus
+
+
+def i2c(id, **kwargs):
+    """ shared bus for machine.I2C(id, **kwargs); kwargs are used on first request only """
+    return _get('I2C', machine.I2C, id, kwargs)
+
+def spi(id, **kwargs):
+    """ shared bus for machine.SPI(id, **kwargs); kwargs are used on first request only """
+    return _get('SPI', machine.SPI, id, kwargs)
+
+def buses():
+    """ all registered buses """
+    return list(_buses.values())
+
+def _get(kind, cls, id, kwargs):
+    key = (kind, id)
+    if key not in _buses:
+        _buses[key] = SharedBus(cls(id, **kwargs), "{}({})".format(kind, repr(id)))
+    return _buses[key]
+
+
+class SharedBus:
+
+    def __init__(self, bus, name):
+        self.bus = bus    # the machine.I2C or machine.SPI instance
+        self.name = name
+        self.lock = asyncio.Lock()
+        self.owner = None  # name of the client holding the lock
+        self._clients = {}
+
+    def client(self, name):
+        """ accounting proxy for client 'name'; one per name """
+        if name not in self._clients:
+            self._clients[name] = BusClient(self, name)
+        return self._clients[name]
+
+    def clients(self):
+        return list(self._clients.values())
+
+    def reset_stats(self):
+        for c in self._clients.values():
+            c.reset_stats()
+
+    def report(self):
+        print(f"{self.name} bus usage:")
+        for c in self._clients.values():
+            print(f"\t{c.name:<10} {c.transactions:>7} transactions {c.nbytes:>9} bytes "
+                  f"{c.busy_us // 1000:>7} ms busy {c.wait_us // 1000:>7} ms waiting")
+
+
+class BusClient:
+
+    def __init__(self, shared, name):
+        self._shared = shared
+        self._bus = shared.bus
+        self.name = name
+        self.lock = shared.lock  # drivers with an async refresh use the bus lock
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.transactions = 0
+        self.nbytes = 0
+        self.busy_us = 0  # time spent in bus calls
+        self.wait_us = 0  # time spent queuing for the bus lock
+
+    def __repr__(self):
+        return "<{} client '{}' of {}>".format(self._shared.name, self.name, repr(self._bus))
+
+    # anything not accounted is passed on, e.g. SPI.init()
+    def __getattr__(self, attr):
+        return getattr(self._bus, attr)
+
+    # queue for the bus lock; 'async with client:' does the same
+    async def acquire(self):
+        t = ticks_us()
+        await self.lock.acquire()
+        self.wait_us += ticks_diff(ticks_us(), t)
+        self._shared.owner = self.name
+
+    def release(self):
+        self._shared.owner = None
+        self.lock.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *args):
+        self.release()
+
+    # run a synchronous bus sequence once the bus is free, e.g.
+    # await client.run(sgp30.iaq_measure)
+    async def run(self, func, *args):
+        async with self:
+            return func(*args)
+
+    def _account(self, t, n):
+        self.busy_us += ticks_diff(ticks_us(), t)
+        self.transactions += 1
+        self.nbytes += n
+
+    # I2C
+    def scan(self):
+        t = ticks_us()
+        r = self._bus.scan()
+        self._account(t, 0)
+        return r
+
+    def writeto(self, addr, buf, stop=True):
+        t = ticks_us()
+        r = self._bus.writeto(addr, buf, stop)
+        self._account(t, len(buf))
+        return r
+
+    def writevto(self, addr, vector, stop=True):
+        t = ticks_us()
+        r = self._bus.writevto(addr, vector, stop)
+        self._account(t, sum(len(b) for b in vector))
+        return r
+
+    def readfrom(self, addr, nbytes, stop=True):
+        t = ticks_us()
+        r = self._bus.readfrom(addr, nbytes, stop)
+        self._account(t, nbytes)
+        return r
+
+    def readfrom_into(self, addr, buf, stop=True):
+        t = ticks_us()
+        self._bus.readfrom_into(addr, buf, stop)
+        self._account(t, len(buf))
+
+    def readfrom_mem(self, addr, memaddr, nbytes, *, addrsize=8):
+        t = ticks_us()
+        r = self._bus.readfrom_mem(addr, memaddr, nbytes, addrsize=addrsize)
+        self._account(t, nbytes)
+        return r
+
+    def readfrom_mem_into(self, addr, memaddr, buf, *, addrsize=8):
+        t = ticks_us()
+        self._bus.readfrom_mem_into(addr, memaddr, buf, addrsize=addrsize)
+        self._account(t, len(buf))
+
+    def writeto_mem(self, addr, memaddr, buf, *, addrsize=8):
+        t = ticks_us()
+        self._bus.writeto_mem(addr, memaddr, buf, addrsize=addrsize)
+        self._account(t, len(buf))
+
+    # SPI
+    def write(self, buf):
+        t = ticks_us()
+        r = self._bus.write(buf)
+        self._account(t, len(buf))
+        return r
+
+    def read(self, nbytes, write=0x00):
+        t = ticks_us()
+        r = self._bus.read(nbytes, write)
+        self._account(t, nbytes)
+        return r
+
+    def readinto(self, buf, write=0x00):
+        t = ticks_us()
+        r = self._bus.readinto(buf, write)
+        self._account(t, len(buf))
+        return r
+
+    def write_readinto(self, write_buf, read_buf):
+        t = ticks_us()
+        r = self._bus.write_readinto(write_buf, read_buf)
+        self._account(t, len(write_buf))
+        return r
@@ -3,11 +3,14 @@ ssd1306.py - MicroPython SSD1306 OLED driver, I2C and SPI interfaces
 
 URL: https://github.com/micropython/micropython/blob/master/drivers/display/ssd1306.py
 2022-0720 PP downloaded from github micropython
+2026-1018 PP dirty page and column tracking: show() only sends changed windows
+2026-1018 PP shadow argument: damage found by comparing with the last frame sent
 
 """
 
 from micropython import const
 import framebuf
+from drivers.shadow import Shadow, SHADOW_NONE
 
 
 # register definitions
@@ -33,12 +36,24 @@ SET_CHARGE_PUMP = const(0x8D)
 # Subclassing FrameBuffer provides support for graphics primitives
 # http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
 class SSD1306(framebuf.FrameBuffer):
-    def __init__(self, width, height, external_vcc):
+    def __init__(self, width, height, external_vcc, shadow=SHADOW_NONE):
         self.width = width
         self.height = height
         self.external_vcc = external_vcc
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
+        self.buffer_mv = memoryview(self.buffer)
+        self.pages_to_update = 0
+        self.pages_sent = 0  # dirty pages written by the last show()
+        self.bytes_sent = 0  # display data bytes written by the last show()
+        # dirty column range of each page, empty while _xmin > _xmax
+        self._xmin = bytearray(b"\xff" * self.pages)
+        self._xmax = bytearray(self.pages)
+        self._win = bytearray(6)
+        # shadow: SHADOW_CRC or SHADOW_FULL (see drivers/shadow.py) replaces
+        # damage reported by drawing methods with a comparison of frames
+        # a line is a page of width bytes
+        self._shadow = Shadow(shadow, self.buffer_mv, self.pages, self.width, 8, 1) if shadow else None
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
         self.init_display()
 
@@ -98,30 +113,167 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_COM_OUT_DIR | ((rotate & 1) << 3))
         self.write_cmd(SET_SEG_REMAP | (rotate & 1))
 
-    def show(self):
-        x0 = 0
-        x1 = self.width - 1
-        if self.width != 128:
-            # narrow displays use centred columns
-            col_offset = (128 - self.width) // 2
-            x0 += col_offset
-            x1 += col_offset
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+    def show(self, full_update=False):
+        if self._shadow:
+            self._clear_updates()
+            self._shadow.diff(self.register_updates)
+        if full_update:
+            self.register_updates(0, self.height - 1)
+        (w, p, buf_mv) = (self.width, self.pages, self.buffer_mv)
+        pages_to_update = self.pages_to_update
+        xmin, xmax = self._xmin, self._xmax
+        # narrow displays use centred columns
+        col_offset = (128 - w) // 2 if w != 128 else 0
+        win = self._win
+        pages_sent = bytes_sent = 0
+        page = 0
+        while page < p:
+            if not pages_to_update & (1 << page):
+                page += 1
+                continue
+            # run of consecutive dirty pages, sent as one window spanning the
+            # union of their column ranges
+            first = page
+            x0, x1 = xmin[page], xmax[page]
+            page += 1
+            while page < p and pages_to_update & (1 << page):
+                x0 = min(x0, xmin[page])
+                x1 = max(x1, xmax[page])
+                page += 1
+            win[0] = SET_COL_ADDR
+            win[1] = x0 + col_offset
+            win[2] = x1 + col_offset
+            win[3] = SET_PAGE_ADDR
+            win[4] = first
+            win[5] = page - 1
+            self.write_cmds(win)
+            if x0 == 0 and x1 == w - 1:  # contiguous in the buffer
+                self.write_datav([buf_mv[first * w : page * w]])
+            else:
+                self.write_datav([buf_mv[pg * w + x0 : pg * w + x1 + 1] for pg in range(first, page)])
+            pages_sent += page - first
+            bytes_sent += (page - first) * (x1 - x0 + 1)
+        self.pages_sent = pages_sent
+        self.bytes_sent = bytes_sent
+        self._clear_updates()
+
+    # send a sequence of command bytes, in one transfer where the bus allows
+    def write_cmds(self, cmds):
+        for cmd in cmds:
+            self.write_cmd(cmd)
+
+    # send several buffers as consecutive display data
+    def write_datav(self, bufs):
+        for buf in bufs:
+            self.write_data(buf)
+
+    def register_updates(self, y0, y1=None, x0=None, x1=None):
+        # takes the top and optional bottom row of the changes made, optionally
+        # the left and right columns (default is the full width), and adds
+        # the changed pages and column ranges to those to be updated
+        if y1 is None:
+            y1 = y0
+        if y0 > y1:
+            y0, y1 = y1, y0
+        if x0 is None:
+            x0, x1 = 0, self.width - 1
+        elif x1 is None:
+            x1 = x0
+        if x0 > x1:
+            x0, x1 = x1, x0
+        # ignore changes that are entirely off-screen
+        if y1 < 0 or y0 >= self.height or x1 < 0 or x0 >= self.width:
+            return
+        start_page = max(y0, 0) // 8
+        end_page = min(y1, self.height - 1) // 8
+        x0 = max(x0, 0)
+        x1 = min(x1, self.width - 1)
+        xmin, xmax = self._xmin, self._xmax
+        for page in range(start_page, end_page + 1):
+            self.pages_to_update |= 1 << page
+            if x0 < xmin[page]:
+                xmin[page] = x0
+            if x1 > xmax[page]:
+                xmax[page] = x1
+
+    def _clear_updates(self):
+        self.pages_to_update = 0
+        for page in range(self.pages):
+            self._xmin[page] = 0xff
+            self._xmax[page] = 0
+
+    # drawing primitives record the area they change
+    def pixel(self, x, y, c=None):
+        if c is None:
+            return super().pixel(x, y)
+        super().pixel(x, y, c)
+        self.register_updates(y, y, x, x)
+
+    def text(self, s, x, y, c=1):
+        super().text(s, x, y, c)
+        self.register_updates(y, y + 7, x, x + 8 * len(s) - 1)
+
+    def line(self, x0, y0, x1, y1, c):
+        super().line(x0, y0, x1, y1, c)
+        self.register_updates(y0, y1, x0, x1)
+
+    def hline(self, x, y, w, c):
+        super().hline(x, y, w, c)
+        self.register_updates(y, y, x, x + w - 1)
+
+    def vline(self, x, y, h, c):
+        super().vline(x, y, h, c)
+        self.register_updates(y, y + h - 1, x, x)
+
+    def fill(self, c):
+        super().fill(c)
+        self.register_updates(0, self.height - 1)
+
+    def fill_rect(self, x, y, w, h, c):
+        super().fill_rect(x, y, w, h, c)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def rect(self, x, y, w, h, c, *args):
+        super().rect(x, y, w, h, c, *args)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def ellipse(self, x, y, xr, yr, c, *args):
+        super().ellipse(x, y, xr, yr, c, *args)
+        self.register_updates(y - yr, y + yr, x - xr, x + xr)
+
+    def poly(self, x, y, coords, c, *args):
+        super().poly(x, y, coords, c, *args)
+        n = len(coords)
+        if n > 1:
+            xmin = xmax = coords[0]
+            ymin = ymax = coords[1]
+            for i in range(2, n - 1, 2):
+                xmin = min(xmin, coords[i])
+                xmax = max(xmax, coords[i])
+                ymin = min(ymin, coords[i + 1])
+                ymax = max(ymax, coords[i + 1])
+            self.register_updates(y + ymin, y + ymax, x + xmin, x + xmax)
+
+    # a plain FrameBuffer does not know its size: assume the source extends to
+    # the edge of the screen unless it has width and height attributes
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        super().blit(fbuf, x, y, key, palette)
+        w = getattr(fbuf, 'width', self.width)
+        h = getattr(fbuf, 'height', self.height)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def scroll(self, xstep, ystep):
+        super().scroll(xstep, ystep)
+        self.register_updates(0, self.height - 1)
 
 
 class SSD1306_I2C(SSD1306):
-    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
+    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False, shadow=SHADOW_NONE):
         self.i2c = i2c
         self.addr = addr
         self.temp = bytearray(2)
         self.write_list = [b"\x40", None]  # Co=0, D/C#=1
-        super().__init__(width, height, external_vcc)
+        super().__init__(width, height, external_vcc, shadow)
 
     def write_cmd(self, cmd):
         self.temp[0] = 0x80  # Co=1, D/C#=0
@@ -132,9 +284,15 @@ class SSD1306_I2C(SSD1306):
         self.write_list[1] = buf
         self.i2c.writevto(self.addr, self.write_list)
 
+    def write_cmds(self, cmds):
+        self.i2c.writevto(self.addr, (b"\x00", cmds))  # Co=0, D/C#=0
+
+    def write_datav(self, bufs):
+        self.i2c.writevto(self.addr, [b"\x40"] + bufs)
+
 
 class SSD1306_SPI(SSD1306):
-    def __init__(self, width, height, spi, dc, res, cs, external_vcc=False):
+    def __init__(self, width, height, spi, dc, res, cs, external_vcc=False, shadow=SHADOW_NONE):
         self.rate = 10 * 1024 * 1024
         dc.init(dc.OUT, value=0)
         res.init(res.OUT, value=0)
@@ -150,7 +308,7 @@ class SSD1306_SPI(SSD1306):
         self.res(0)
         time.sleep_ms(10)
         self.res(1)
-        super().__init__(width, height, external_vcc)
+        super().__init__(width, height, external_vcc, shadow)
 
     def write_cmd(self, cmd):
         self.spi.init(baudrate=self.rate, polarity=0, phase=0)
@@ -167,3 +325,20 @@ class SSD1306_SPI(SSD1306):
         self.cs(0)
         self.spi.write(buf)
         self.cs(1)
+
+    def write_cmds(self, cmds):
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cs(1)
+        self.dc(0)
+        self.cs(0)
+        self.spi.write(cmds)
+        self.cs(1)
+
+    def write_datav(self, bufs):
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cs(1)
+        self.dc(1)
+        self.cs(0)
+        for buf in bufs:
+            self.spi.write(buf)
+        self.cs(1)
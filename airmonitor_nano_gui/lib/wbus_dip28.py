@@ -1,16 +1,19 @@
 """
 WBUS_DIP28 - baseclass for tiles on the WBUS-DIP28
 
+2026-1018 PP buses come from the sharedbus registry, one client per tile class
 2021-0410 PP new, based upon the class WBUS_DIP68 and https://pybd.io/hw/wbus_dip28.html
 """
 import machine
 from time import sleep
+import sharedbus
 
 class WBUS_DIP28:
 
     def __init__(self):
-        self._i2c = machine.I2C('Y')
-        self._spi = machine.SPI('Y')
+        # 2026-1018 shared with displays and sensors on the same bus
+        self._i2c = sharedbus.i2c('Y').client(type(self).__name__)
+        self._spi = sharedbus.spi('Y').client(type(self).__name__)
         # 2020-1101 added poweron - a must apparently!
         self.powerOn()
         #DEBUG: print(self._i2c.scan())  # 2020-1101 not empty after poweron
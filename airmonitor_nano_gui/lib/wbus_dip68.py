@@ -1,17 +1,20 @@
 """
 WBUS_DIP68 - baseclass for tiles on the WBUS-DIP68
 
+2026-1018 PP buses come from the sharedbus registry, one client per tile class
 2020-1101 PP added poweron in init() and now program in main works!
 2020-0512 PP new, https://pybd.io/hw/wbus_dip68.html
 """
 import machine
 from time import sleep_ms
+import sharedbus
 
 class WBUS_DIP68:
 
     def __init__(self):
-        self._i2c = machine.I2C('X')
-        self._spi = machine.SPI('X')
+        # 2026-1018 shared with displays and sensors on the same bus
+        self._i2c = sharedbus.i2c('X').client(type(self).__name__)
+        self._spi = sharedbus.spi('X').client(type(self).__name__)
         # 2020-1101 added poweron - a must apparently!
         self.powerOn()
         #DEBUG: print(self._i2c.scan())  # 2020-1101 not empty after poweron